@@ -0,0 +1,137 @@
+"""add task completed_at
+
+Revision ID: 105a47fc19ff
+Revises: 7698dbdfefcf
+Create Date: 2026-10-18 14:12:37.218455
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "105a47fc19ff"
+down_revision: Union[str, None] = "7698dbdfefcf"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The task version triggers, now also stamping completed_at
+DATA_VERSION_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_insert
+    AFTER INSERT ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE task
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        ),
+        completed_at = CASE
+            WHEN new.status = 'DONE'
+            THEN coalesce(new.completed_at, new.updated_at)
+        END
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_update
+    AFTER UPDATE ON task
+    WHEN new.change_seq IS old.change_seq
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE task
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        ),
+        completed_at = CASE
+            WHEN new.status != 'DONE' THEN NULL
+            WHEN old.status = 'DONE' THEN new.completed_at
+            ELSE new.updated_at
+        END
+        WHERE id = new.id;
+    END
+    """,
+]
+
+# The triggers of the previous revision, restored on downgrade
+PREVIOUS_DATA_VERSION_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_insert
+    AFTER INSERT ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE task
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        )
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_update
+    AFTER UPDATE ON task
+    WHEN new.change_seq IS old.change_seq
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE task
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        )
+        WHERE id = new.id;
+    END
+    """,
+]
+
+TRIGGERS = ["task_version_insert", "task_version_update"]
+
+
+def upgrade() -> None:
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER {trigger}")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column(
+        "task", sa.Column("completed_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index(
+        "ix_task_owner_id_completed_at",
+        "task",
+        ["owner_id", "completed_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_task_owner_id_created_at",
+        "task",
+        ["owner_id", "created_at"],
+        unique=False,
+    )
+    # ### end Alembic commands ###
+
+    # Tasks done before now count as completed at their last update
+    op.execute(
+        "UPDATE task SET completed_at = updated_at WHERE status = 'DONE'"
+    )
+
+    for statement in DATA_VERSION_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER {trigger}")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index("ix_task_owner_id_created_at", table_name="task")
+    op.drop_index("ix_task_owner_id_completed_at", table_name="task")
+    op.drop_column("task", "completed_at")
+    # ### end Alembic commands ###
+
+    for statement in PREVIOUS_DATA_VERSION_DDL:
+        op.execute(statement)
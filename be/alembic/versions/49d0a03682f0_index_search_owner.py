@@ -0,0 +1,72 @@
+"""index search owner
+
+Revision ID: 49d0a03682f0
+Revises: 2ff2c184ae19
+Create Date: 2026-10-18 11:15:02.493120
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "49d0a03682f0"
+down_revision: Union[str, None] = "2ff2c184ae19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The search index with owner_id indexed, so that a search only walks the
+# documents of one user, and a rank that only weights title and
+# description. The triggers on task and project write it by name and are
+# kept.
+SEARCH_INDEX_DDL = """
+    CREATE VIRTUAL TABLE search_index USING fts5 (
+        title,
+        description,
+        kind UNINDEXED,
+        item_id UNINDEXED,
+        project_id UNINDEXED,
+        owner_id{owner_options},
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3 4'
+    )
+"""
+
+
+def rebuild(owner_options: str) -> None:
+    op.execute("DROP TABLE search_index")
+    op.execute(SEARCH_INDEX_DDL.format(owner_options=owner_options))
+    op.execute(
+        """
+        INSERT INTO search_index (
+            rowid, title, description, kind, item_id, project_id, owner_id
+        )
+        SELECT id * 2, title, description, 'task', id, project_id, owner_id
+        FROM task
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO search_index (
+            rowid, title, kind, item_id, project_id, owner_id
+        )
+        SELECT id * 2 + 1, name, 'project', id, id, owner_id
+        FROM project
+        """
+    )
+
+
+def upgrade() -> None:
+    rebuild("")
+    op.execute(
+        """
+        INSERT INTO search_index (search_index, rank)
+        VALUES ('rank', 'bm25(1.0, 1.0, 0.0, 0.0, 0.0, 0.0)')
+        """
+    )
+
+
+def downgrade() -> None:
+    rebuild(" UNINDEXED")
@@ -0,0 +1,246 @@
+"""add change sequence and tombstones
+
+Revision ID: 7698dbdfefcf
+Revises: 245843d5d3a3
+Create Date: 2026-10-18 08:20:54.493350
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7698dbdfefcf"
+down_revision: Union[str, None] = "245843d5d3a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DATA_VERSION_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_insert
+    AFTER INSERT ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE task
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        )
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_update
+    AFTER UPDATE ON task
+    WHEN new.change_seq IS old.change_seq
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE task
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        )
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_delete
+    AFTER DELETE ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = old.owner_id;
+        INSERT INTO tombstone (owner_id, change_seq, kind, item_id)
+        SELECT id, data_version, 'task', old.id
+        FROM user WHERE id = old.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_insert
+    AFTER INSERT ON project
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE project
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        )
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_update
+    AFTER UPDATE ON project
+    WHEN new.change_seq IS old.change_seq
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE project
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        )
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_delete
+    AFTER DELETE ON project
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = old.owner_id;
+        INSERT INTO tombstone (owner_id, change_seq, kind, item_id)
+        SELECT id, data_version, 'project', old.id
+        FROM user WHERE id = old.owner_id;
+    END
+    """,
+]
+
+# The triggers of the previous revision, restored on downgrade
+PREVIOUS_DATA_VERSION_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_insert AFTER INSERT ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_update AFTER UPDATE ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_delete AFTER DELETE ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = old.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_insert
+    AFTER INSERT ON project
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_update
+    AFTER UPDATE OF
+        name, description, status, is_flagged, is_inbox, parent_id,
+        owner_id
+    ON project
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_delete
+    AFTER DELETE ON project
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = old.owner_id;
+    END
+    """,
+]
+
+TRIGGERS = [
+    "task_version_insert",
+    "task_version_update",
+    "task_version_delete",
+    "project_version_insert",
+    "project_version_update",
+    "project_version_delete",
+]
+
+
+def upgrade() -> None:
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER {trigger}")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "tombstone",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("owner_id", "change_seq"),
+    )
+    op.add_column(
+        "project",
+        sa.Column(
+            "change_seq", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.create_index(
+        "ix_project_owner_id_change_seq",
+        "project",
+        ["owner_id", "change_seq"],
+        unique=False,
+    )
+    op.add_column(
+        "task",
+        sa.Column(
+            "change_seq", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.create_index(
+        "ix_task_owner_id_change_seq",
+        "task",
+        ["owner_id", "change_seq"],
+        unique=False,
+    )
+    # ### end Alembic commands ###
+
+    # Number the existing rows in each user's sequence, projects first
+    for table in ["project", "task"]:
+        op.execute(
+            f"""
+            UPDATE {table} SET change_seq = numbered.change_seq
+            FROM (
+                SELECT
+                    {table}.id,
+                    user.data_version + row_number() OVER (
+                        PARTITION BY {table}.owner_id ORDER BY {table}.id
+                    ) AS change_seq
+                FROM {table} JOIN user ON user.id = {table}.owner_id
+            ) AS numbered
+            WHERE {table}.id = numbered.id
+            """
+        )
+        op.execute(
+            f"""
+            UPDATE user SET data_version = data_version + (
+                SELECT count(*) FROM {table} WHERE owner_id = user.id
+            )
+            """
+        )
+
+    for statement in DATA_VERSION_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER {trigger}")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index("ix_task_owner_id_change_seq", table_name="task")
+    op.drop_column("task", "change_seq")
+    op.drop_index("ix_project_owner_id_change_seq", table_name="project")
+    op.drop_column("project", "change_seq")
+    op.drop_table("tombstone")
+    # ### end Alembic commands ###
+
+    for statement in PREVIOUS_DATA_VERSION_DDL:
+        op.execute(statement)
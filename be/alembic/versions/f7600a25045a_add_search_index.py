@@ -0,0 +1,132 @@
+"""add search index
+
+Revision ID: f7600a25045a
+Revises: 22e1b88d1430
+Create Date: 2026-10-18 12:41:09.662480
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7600a25045a"
+down_revision: Union[str, None] = "22e1b88d1430"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# FTS5 index over task titles and descriptions and project names, kept in
+# sync by triggers. Task rowids are even and project rowids odd.
+SEARCH_INDEX_DDL = [
+    """
+        CREATE VIRTUAL TABLE search_index USING fts5 (
+            title,
+            description,
+            kind UNINDEXED,
+            item_id UNINDEXED,
+            project_id UNINDEXED,
+            owner_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3 4'
+        )
+    """,
+    """
+        CREATE TRIGGER task_search_insert AFTER INSERT ON task
+        BEGIN
+            INSERT INTO search_index (
+                rowid, title, description, kind, item_id, project_id, owner_id
+            )
+            VALUES (
+                new.id * 2, new.title, new.description, 'task', new.id,
+                new.project_id, new.owner_id
+            );
+        END
+    """,
+    """
+        CREATE TRIGGER task_search_update
+        AFTER UPDATE OF title, description, project_id, owner_id ON task
+        BEGIN
+            UPDATE search_index
+            SET title = new.title,
+                description = new.description,
+                project_id = new.project_id,
+                owner_id = new.owner_id
+            WHERE rowid = new.id * 2;
+        END
+    """,
+    """
+        CREATE TRIGGER task_search_delete AFTER DELETE ON task
+        BEGIN
+            DELETE FROM search_index WHERE rowid = old.id * 2;
+        END
+    """,
+    """
+        CREATE TRIGGER project_search_insert
+        AFTER INSERT ON project
+        BEGIN
+            INSERT INTO search_index (
+                rowid, title, kind, item_id, project_id, owner_id
+            )
+            VALUES (
+                new.id * 2 + 1, new.name, 'project', new.id, new.id,
+                new.owner_id
+            );
+        END
+    """,
+    """
+        CREATE TRIGGER project_search_update
+        AFTER UPDATE OF name, owner_id ON project
+        BEGIN
+            UPDATE search_index
+            SET title = new.name, owner_id = new.owner_id
+            WHERE rowid = new.id * 2 + 1;
+        END
+    """,
+    """
+        CREATE TRIGGER project_search_delete
+        AFTER DELETE ON project
+        BEGIN
+            DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+        END
+    """,
+]
+
+TRIGGERS = [
+    "task_search_insert",
+    "task_search_update",
+    "task_search_delete",
+    "project_search_insert",
+    "project_search_update",
+    "project_search_delete",
+]
+
+
+def upgrade() -> None:
+    for statement in SEARCH_INDEX_DDL:
+        op.execute(statement)
+
+    op.execute(
+        """
+        INSERT INTO search_index (
+            rowid, title, description, kind, item_id, project_id, owner_id
+        )
+        SELECT id * 2, title, description, 'task', id, project_id, owner_id
+        FROM task
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO search_index (
+            rowid, title, kind, item_id, project_id, owner_id
+        )
+        SELECT id * 2 + 1, name, 'project', id, id, owner_id
+        FROM project
+        """
+    )
+
+
+def downgrade() -> None:
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER {trigger}")
+    op.execute("DROP TABLE search_index")
@@ -0,0 +1,143 @@
+import zlib
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+
+from .negotiation import negotiate
+
+# Streams that must reach the client message by message
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+
+
+class GzipEncoder:
+    def __init__(self):
+        self.compressor = zlib.compressobj(
+            settings.GZIP_COMPRESS_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, flushed so the client can decode it now."""
+        return self.compressor.compress(data) + self.compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, flushed so the client can decode it now."""
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self.compressor.process(data) + self.compressor.finish()
+
+
+# Content codings in order of preference
+ENCODERS = {"br": BrotliEncoder, "gzip": GzipEncoder}
+
+
+class CompressionMiddleware:
+    """Compress responses with the coding the client accepts.
+
+    Like Starlette's GZipMiddleware, but negotiating brotli or gzip from
+    Accept-Encoding, and flushing each chunk of a streamed response so
+    that it is not held back until the compressor's buffer fills. Bodies
+    below ``minimum_size``, already encoded responses and event streams
+    are sent as they are.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            coding = negotiate(
+                Headers(scope=scope).get("accept-encoding"), list(ENCODERS)
+            )
+            if coding is not None:
+                responder = CompressionResponder(
+                    self.app, coding, self.minimum_size
+                )
+                await responder(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, coding: str, minimum_size: int):
+        self.app = app
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.encoder = None
+        self.start_message: Message = {}
+        self.started = False
+        self.bypass = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.bypass = "content-encoding" in headers or headers.get(
+                "content-type", ""
+            ).startswith(UNCOMPRESSED_MEDIA_TYPES)
+            # Otherwise held back until the first body shows whether to
+            # compress; an event stream's may be a heartbeat away
+            if self.bypass:
+                await self.start()
+            return
+
+        if message["type"] != "http.response.body" or self.bypass:
+            await self.start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.started:
+            if self.encoder is not None:
+                message["body"] = self.encode(body, more_body)
+            await self.send(message)
+            return
+
+        if len(body) < self.minimum_size and not more_body:
+            await self.start()
+            await self.send(message)
+            return
+
+        self.encoder = ENCODERS[self.coding]()
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        message["body"] = self.encode(body, more_body)
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(message["body"]))
+
+        await self.start()
+        await self.send(message)
+
+    def encode(self, body: bytes, more_body: bool) -> bytes:
+        if more_body:
+            return self.encoder.compress(body)
+
+        return self.encoder.finish(body)
+
+    async def start(self) -> None:
+        if not self.started:
+            self.started = True
+            await self.send(self.start_message)
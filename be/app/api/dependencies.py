@@ -8,17 +8,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.config.settings import settings
-from app.db import AsyncSessionLocal
+from app.core import user_cache
+from app.db import AsyncSessionLocal, ReadSessionLocal
 from app.models import User as UserModel
-from app.schemas import User
+from app.schemas import User, UserInDB
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False
+)
 
 
-async def get_db():
-    """Get database session."""
+async def get_write_db():
+    """Get a session on the single writer connection."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -26,8 +30,31 @@ async def get_db():
             await session.close()
 
 
+async def get_read_db():
+    """Get a session from the read-only connection pool."""
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def get_read_session_factory():
+    """Get the factory of read-only sessions.
+
+    For responses that read the database while they are sent (streams),
+    after the request's own session has been closed.
+    """
+    return ReadSessionLocal
+
+
+# Kept for callers that predate the read/write split
+get_db = get_write_db
+
+
 async def get_current_user(
-    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+    db: AsyncSession = Depends(get_read_db),
+    token: str = Depends(oauth2_scheme),
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,17 +65,28 @@ async def get_current_user(
         payload = decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        user_id: Optional[str] = payload.get("sub")
+        subject: Optional[str] = payload.get("sub")
 
-        if user_id is None:
+        if subject is None:
             raise credentials_exception
-    except JWTError:
+
+        user_id = int(subject)
+    except (JWTError, ValueError):
         raise credentials_exception
 
-    result = await db.execute(select(UserModel).filter(UserModel.id == user_id))
-    user = result.scalar_one_or_none()
+    # Serve the user from the in-process cache and only hit the database
+    # on a miss. Writers must call user_cache.invalidate() after commit.
+    user = user_cache.get(user_id)
     if user is None:
-        raise credentials_exception
+        result = await db.execute(
+            select(UserModel).filter(UserModel.id == user_id)
+        )
+        db_user = result.scalar_one_or_none()
+        if db_user is None:
+            raise credentials_exception
+
+        user = UserInDB.model_validate(db_user)
+        user_cache.set(user_id, user)
 
     if not user.is_active:
         raise HTTPException(
@@ -59,6 +97,26 @@ async def get_current_user(
     return user
 
 
+async def get_current_stream_user(
+    db: AsyncSession = Depends(get_read_db),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = None,
+):
+    """Like get_current_user, also taking the token from the query string.
+
+    Browsers' EventSource cannot send an Authorization header.
+    """
+    token = token or access_token
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return await get_current_user(db, token)
+
+
 async def get_current_active_superuser(
     current_user: User = Depends(get_current_user),
 ):
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+
+from app.core import event_broker, password_executor, user_cache
+from app.db import group_writer, query_plans, tag_index
+from app.schemas import User
+
+from ..dependencies import get_current_active_superuser
+from ..responses import JSONRoute
+
+router = APIRouter(route_class=JSONRoute)
+
+
+@router.get("/stats", response_model=dict[str, dict[str, int]])
+async def get_stats(
+    current_user: User = Depends(get_current_active_superuser),
+):
+    """Get in-process cache and worker pool counters."""
+    return {
+        "user_cache": user_cache.stats(),
+        "password_executor": password_executor.stats(),
+        "group_writer": group_writer.stats(),
+        "tag_index": tag_index.stats(),
+        "query_plans": query_plans.stats(),
+        "event_broker": event_broker.stats(),
+    }
@@ -3,61 +3,72 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user, get_db
+from app.api.dependencies import get_current_user, get_read_db, get_write_db
+from app.api.responses import JSONRoute
 from app.core import (
     create_access_token,
     create_refresh_token,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    user_cache,
+    verify_password_async,
 )
+from app.db.writer import run_write
 from app.models import User as UserModel, Project as ProjectModel
 from app.schemas import User, UserCreate, UserUpdate
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.post("/register", response_model=User)
-async def register(*, db: AsyncSession = Depends(get_db), user_in: UserCreate):
+async def register(
+    *, db: AsyncSession = Depends(get_write_db), user_in: UserCreate
+):
     """Register new user."""
-    # Check if user exists
-    result = await db.execute(
-        select(UserModel).filter(UserModel.email == user_in.email)
-    )
-    user = result.scalar_one_or_none()
+    # Hash before queueing the write so bcrypt never holds the writer
+    hashed_password = await get_password_hash_async(user_in.password)
 
-    if user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="The user with this email already exists in the system.",
+    async def apply(session: AsyncSession) -> User:
+        # Check if user exists
+        result = await session.execute(
+            select(UserModel).filter(UserModel.email == user_in.email)
+        )
+        user = result.scalar_one_or_none()
+
+        if user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The user with this email already exists in the "
+                "system.",
+            )
+
+        # Create new user
+        user = UserModel(
+            email=user_in.email,
+            hashed_password=hashed_password,
+            is_active=True,
+            is_superuser=False,
+        )
+        session.add(user)
+        await session.flush()
+
+        # Create Inbox project for the new user
+        inbox_project = ProjectModel(
+            name="Inbox",
+            description="Default inbox project for unassigned tasks",
+            is_inbox=True,
+            owner_id=user.id,
         )
+        session.add(inbox_project)
+        await session.flush()
 
-    # Create new user
-    user = UserModel(
-        email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
-        is_active=True,
-        is_superuser=False,
-    )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-
-    # Create Inbox project for the new user
-    inbox_project = ProjectModel(
-        name="Inbox",
-        description="Default inbox project for unassigned tasks",
-        is_inbox=True,
-        owner_id=user.id,
-    )
-    db.add(inbox_project)
-    await db.commit()
+        return User.model_validate(user)
 
-    return user
+    return await run_write(db, apply)
 
 
 @router.post("/login")
 async def login(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ):
     """
@@ -68,7 +79,7 @@ async def login(
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(
+    if not user or not await verify_password_async(
         form_data.password, user.hashed_password
     ):
         raise HTTPException(
@@ -110,21 +121,29 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 @router.put("/me", response_model=User)
 async def update_user_me(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user_in: UserUpdate,
     current_user: User = Depends(get_current_user),
 ):
     """Update own user."""
+    hashed_password = None
     if user_in.password is not None:
-        current_user.hashed_password = get_password_hash(user_in.password)
+        hashed_password = await get_password_hash_async(user_in.password)
 
-    if user_in.full_name is not None:
-        current_user.full_name = user_in.full_name
+    async def apply(session: AsyncSession) -> User:
+        # current_user is a cached snapshot, so load the row to modify it
+        user = await session.get(UserModel, current_user.id)
 
-    if user_in.email is not None:
-        current_user.email = user_in.email
+        if hashed_password is not None:
+            user.hashed_password = hashed_password
 
-    await db.commit()
-    await db.refresh(current_user)
+        if user_in.email is not None:
+            user.email = user_in.email
+        await session.flush()
 
-    return current_user
+        return User.model_validate(user)
+
+    user = await run_write(db, apply)
+    user_cache.invalidate(user.id)
+
+    return user
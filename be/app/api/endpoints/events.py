@@ -0,0 +1,78 @@
+import json
+from typing import Any, AsyncIterator
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.config.settings import settings
+from app.core import Subscription, event_broker
+from app.schemas import User
+
+from ..dependencies import get_current_stream_user
+from ..responses import JSONRoute
+
+router = APIRouter(route_class=JSONRoute)
+
+# An SSE comment, which clients ignore; keeps proxies from closing idle
+# connections and lets the server notice clients that went away
+KEEPALIVE = ": keepalive\n\n"
+
+
+def format_event(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventStreamResponse(StreamingResponse):
+    """A user's events as Server-Sent Events, until disconnected.
+
+    The subscription lives exactly as long as the response is being sent:
+    it is taken before the headers go out, so nothing that happens after
+    the client's EventSource opens is missed, and dropped however sending
+    ends, also when the client is gone before the body starts.
+    """
+
+    def __init__(self, user_id: int, heartbeat: float):
+        super().__init__(
+            self.stream_events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.user_id = user_id
+        self.heartbeat = heartbeat
+        self.subscription: Subscription | None = None
+
+    async def stream_events(self) -> AsyncIterator[str]:
+        while True:
+            events = await self.subscription.get(timeout=self.heartbeat)
+            if not events:
+                yield KEEPALIVE
+                continue
+
+            yield "".join(format_event(*event) for event in events)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.subscription = event_broker.subscribe(self.user_id)
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            event_broker.unsubscribe(self.subscription)
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def events(current_user: User = Depends(get_current_stream_user)):
+    """Stream change notifications for the current user (Server-Sent Events).
+
+    Every create, update and delete of one of the user's projects or tasks
+    is sent to all of the user's connections as ``project.created``,
+    ``task.updated`` etc., with the ids of what changed. Events only say
+    what changed; GET /sync returns the changes themselves. A ``resync``
+    event replaces events a slow client missed, so it should sync then.
+
+    The token may be passed as the ``access_token`` query parameter, as
+    EventSource cannot send headers. Only writes handled by the same
+    server process are seen.
+    """
+    return EventStreamResponse(
+        current_user.id, settings.EVENT_HEARTBEAT_SECONDS
+    )
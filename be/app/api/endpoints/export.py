@@ -0,0 +1,144 @@
+import csv
+import io
+from typing import AsyncIterator, Literal, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import Column, ColumnElement, Select, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config.settings import settings
+from app.models import Project as ProjectModel
+from app.models import Tag as TagModel
+from app.models import Task as TaskModel
+from app.models import task_tag
+from app.schemas import (
+    EXPORT_CSV_COLUMNS,
+    ProjectExport,
+    ProjectExportList,
+    TaskExport,
+    TaskExportList,
+    User,
+)
+
+from ..dependencies import get_current_user, get_read_session_factory
+from ..filters import ExportFilters
+from ..pagination import keyset_chunks
+from ..responses import JSONRoute
+from ..rows import response_columns
+
+router = APIRouter(route_class=JSONRoute)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# A query of an export, its keyset order, the condition bounding only its
+# first chunk (see keyset_chunks), and the adapter validating its rows
+ExportQuery = tuple[Select, list[Column], Optional[ColumnElement], TypeAdapter]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def encode_ndjson(items: list) -> bytes:
+    return b"".join(to_json(item) + b"\n" for item in items)
+
+
+def encode_csv(adapter: TypeAdapter, items: list) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, EXPORT_CSV_COLUMNS)
+    for row in adapter.dump_python(items, mode="json"):
+        if "tags" in row:
+            # Tag names cannot contain spaces
+            row["tags"] = " ".join(row["tags"])
+        writer.writerow(row)
+
+    return buffer.getvalue().encode()
+
+
+def export_queries(owner_id: int, filters: ExportFilters) -> list[ExportQuery]:
+    """The queries of a user's export, with their order and adapter."""
+    projects = select(
+        *response_columns(ProjectModel, ProjectExport, kind=literal("project"))
+    ).where(ProjectModel.owner_id == owner_id)
+
+    tags = (
+        select(func.json_group_array(TagModel.name))
+        .select_from(task_tag.join(TagModel))
+        .where(task_tag.c.task_id == TaskModel.id)
+        .scalar_subquery()
+    )
+    tasks = filters.apply(
+        select(
+            *response_columns(
+                TaskModel, TaskExport, kind=literal("task"), tags=tags
+            )
+        ).where(TaskModel.owner_id == owner_id)
+    )
+
+    return [
+        (projects, [ProjectModel.id], None, ProjectExportList),
+        (tasks, filters.order(), filters.start(), TaskExportList),
+    ]
+
+
+async def export_rows(
+    session_factory: async_sessionmaker[AsyncSession],
+    queries: list[ExportQuery],
+    format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """Encode the rows of each query in turn, a keyset chunk at a time."""
+    if format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(EXPORT_CSV_COLUMNS)
+        yield buffer.getvalue().encode()
+
+    for query, order, start, adapter in queries:
+        async for rows in keyset_chunks(
+            session_factory, query, order, settings.STREAM_CHUNK_SIZE, start
+        ):
+            items = adapter.validate_python(rows)
+            if format == "csv":
+                yield encode_csv(adapter, items)
+            else:
+                yield encode_ndjson(items)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export(
+    format: ExportFormat = "ndjson",
+    filters: ExportFilters = Depends(),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_read_session_factory
+    ),
+    current_user: User = Depends(get_current_user),
+):
+    """Export all of the current user's projects and tasks.
+
+    All projects come first, then the tasks, each with its tags and
+    completed_at, optionally only those created, completed or due in the
+    given ranges. Each line of NDJSON is one of them, with ``kind``
+    telling which; CSV has one row per item, and the columns of both.
+
+    The export is streamed as it is read, in keyset chunks of
+    STREAM_CHUNK_SIZE rows that each take a short read transaction of
+    their own, so exports of any size use constant memory and never hold
+    a snapshot for long. Items changed while an export runs may appear as
+    they were before or after the change.
+    """
+    return StreamingResponse(
+        export_rows(
+            session_factory,
+            export_queries(current_user.id, filters),
+            format,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="minifocus-export.{format}"'
+            )
+        },
+    )
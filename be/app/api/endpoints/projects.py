@@ -1,63 +1,252 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import settings
+from app.core import event_broker
+from app.db import tag_index
+from app.db.writer import run_write
 from app.models.project import Project as ProjectModel
-from app.schemas.project import Project, ProjectCreate, ProjectUpdate
+from app.models.project_closure import (
+    UNLINK_SUBTREE,
+    project_closure,
+    subtree_ids,
+)
+from app.models.project_counters import (
+    PROJECT_COUNTERS,
+    next_overdue,
+    overdue_count,
+)
+from app.models.task import Task as TaskModel
+from app.schemas.project import (
+    Project,
+    ProjectCreate,
+    ProjectList,
+    ProjectTreeNode,
+    ProjectUpdate,
+)
 
-from ..dependencies import get_db, get_current_user
+from ..dependencies import (
+    get_current_user,
+    get_read_db,
+    get_read_session_factory,
+    get_write_db,
+)
+from ..etag import conditional_get
+from ..pagination import fetch_page
+from ..repository import (
+    check_new_parent,
+    check_project_access,
+    get_owned_project,
+)
+from ..responses import JSONRoute
+from ..rows import response_columns
+from ..streaming import StreamFormat, check_stream_params, stream_listing
 from app.schemas import User
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.post("/projects/", response_model=Project)
 async def create_project(
     project: ProjectCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new project."""
-    db_project = ProjectModel(**project.model_dump())
-    db_project.owner_id = current_user.id
-    db.add(db_project)
 
-    await db.commit()
-    await db.refresh(db_project)
+    async def apply(session: AsyncSession) -> Project:
+        if project.parent_id is not None:
+            await check_new_parent(
+                session, None, project.parent_id, current_user.id
+            )
 
-    return Project.model_validate(db_project)
+        db_project = ProjectModel(**project.model_dump())
+        db_project.owner_id = current_user.id
+        session.add(db_project)
+        await session.flush()
+
+        return Project.model_validate(db_project)
+
+    result = await run_write(db, apply)
+    event_broker.publish(current_user.id, "project.created", id=result.id)
+
+    return result
 
 
 @router.get("/projects/", response_model=List[Project])
 async def get_projects(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[StreamFormat] = None,
+    db: AsyncSession = Depends(get_read_db),
+    session_factory=Depends(get_read_session_factory),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all projects for the current user."""
-    result = await db.execute(
-        select(ProjectModel).filter(ProjectModel.owner_id == current_user.id)
+    """Get all projects for the current user, with their task counters.
+
+    Passing ``limit`` or ``cursor`` returns one page in id order instead,
+    with the cursor of the next page in the X-Next-Cursor header.
+    ``stream`` sends them as they are read, as for task listings. Requests
+    with a current ETag in If-None-Match get a 304 instead.
+    """
+    check_stream_params(stream, limit, cursor)
+    now = datetime.now()
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        current_user.id,
+        next_overdue(current_user.id, now),
+    )
+    if not_modified:
+        return not_modified
+
+    columns = response_columns(
+        ProjectModel, Project, overdue_count=overdue_count(now)
     )
-    projects = result.scalars().all()
+    query = select(*columns).filter(ProjectModel.owner_id == current_user.id)
+
+    if stream is not None:
+        return stream_listing(
+            session_factory,
+            query.order_by(ProjectModel.id),
+            ProjectList,
+            stream,
+            response,
+        )
+
+    if limit is None and cursor is None:
+        result = await db.execute(query.order_by(ProjectModel.id))
+        rows = result.mappings().all()
+    else:
+        rows = await fetch_page(
+            db,
+            query,
+            response,
+            order="id",
+            columns=[ProjectModel.id],
+            limit=limit or settings.DEFAULT_PAGE_SIZE,
+            cursor=cursor,
+        )
+
+    return ProjectList.validate_python(rows)
 
-    return [Project.model_validate(project) for project in projects]
+
+# Columns of a project tree node
+TREE_COLUMNS = [
+    ProjectModel.id,
+    ProjectModel.parent_id,
+    ProjectModel.name,
+    ProjectModel.description,
+    ProjectModel.status,
+    ProjectModel.is_flagged,
+    ProjectModel.is_inbox,
+    *(getattr(ProjectModel, name) for name in PROJECT_COUNTERS),
+]
+
+
+@router.get("/projects/tree", response_model=List[ProjectTreeNode])
+async def get_project_tree(
+    request: Request,
+    response: Response,
+    root_id: Optional[int] = None,
+    max_depth: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the project hierarchy of the current user.
+
+    The whole hierarchy, or only the subtree under ``root_id``, is read
+    from the closure table in one query together with the task counters
+    of each project. ``max_depth`` limits how many levels below the
+    root(s) are returned.
+    """
+    now = datetime.now()
+    not_modified = await conditional_get(
+        request,
+        response,
+        db,
+        current_user.id,
+        next_overdue(current_user.id, now),
+    )
+    if not_modified:
+        return not_modified
+
+    depth = project_closure.c.depth
+    task_count = (
+        ProjectModel.todo_count
+        + ProjectModel.done_count
+        + ProjectModel.dropped_count
+        + ProjectModel.deferred_count
+    )
+    query = (
+        select(
+            *TREE_COLUMNS,
+            depth,
+            task_count.label("task_count"),
+            overdue_count(now).label("overdue_count"),
+        )
+        .join(
+            project_closure,
+            project_closure.c.descendant_id == ProjectModel.id,
+        )
+        .where(ProjectModel.owner_id == current_user.id)
+    )
+
+    if root_id is None:
+        root = aliased(ProjectModel)
+        query = query.join(
+            root, root.id == project_closure.c.ancestor_id
+        ).where(root.owner_id == current_user.id, root.parent_id.is_(None))
+    else:
+        query = query.where(project_closure.c.ancestor_id == root_id)
+
+    if max_depth is not None:
+        query = query.where(depth <= max_depth)
+
+    result = await db.execute(query)
+    rows = result.mappings().all()
+
+    if root_id is not None and not rows:
+        # Only reached on failure, to tell a missing project from a
+        # foreign one
+        await check_project_access(db, root_id, current_user.id)
+
+    nodes = {row["id"]: ProjectTreeNode(**row) for row in rows}
+    roots = []
+    for node_id in sorted(nodes):
+        node = nodes[node_id]
+        if node.depth == 0:
+            roots.append(node)
+        else:
+            nodes[node.parent_id].children.append(node)
+
+    return roots
 
 
 @router.get("/projects/{project_id}", response_model=Project)
 async def get_project(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a project by ID."""
-    project = await db.get(ProjectModel, project_id)
-
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    not_modified = await conditional_get(
+        request, response, db, current_user.id
+    )
+    if not_modified:
+        return not_modified
 
-    if project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    project = await get_owned_project(db, project_id, current_user.id)
 
     return Project.model_validate(project)
 
@@ -66,48 +255,126 @@ async def get_project(
 async def update_project(
     project_id: int,
     project: ProjectUpdate,
-    db: AsyncSession = Depends(get_db),
+    cascade: bool = False,
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Update a project."""
-    db_project = await db.get(ProjectModel, project_id)
+    """Update a project.
 
-    if not db_project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    With ``cascade``, a status change is also applied to every descendant
+    project and to the tasks of the whole subtree, with one UPDATE each.
+    """
 
-    if db_project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    async def apply(session: AsyncSession) -> Project:
+        db_project = await get_owned_project(
+            session, project_id, current_user.id
+        )
 
-    for key, value in project.model_dump(exclude_unset=True).items():
-        setattr(db_project, key, value)
+        changes = project.model_dump(exclude_unset=True)
+        if changes.get("parent_id") not in (None, db_project.parent_id):
+            await check_new_parent(
+                session, project_id, changes["parent_id"], current_user.id
+            )
 
-    await db.commit()
-    await db.refresh(db_project)
+        for key, value in changes.items():
+            setattr(db_project, key, value)
+        await session.flush()
 
-    return Project.model_validate(db_project)
+        if cascade and "status" in changes:
+            subtree = subtree_ids(project_id)
+            await session.execute(
+                update(ProjectModel)
+                .where(
+                    ProjectModel.id.in_(subtree),
+                    ProjectModel.id != project_id,
+                )
+                .values(status=changes["status"])
+                .execution_options(synchronize_session=False)
+            )
+            await session.execute(
+                update(TaskModel)
+                .where(TaskModel.project_id.in_(subtree))
+                .values(status=changes["status"])
+                .execution_options(synchronize_session=False)
+            )
+            # The task counters were changed by triggers
+            await session.refresh(db_project, list(PROJECT_COUNTERS))
+
+        return Project.model_validate(db_project)
+
+    result = await run_write(db, apply)
+    event_broker.publish(
+        current_user.id, "project.updated", id=project_id, cascade=cascade
+    )
+
+    return result
 
 
 @router.delete("/projects/{project_id}", response_model=dict[str, str])
 async def delete_project(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    cascade: bool = False,
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a project."""
-    project = await db.get(ProjectModel, project_id)
+    """Delete a project and its tasks.
+
+    Sub-projects become top-level projects, unless ``cascade`` is set: then
+    the whole subtree and all of its tasks are deleted with one DELETE per
+    table, without loading any of the rows.
+    """
+
+    async def apply(session: AsyncSession) -> None:
+        if not cascade:
+            project = await get_owned_project(
+                session, project_id, current_user.id
+            )
 
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+            if project.is_inbox:
+                raise HTTPException(
+                    status_code=400, detail="Cannot delete Inbox project"
+                )
 
-    if project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+            await session.execute(
+                delete(TaskModel)
+                .where(TaskModel.project_id == project_id)
+                .execution_options(synchronize_session=False)
+            )
+            await session.delete(project)
+            return
 
-    if project.is_inbox:
-        raise HTTPException(
-            status_code=400, detail="Cannot delete Inbox project"
+        await check_project_access(session, project_id, current_user.id)
+
+        subtree = subtree_ids(project_id)
+        has_inbox = await session.scalar(
+            select(
+                exists().where(
+                    ProjectModel.id.in_(subtree), ProjectModel.is_inbox
+                )
+            )
         )
+        if has_inbox:
+            raise HTTPException(
+                status_code=400, detail="Cannot delete Inbox project"
+            )
 
-    await db.delete(project)
-    await db.commit()
+        await session.execute(
+            delete(TaskModel)
+            .where(TaskModel.project_id.in_(subtree))
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(
+            delete(ProjectModel)
+            .where(ProjectModel.id.in_(subtree))
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(UNLINK_SUBTREE, {"project_id": project_id})
+
+    await run_write(db, apply)
+    # The deleted tasks were never loaded, so drop the tag bitmaps
+    tag_index.invalidate(current_user.id)
+    event_broker.publish(
+        current_user.id, "project.deleted", id=project_id, cascade=cascade
+    )
 
     return {"message": "Project deleted successfully"}
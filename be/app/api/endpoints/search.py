@@ -0,0 +1,88 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.models import search_index
+from app.schemas import SearchResult, User
+
+from ..dependencies import get_current_user, get_read_db
+from ..responses import JSONRoute
+
+router = APIRouter(route_class=JSONRoute)
+
+SNIPPET_TOKENS = 12
+SEARCH_TRUNCATED_HEADER = "X-Search-Truncated"
+
+
+def to_match_query(q: str, owner_id: int) -> str | None:
+    """Turn free text into an FTS5 query over one user's documents.
+
+    Every word is quoted so FTS5 operators in the input are taken
+    literally, and the last word matches as a prefix so results show up
+    while typing. The words are looked for in the title and description
+    only, of documents whose indexed owner_id is ``owner_id``.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in q.split()]
+    if not terms:
+        return None
+
+    owner = f'owner_id : "{owner_id}"'
+    words = " ".join(terms) + "*"
+    return f"{owner} AND {{title description}} : ({words})"
+
+
+@router.get("/search", response_model=List[SearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Search the current user's tasks and projects, best match first.
+
+    Only the newest ``SEARCH_RANK_WINDOW`` of the user's matches are
+    ranked: finding them walks the index in rowid order and stops early,
+    whereas ranking scores every candidate, so very common words stay as
+    cheap as rare ones. When there are older matches left out, the
+    response has an X-Search-Truncated header, and a longer query narrows
+    them down.
+    """
+    match = to_match_query(q, current_user.id)
+    if match is None:
+        return []
+
+    index = literal_column("search_index")
+    rank = literal_column("rank")
+    # The newest match outside the window, if there is one
+    cutoff = await db.scalar(
+        select(search_index.c.rowid)
+        .where(index.match(match))
+        .order_by(search_index.c.rowid.desc())
+        .offset(settings.SEARCH_RANK_WINDOW)
+        .limit(1)
+    )
+    if cutoff is not None:
+        response.headers[SEARCH_TRUNCATED_HEADER] = "true"
+
+    query = (
+        select(
+            search_index.c.kind,
+            search_index.c.item_id.label("id"),
+            search_index.c.project_id,
+            search_index.c.title,
+            func.snippet(
+                index, -1, "<mark>", "</mark>", "…", SNIPPET_TOKENS
+            ).label("snippet"),
+            rank,
+        )
+        .where(index.match(match), search_index.c.rowid > (cutoff or 0))
+        .order_by(rank)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+
+    return [SearchResult.model_validate(row) for row in result.mappings()]
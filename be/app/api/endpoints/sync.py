@@ -0,0 +1,87 @@
+import heapq
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.db import read_snapshot
+from app.models import Project as ProjectModel
+from app.models import Task as TaskModel
+from app.models import tombstone
+from app.schemas import Project, SyncPage, Task, Tombstone, User
+
+from ..dependencies import get_current_user, get_read_db
+from ..responses import JSONRoute
+
+router = APIRouter(route_class=JSONRoute)
+
+
+@router.get("/sync", response_model=SyncPage)
+async def sync(
+    since: int = Query(0, ge=0),
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the current user's projects and tasks changed after ``since``.
+
+    Every change to a user's data takes the next number in their change
+    sequence. Projects and tasks are returned in their current state,
+    deletes as tombstones, at most ``limit`` of them together in sequence
+    order. Start from 0 and pass back the returned cursor; each table is
+    read with one range query on its (owner_id, change_seq) index, so a
+    page costs the size of the diff, not of the dataset. The three are
+    read from one snapshot: a change committed in between would otherwise
+    show up in a later table and move the cursor past the changes before
+    it in an earlier one.
+    """
+    changes = []
+    async with read_snapshot(db):
+        for model in [ProjectModel, TaskModel]:
+            result = await db.execute(
+                select(model.change_seq, model)
+                .where(
+                    model.owner_id == current_user.id,
+                    model.change_seq > since,
+                )
+                .order_by(model.change_seq)
+                .limit(limit + 1)
+            )
+            changes.append([(seq, model, row) for seq, row in result])
+
+        result = await db.execute(
+            select(tombstone)
+            .where(
+                tombstone.c.owner_id == current_user.id,
+                tombstone.c.change_seq > since,
+            )
+            .order_by(tombstone.c.change_seq)
+            .limit(limit + 1)
+        )
+        changes.append([(row.change_seq, tombstone, row) for row in result])
+
+    merged = list(heapq.merge(*changes, key=lambda change: change[0]))
+    page = merged[:limit]
+
+    return SyncPage(
+        projects=[
+            Project.model_validate(row)
+            for _, kind, row in page
+            if kind is ProjectModel
+        ],
+        tasks=[
+            Task.model_validate(row)
+            for _, kind, row in page
+            if kind is TaskModel
+        ],
+        deleted=[
+            Tombstone(kind=row.kind, id=row.item_id)
+            for _, kind, row in page
+            if kind is tombstone
+        ],
+        cursor=page[-1][0] if page else since,
+        has_more=len(merged) > limit,
+    )
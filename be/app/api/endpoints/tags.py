@@ -0,0 +1,173 @@
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.core import event_broker
+from app.core.tag_query import TagQuerySyntaxError, evaluate, parse_tag_query
+from app.db import tag_index
+from app.db.writer import run_write
+from app.models import Tag as TagModel
+from app.models import Task as TaskModel
+from app.models import task_tag
+from app.schemas import Tag, Task, TaskList, TaskTags, User
+
+from ..dependencies import get_current_user, get_read_db, get_write_db
+from ..pagination import fetch_page
+from ..repository import get_owned_task
+from ..responses import JSONRoute
+from ..rows import TASK_COLUMNS
+
+router = APIRouter(route_class=JSONRoute)
+
+
+@router.get("/tags", response_model=List[Tag])
+async def get_tags(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get all tags of the current user, by name."""
+    result = await db.execute(
+        select(TagModel)
+        .where(TagModel.owner_id == current_user.id)
+        .order_by(TagModel.name)
+    )
+
+    return [Tag.model_validate(tag) for tag in result.scalars()]
+
+
+@router.get(
+    "/projects/{project_id}/tasks/{task_id}/tags", response_model=TaskTags
+)
+async def get_task_tags(
+    project_id: int,
+    task_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the tags of a task."""
+    await get_owned_task(db, project_id, task_id, current_user.id)
+
+    result = await db.execute(
+        select(TagModel.name)
+        .join(task_tag, task_tag.c.tag_id == TagModel.id)
+        .where(task_tag.c.task_id == task_id)
+    )
+
+    return TaskTags(tags=result.scalars().all())
+
+
+@router.put(
+    "/projects/{project_id}/tasks/{task_id}/tags", response_model=TaskTags
+)
+async def set_task_tags(
+    project_id: int,
+    task_id: int,
+    tags: TaskTags,
+    db: AsyncSession = Depends(get_write_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Replace the tags of a task, creating tags that don't exist yet."""
+
+    async def apply(session: AsyncSession) -> TaskTags:
+        await get_owned_task(session, project_id, task_id, current_user.id)
+
+        tag_ids = dict(
+            (
+                await session.execute(
+                    select(TagModel.name, TagModel.id).where(
+                        TagModel.owner_id == current_user.id,
+                        TagModel.name.in_(tags.tags),
+                    )
+                )
+            ).all()
+        )
+        missing = [name for name in tags.tags if name not in tag_ids]
+        if missing:
+            created = await session.execute(
+                insert(TagModel).returning(TagModel.name, TagModel.id),
+                [
+                    {"name": name, "owner_id": current_user.id}
+                    for name in missing
+                ],
+            )
+            tag_ids.update(created.all())
+
+        await session.execute(
+            delete(task_tag).where(task_tag.c.task_id == task_id)
+        )
+        if tag_ids:
+            await session.execute(
+                insert(task_tag),
+                [
+                    {"tag_id": tag_id, "task_id": task_id}
+                    for tag_id in tag_ids.values()
+                ],
+            )
+
+        return tags
+
+    result = await run_write(db, apply)
+    tag_index.set_task_tags(current_user.id, task_id, result.tags)
+    event_broker.publish(
+        current_user.id, "task.updated", id=task_id, project_id=project_id
+    )
+
+    return result
+
+
+@router.get("/tasks/filter", response_model=List[Task])
+async def filter_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the current user's tasks matching a tag expression.
+
+    ``q`` combines tags with AND, OR, NOT and parentheses, e.g.
+    ``@errands AND @phone NOT @waiting``. The expression is evaluated on
+    the in-memory tag bitmaps; the database is only asked for the
+    resulting tasks, by primary key. Pagination works as for task
+    listings, in id order.
+    """
+    try:
+        expression = parse_tag_query(q)
+    except TagQuerySyntaxError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    tags = await tag_index.get(db, current_user.id)
+    matches = evaluate(expression, tags.bitmaps)
+
+    # A negative bitmap matches every task except those in its complement
+    negated = matches < 0
+    ids = func.json_each(
+        json.dumps(tags.ids(~matches if negated else matches))
+    ).table_valued("value")
+    in_ids = TaskModel.id.in_(select(ids.c.value))
+
+    query = select(*TASK_COLUMNS).where(
+        TaskModel.owner_id == current_user.id,
+        ~in_ids if negated else in_ids,
+    )
+
+    if limit is None and cursor is None:
+        result = await db.execute(query.order_by(TaskModel.id))
+        rows = result.mappings().all()
+    else:
+        rows = await fetch_page(
+            db,
+            query,
+            response,
+            order="id",
+            columns=[TaskModel.id],
+            limit=limit or settings.DEFAULT_PAGE_SIZE,
+            cursor=cursor,
+        )
+
+    return TaskList.validate_python(rows)
@@ -1,89 +1,250 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Select, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.models import Project as ProjectModel
+from app.config.settings import settings
+from app.core import event_broker
+from app.db import query_plans, tag_index
+from app.db.query_plan import QUERY_PLAN_HEADER
+from app.db.writer import run_write
 from app.models import Task as TaskModel
-from app.schemas import Task, TaskCreate, TaskUpdate, User
-
-from ..dependencies import get_db, get_current_user
+from app.schemas import (
+    Task,
+    TaskBulkRequest,
+    TaskBulkResult,
+    TaskCreate,
+    TaskList,
+    TaskUpdate,
+    User,
+)
 
-router = APIRouter()
+from ..dependencies import (
+    get_current_user,
+    get_read_db,
+    get_read_session_factory,
+    get_write_db,
+)
+from ..etag import conditional_get
+from ..filters import TaskFilters
+from ..pagination import fetch_page
+from ..repository import (
+    check_project_access,
+    get_owned_task,
+    get_project_owners,
+    get_task_projects,
+)
+from ..responses import JSONRoute
+from ..rows import TASK_COLUMNS
+from ..streaming import StreamFormat, check_stream_params, stream_listing
+
+router = APIRouter(route_class=JSONRoute)
+
+# Sort keys for task listings. Each ends with the primary key so that it
+# is unique, and each is backed by an index starting with project_id and
+# one starting with owner_id.
+TASK_ORDERINGS = {
+    "id": [TaskModel.id],
+    "due_date": [TaskModel.due_date, TaskModel.id],
+    "priority": [TaskModel.priority, TaskModel.id],
+}
+
+TaskOrder = Literal["id", "due_date", "priority"]
+
+
+async def list_tasks(
+    db: AsyncSession,
+    query: Select,
+    response: Response,
+    scope: str,
+    filters: TaskFilters,
+    order_by: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+    stream: Optional[StreamFormat] = None,
+    session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+) -> list[Task] | Response:
+    """Filter, sort and optionally paginate a query of TASK_COLUMNS.
+
+    With ``stream``, the whole listing is streamed instead, from a session
+    of ``session_factory``. Filter combinations that no index supports are
+    still answered, but are logged once and flagged with the X-Query-Plan
+    response header.
+    """
+    query = filters.apply(query)
+    ordering = TASK_ORDERINGS[order_by]
+
+    problems = await query_plans.check(
+        await db.connection(),
+        ("tasks", scope, order_by, filters.shape()),
+        query.order_by(*ordering),
+    )
+    if problems:
+        response.headers[QUERY_PLAN_HEADER] = "unindexed"
+
+    if stream is not None:
+        return stream_listing(
+            session_factory,
+            query.order_by(*ordering),
+            TaskList,
+            stream,
+            response,
+        )
+
+    if limit is None and cursor is None:
+        result = await db.execute(query.order_by(*ordering))
+        rows = result.mappings().all()
+    else:
+        rows = await fetch_page(
+            db,
+            query,
+            response,
+            order=order_by,
+            columns=ordering,
+            limit=limit or settings.DEFAULT_PAGE_SIZE,
+            cursor=cursor,
+        )
+
+    return TaskList.validate_python(rows)
+
+
+@router.get("/tasks", response_model=List[Task])
+async def get_all_tasks(
+    request: Request,
+    response: Response,
+    filters: TaskFilters = Depends(),
+    order_by: TaskOrder = "id",
+    limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[StreamFormat] = None,
+    db: AsyncSession = Depends(get_read_db),
+    session_factory=Depends(get_read_session_factory),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the current user's tasks across all projects.
+
+    Filters, ordering, pagination, streaming and conditional requests work
+    as for the tasks of a project.
+    """
+    check_stream_params(stream, limit, cursor)
+    not_modified = await conditional_get(
+        request, response, db, current_user.id
+    )
+    if not_modified:
+        return not_modified
+
+    query = select(*TASK_COLUMNS).where(TaskModel.owner_id == current_user.id)
+
+    return await list_tasks(
+        db,
+        query,
+        response,
+        "owner",
+        filters,
+        order_by,
+        limit,
+        cursor,
+        stream,
+        session_factory,
+    )
 
 
 @router.get("/projects/{project_id}/tasks/", response_model=List[Task])
 async def get_tasks(
     project_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    filters: TaskFilters = Depends(),
+    order_by: TaskOrder = "id",
+    limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[StreamFormat] = None,
+    db: AsyncSession = Depends(get_read_db),
+    session_factory=Depends(get_read_session_factory),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all tasks for a project."""
-    project = await db.get(ProjectModel, project_id)
-
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    """Get all tasks for a project.
+
+    ``status``, ``is_flagged``, ``due_before``, ``due_after`` and
+    ``priority`` narrow the listing. Passing ``limit`` or ``cursor``
+    returns one page in ``order_by`` order instead, with the cursor of the
+    next page in the X-Next-Cursor header. ``stream=json`` or
+    ``stream=ndjson`` sends the whole listing as it is read, in constant
+    memory however many tasks there are. Requests with a current ETag in
+    If-None-Match get a 304 instead.
+    """
+    check_stream_params(stream, limit, cursor)
+    not_modified = await conditional_get(
+        request, response, db, current_user.id
+    )
+    if not_modified:
+        return not_modified
 
-    if project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    await check_project_access(db, project_id, current_user.id)
 
     # Query tasks directly instead of accessing through relationship
-    tasks = await db.execute(
-        select(TaskModel).where(TaskModel.project_id == project_id)
+    query = select(*TASK_COLUMNS).where(TaskModel.project_id == project_id)
+
+    return await list_tasks(
+        db,
+        query,
+        response,
+        "project",
+        filters,
+        order_by,
+        limit,
+        cursor,
+        stream,
+        session_factory,
     )
-    tasks = tasks.scalars().all()
-
-    return [Task.model_validate(task) for task in tasks]
 
 
 @router.post("/projects/{project_id}/tasks/", response_model=Task)
 async def create_task(
     project_id: int,
     task: TaskCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new task for a project."""
-    project = await db.get(ProjectModel, project_id)
 
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    async def apply(session: AsyncSession) -> Task:
+        await check_project_access(session, project_id, current_user.id)
 
-    if project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+        db_task = TaskModel(**task.model_dump())
+        db_task.project_id = project_id
+        db_task.owner_id = current_user.id
+        session.add(db_task)
+        await session.flush()
 
-    db_task = TaskModel(**task.model_dump())
-    db_task.project_id = project_id
-    db_task.owner_id = current_user.id
-    db.add(db_task)
+        return Task.model_validate(db_task)
 
-    await db.commit()
-    await db.refresh(db_task)
+    result = await run_write(db, apply)
+    event_broker.publish(
+        current_user.id, "task.created", id=result.id, project_id=project_id
+    )
 
-    return Task.model_validate(db_task)
+    return result
 
 
 @router.get("/projects/{project_id}/tasks/{task_id}", response_model=Task)
 async def get_task(
     project_id: int,
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific task for a project."""
-    project = await db.get(ProjectModel, project_id)
-
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    if project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
-
-    task = await db.get(TaskModel, task_id)
+    not_modified = await conditional_get(
+        request, response, db, current_user.id
+    )
+    if not_modified:
+        return not_modified
 
-    if not task or task.project_id != project_id:
-        raise HTTPException(status_code=404, detail="Task not found")
+    task = await get_owned_task(db, project_id, task_id, current_user.id)
 
     return Task.model_validate(task)
 
@@ -93,30 +254,28 @@ async def update_task(
     project_id: int,
     task_id: int,
     task: TaskUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
     """Update a specific task for a project."""
-    project = await db.get(ProjectModel, project_id)
 
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    async def apply(session: AsyncSession) -> Task:
+        db_task = await get_owned_task(
+            session, project_id, task_id, current_user.id
+        )
 
-    if project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+        for key, value in task.model_dump(exclude_unset=True).items():
+            setattr(db_task, key, value)
+        await session.flush()
 
-    db_task = await db.get(TaskModel, task_id)
+        return Task.model_validate(db_task)
 
-    if not db_task or db_task.project_id != project_id:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    for key, value in task.model_dump(exclude_unset=True).items():
-        setattr(db_task, key, value)
-
-    await db.commit()
-    await db.refresh(db_task)
+    result = await run_write(db, apply)
+    event_broker.publish(
+        current_user.id, "task.updated", id=task_id, project_id=project_id
+    )
 
-    return Task.model_validate(db_task)
+    return result
 
 
 @router.delete(
@@ -125,24 +284,164 @@ async def update_task(
 async def delete_task(
     project_id: int,
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a task."""
-    project = await db.get(ProjectModel, project_id)
 
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    async def apply(session: AsyncSession) -> None:
+        db_task = await get_owned_task(
+            session, project_id, task_id, current_user.id
+        )
 
-    if project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
+        await session.delete(db_task)
 
-    db_task = await db.get(TaskModel, task_id)
+    await run_write(db, apply)
+    tag_index.discard_tasks(current_user.id, [task_id])
+    event_broker.publish(
+        current_user.id, "task.deleted", id=task_id, project_id=project_id
+    )
 
-    if not db_task or db_task.project_id != project_id:
-        raise HTTPException(status_code=404, detail="Task not found")
+    return {"message": "Task deleted successfully"}
 
-    await db.delete(db_task)
-    await db.commit()
 
-    return {"message": "Task deleted successfully"}
+@router.post("/tasks/bulk", response_model=List[TaskBulkResult])
+async def bulk_tasks(
+    request: TaskBulkRequest,
+    db: AsyncSession = Depends(get_write_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Create, update and delete many tasks in one transaction.
+
+    Ownership is checked once per distinct project. Operations that fail
+    the check are reported in their result and skipped; the rest are
+    applied with one multi-row statement per kind of operation. Since
+    that is not request order, a task may appear in only one operation.
+    """
+    operations = request.operations
+
+    if len(operations) > settings.MAX_BULK_OPERATIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.MAX_BULK_OPERATIONS} operations "
+            "are allowed",
+        )
+
+    task_ids = [op.id for op in operations if op.op != "create"]
+    if len(set(task_ids)) < len(task_ids):
+        raise HTTPException(
+            status_code=400,
+            detail="A task can only appear in one operation",
+        )
+
+    async def apply(session: AsyncSession) -> List[TaskBulkResult]:
+        results: list[TaskBulkResult | None] = [None] * len(operations)
+
+        def reject(index, status_code, detail):
+            op = operations[index]
+            results[index] = TaskBulkResult(
+                op=op.op,
+                status_code=status_code,
+                id=getattr(op, "id", None),
+                detail=detail,
+            )
+
+        owners = await get_project_owners(
+            session, {op.project_id for op in operations}
+        )
+        task_projects = await get_task_projects(
+            session, {op.id for op in operations if op.op != "create"}
+        )
+
+        creates, updates, deletes = [], [], []
+        for index, op in enumerate(operations):
+            if op.project_id not in owners:
+                reject(index, 404, "Project not found")
+            elif owners[op.project_id] != current_user.id:
+                reject(index, 403, "Access denied")
+            elif op.op == "create":
+                creates.append(index)
+            elif task_projects.get(op.id) != op.project_id:
+                reject(index, 404, "Task not found")
+            elif op.op == "update":
+                updates.append(index)
+            else:
+                deletes.append(index)
+
+        if creates:
+            rows = [
+                {
+                    **operations[i].model_dump(exclude={"op"}),
+                    "owner_id": current_user.id,
+                }
+                for i in creates
+            ]
+            created = await session.scalars(
+                insert(TaskModel).returning(
+                    TaskModel, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+            for index, task in zip(creates, created.all()):
+                results[index] = TaskBulkResult(
+                    op="create",
+                    status_code=201,
+                    id=task.id,
+                    task=Task.model_validate(task),
+                )
+
+        if updates:
+            rows = [
+                operations[i].model_dump(
+                    exclude={"op", "project_id"}, exclude_unset=True
+                )
+                for i in updates
+            ]
+            # Rows with nothing but the id have nothing to update
+            rows = [row for row in rows if len(row) > 1]
+            if rows:
+                await session.execute(update(TaskModel), rows)
+
+            updated = await session.scalars(
+                select(TaskModel)
+                .where(TaskModel.id.in_([operations[i].id for i in updates]))
+                .execution_options(populate_existing=True)
+            )
+            updated = {task.id: task for task in updated.all()}
+            for index in updates:
+                task = updated[operations[index].id]
+                results[index] = TaskBulkResult(
+                    op="update",
+                    status_code=200,
+                    id=task.id,
+                    task=Task.model_validate(task),
+                )
+
+        if deletes:
+            await session.execute(
+                delete(TaskModel).where(
+                    TaskModel.id.in_([operations[i].id for i in deletes])
+                )
+            )
+            for index in deletes:
+                results[index] = TaskBulkResult(
+                    op="delete", status_code=200, id=operations[index].id
+                )
+
+        return results
+
+    results = await run_write(db, apply)
+    tag_index.discard_tasks(
+        current_user.id,
+        [r.id for r in results if r.op == "delete" and r.status_code == 200],
+    )
+    for op, result in zip(operations, results):
+        if result.status_code < 300:
+            event_broker.publish(
+                current_user.id,
+                f"task.{op.op}d",
+                id=result.id,
+                project_id=op.project_id,
+            )
+
+    return results
@@ -0,0 +1,70 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User as UserModel
+
+ETAG_HEADER = "ETag"
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from the values a response depends on."""
+    digest = hashlib.blake2b(
+        "\n".join(map(str, parts)).encode(), digest_size=12
+    )
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    owner_id: int,
+    *extra,
+) -> Optional[Response]:
+    """Answer a GET with 304 Not Modified if the client's copy is current.
+
+    The ETag covers the URL, the Accept header (which picks the encoding
+    of list responses) and the user's data version, which changes with
+    every write to the user's projects and tasks, plus any ``extra``
+    scalar subqueries for state that changes without a write. They are
+    read together in one primary key lookup, before any rows of the
+    response are. On a miss the ETag is set on ``response`` and None is
+    returned.
+    """
+    row = await db.execute(
+        select(UserModel.data_version, *extra).where(UserModel.id == owner_id)
+    )
+    etag = weak_etag(
+        request.url.path,
+        request.url.query,
+        request.headers.get("accept"),
+        owner_id,
+        *row.one(),
+    )
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={ETAG_HEADER: etag},
+        )
+
+    response.headers[ETAG_HEADER] = etag
+    return None
@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import Query
+from sqlalchemy import Column, ColumnElement, Select
+
+from app.models import Task as TaskModel
+from app.models.status import Status
+
+
+class TaskFilters:
+    """Task listing filters, taken from the query string.
+
+    ``status`` may be repeated to match any of several statuses. The due
+    date bounds are exclusive, and tasks without a due date never match
+    them.
+    """
+
+    def __init__(
+        self,
+        status: Optional[List[Status]] = Query(None),
+        is_flagged: Optional[bool] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        priority: Optional[int] = None,
+    ):
+        self.status = sorted(set(status)) if status else None
+        self.is_flagged = is_flagged
+        self.due_before = due_before
+        self.due_after = due_after
+        self.priority = priority
+
+    def apply(self, query: Select) -> Select:
+        """Add the filters in use to a task query."""
+        if self.status is not None:
+            if len(self.status) == 1:
+                query = query.where(TaskModel.status == self.status[0])
+            else:
+                query = query.where(TaskModel.status.in_(self.status))
+        if self.is_flagged is not None:
+            query = query.where(TaskModel.is_flagged == self.is_flagged)
+        if self.due_before is not None:
+            query = query.where(TaskModel.due_date < self.due_before)
+        if self.due_after is not None:
+            query = query.where(TaskModel.due_date > self.due_after)
+        if self.priority is not None:
+            query = query.where(TaskModel.priority == self.priority)
+
+        return query
+
+    def shape(self) -> tuple:
+        """Which filters are in use, independent of their values."""
+        return (
+            len(self.status) if self.status else 0,
+            self.is_flagged is not None,
+            self.due_before is not None,
+            self.due_after is not None,
+            self.priority is not None,
+        )
+
+
+class ExportFilters:
+    """Date ranges of the tasks in an export, taken from the query string.
+
+    As in TaskFilters the bounds are exclusive, and tasks without a date
+    never match bounds on it.
+    """
+
+    def __init__(
+        self,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        completed_after: Optional[datetime] = None,
+        completed_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+    ):
+        self.ranges = [
+            (column, after, before)
+            for column, after, before in [
+                (TaskModel.created_at, created_after, created_before),
+                (TaskModel.completed_at, completed_after, completed_before),
+                (TaskModel.due_date, due_after, due_before),
+            ]
+            if after is not None or before is not None
+        ]
+
+    def apply(self, query: Select) -> Select:
+        """Add the ranges in use to a task query.
+
+        The lower bound of the leading date of order() is left out; it is
+        start(), for the first keyset chunk only.
+        """
+        for i, (column, after, before) in enumerate(self.ranges):
+            if after is not None and i > 0:
+                query = query.where(column > after)
+            if before is not None:
+                query = query.where(column < before)
+
+        return query
+
+    def order(self) -> list[Column]:
+        """Keyset order to read the tasks in.
+
+        The first date in use leads, so that its range is read from the
+        task's (owner_id, date) index instead of filtering every task.
+        """
+        if not self.ranges:
+            return [TaskModel.id]
+
+        return [self.ranges[0][0], TaskModel.id]
+
+    def start(self) -> Optional[ColumnElement]:
+        """Lower bound of the leading date of order(), if any."""
+        if not self.ranges or self.ranges[0][1] is None:
+            return None
+
+        column, after, _ = self.ranges[0]
+        return column > after
@@ -0,0 +1,47 @@
+from typing import Optional, Sequence
+
+
+def qualities(header: str) -> dict[str, float]:
+    """Parse an Accept or Accept-Encoding header into value -> q."""
+    parsed = {}
+    for entry in header.split(","):
+        value, *params = entry.split(";")
+        value = value.strip().lower()
+        if not value:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, q = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(q)
+                except ValueError:
+                    quality = 0.0
+        parsed[value] = quality
+
+    return parsed
+
+
+def negotiate(header: Optional[str], offers: Sequence[str]) -> Optional[str]:
+    """The offer a request's header accepts with the highest quality.
+
+    Wildcards (``*/*``, ``type/*`` and ``*``) match any offer they cover.
+    Ties go to the earlier offer, so ``offers`` lists the server's
+    preference first. None if the header accepts none of them.
+    """
+    if header is None:
+        return None
+
+    accepted = qualities(header)
+    best, best_quality = None, 0.0
+    for offer in offers:
+        kind = offer.partition("/")[0]
+        quality = accepted.get(
+            offer,
+            accepted.get(f"{kind}/*", accepted.get("*/*", accepted.get("*"))),
+        )
+        if quality is not None and quality > best_quality:
+            best, best_quality = offer, quality
+
+    return best
@@ -0,0 +1,150 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    DateTime,
+    Select,
+    and_,
+    or_,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(order: str, values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque token."""
+    payload = {
+        "o": order,
+        "v": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, order: str, columns: Sequence[Column]
+) -> list[Any]:
+    """Decode a cursor produced by encode_cursor for the same ordering."""
+    invalid_cursor = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+    )
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["v"]
+
+        if payload["o"] != order or len(values) != len(columns):
+            raise invalid_cursor
+
+        return [
+            (
+                datetime.fromisoformat(value)
+                if isinstance(column.type, DateTime) and value is not None
+                else value
+            )
+            for column, value in zip(columns, values)
+        ]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise invalid_cursor
+
+
+def keyset_filter(columns: Sequence[Column], values: Sequence[Any]):
+    """Select the rows that sort after ``values`` in ``columns`` order.
+
+    The last column must be unique (the primary key). Only the leading
+    column may be nullable; SQLite sorts NULLs first in ascending order.
+    """
+    if len(columns) == 1:
+        return columns[0] > values[0]
+
+    leading, rest = columns[0], columns[1:]
+    if values[0] is None:
+        return or_(
+            and_(leading.is_(None), keyset_filter(rest, values[1:])),
+            leading.is_not(None),
+        )
+
+    return tuple_(*columns) > tuple_(*values)
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    response: Response,
+    order: str,
+    columns: Sequence[Column],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> list:
+    """Fetch one keyset page of ``query`` ordered by ``columns``, as rows.
+
+    The sort columns must be among the selected ones. If more rows follow,
+    the cursor for the next page is set in the X-Next-Cursor response
+    header.
+    """
+    if cursor is not None:
+        values = decode_cursor(cursor, order, columns)
+        query = query.where(keyset_filter(columns, values))
+
+    result = await db.execute(query.order_by(*columns).limit(limit + 1))
+    rows = result.mappings().all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            order, [last[column.key] for column in columns]
+        )
+
+    return rows
+
+
+async def keyset_chunks(
+    session_factory: async_sessionmaker[AsyncSession],
+    query: Select,
+    columns: Sequence[Column],
+    size: int,
+    start: Optional[ColumnElement] = None,
+) -> AsyncIterator[list]:
+    """Read all rows of ``query`` in ``columns`` order, ``size`` at a time.
+
+    Each chunk is one keyset page read in a session of its own, so no
+    read transaction stays open while a chunk is being handled: writers
+    and WAL checkpoints are never held up by a slow consumer. Rows
+    written between chunks may or may not be seen.
+
+    ``start`` bounds the first chunk only: a lower bound on the leading
+    column, which later chunks' keyset positions imply. Left in their
+    queries, SQLite may seek the index to it instead of to the position,
+    reading the range again from its start for every chunk.
+    """
+    values = None
+    while True:
+        if values is not None:
+            chunk_query = query.where(keyset_filter(columns, values))
+        elif start is not None:
+            chunk_query = query.where(start)
+        else:
+            chunk_query = query
+
+        async with session_factory() as session:
+            result = await session.execute(
+                chunk_query.order_by(*columns).limit(size)
+            )
+            rows = result.mappings().all()
+
+        if rows:
+            yield rows
+        if len(rows) < size:
+            return
+
+        values = [rows[-1][column.key] for column in columns]
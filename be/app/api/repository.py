@@ -0,0 +1,141 @@
+"""Ownership-scoped lookups shared by the project and task endpoints.
+
+Every lookup checks ownership in the same query that fetches the row and
+raises the HTTP error the endpoints have always returned: 404 when the
+project or task does not exist, 403 when the project belongs to someone
+else. The statements are built once at import time with bind parameters
+so each call only binds values to an already compiled statement.
+"""
+
+from typing import Iterable
+
+from fastapi import HTTPException
+from sqlalchemy import and_, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Project as ProjectModel
+from app.models import Task as TaskModel
+from app.models import project_closure
+
+_project_owner = select(ProjectModel.owner_id).where(
+    ProjectModel.id == bindparam("project_id")
+)
+
+_project = select(ProjectModel).where(
+    ProjectModel.id == bindparam("project_id")
+)
+
+# The project row always comes back when it exists, the task only when it
+# belongs to that project: one primary key lookup on each table.
+_project_owner_and_task = (
+    select(ProjectModel.owner_id, TaskModel)
+    .select_from(ProjectModel)
+    .outerjoin(
+        TaskModel,
+        and_(
+            TaskModel.project_id == ProjectModel.id,
+            TaskModel.id == bindparam("task_id"),
+        ),
+    )
+    .where(ProjectModel.id == bindparam("project_id"))
+)
+
+_is_descendant = select(project_closure.c.depth).where(
+    project_closure.c.ancestor_id == bindparam("project_id"),
+    project_closure.c.descendant_id == bindparam("parent_id"),
+)
+
+_project_owners = select(ProjectModel.id, ProjectModel.owner_id).where(
+    ProjectModel.id.in_(bindparam("project_ids", expanding=True))
+)
+
+_task_projects = select(TaskModel.id, TaskModel.project_id).where(
+    TaskModel.id.in_(bindparam("task_ids", expanding=True))
+)
+
+
+def _check_owner(row, owner_id: int) -> None:
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if row.owner_id != owner_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+
+async def check_project_access(
+    db: AsyncSession, project_id: int, owner_id: int
+) -> None:
+    """Check that the project exists and belongs to ``owner_id``."""
+    result = await db.execute(_project_owner, {"project_id": project_id})
+    _check_owner(result.one_or_none(), owner_id)
+
+
+async def get_owned_project(
+    db: AsyncSession, project_id: int, owner_id: int
+) -> ProjectModel:
+    """Fetch a project that belongs to ``owner_id``."""
+    result = await db.execute(_project, {"project_id": project_id})
+    project = result.scalar_one_or_none()
+    _check_owner(project, owner_id)
+
+    return project
+
+
+async def check_new_parent(
+    db: AsyncSession, project_id: int | None, parent_id: int, owner_id: int
+) -> None:
+    """Check that ``parent_id`` can become the parent of ``project_id``.
+
+    The parent must belong to ``owner_id`` and must not be the project
+    itself or one of its descendants. Pass ``None`` for a new project.
+    """
+    await check_project_access(db, parent_id, owner_id)
+
+    if project_id is None:
+        return
+
+    result = await db.execute(
+        _is_descendant, {"project_id": project_id, "parent_id": parent_id}
+    )
+    if result.first() is not None:
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot move a project under itself",
+        )
+
+
+async def get_owned_task(
+    db: AsyncSession, project_id: int, task_id: int, owner_id: int
+) -> TaskModel:
+    """Fetch a task of a project that belongs to ``owner_id``."""
+    result = await db.execute(
+        _project_owner_and_task,
+        {"project_id": project_id, "task_id": task_id},
+    )
+    row = result.one_or_none()
+    _check_owner(row, owner_id)
+
+    if row.Task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return row.Task
+
+
+async def get_project_owners(
+    db: AsyncSession, project_ids: Iterable[int]
+) -> dict[int, int]:
+    """Map each existing project id to its owner id."""
+    result = await db.execute(
+        _project_owners, {"project_ids": list(project_ids)}
+    )
+
+    return dict(result.all())
+
+
+async def get_task_projects(
+    db: AsyncSession, task_ids: Iterable[int]
+) -> dict[int, int]:
+    """Map each existing task id to its project id."""
+    result = await db.execute(_task_projects, {"task_ids": list(task_ids)})
+
+    return dict(result.all())
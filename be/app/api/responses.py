@@ -0,0 +1,170 @@
+from typing import Annotated, Any, Callable, Coroutine, get_origin
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, get_request_handler
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from .negotiation import negotiate
+
+COLUMNAR_JSON_MEDIA_TYPE = "application/vnd.minifocus.columnar+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+class JSONBytesResponse(JSONResponse):
+    """JSON response encoded by pydantic-core instead of the json module.
+
+    Content that a JSONRoute has already serialized is sent as is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+
+        return to_json(content)
+
+
+class ColumnarJSONResponse(JSONBytesResponse):
+    """A list as JSON with one array per field (see dump_columns)."""
+
+    media_type = COLUMNAR_JSON_MEDIA_TYPE
+
+
+class MsgPackResponse(Response):
+    """Response encoded as MessagePack."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+
+        return msgpack.packb(content)
+
+
+def dump_columns(adapter: TypeAdapter, value: list, **options: Any) -> bytes:
+    """Encode a list of models as JSON with each key written once.
+
+    ``[{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]`` becomes
+    ``{"id": [1, 2], "title": ["a", "b"]}``; an empty list becomes ``{}``.
+    """
+    rows = adapter.dump_python(value, mode="json", **options)
+    if not rows:
+        return b"{}"
+
+    return to_json({key: [row[key] for row in rows] for key in rows[0]})
+
+
+def dump_msgpack(adapter: TypeAdapter, value: Any, **options: Any) -> bytes:
+    """Encode a response as MessagePack, with the values JSON has."""
+    return msgpack.packb(adapter.dump_python(value, mode="json", **options))
+
+
+class JSONResponseField:
+    """A route's response field, serializing straight to JSON bytes."""
+
+    def __init__(self, field: Any):
+        self.field = field
+        self.adapter = TypeAdapter(
+            Annotated[field.field_info.annotation, field.field_info]
+        )
+
+    def validate(self, value: Any, values: dict = {}, *, loc: tuple = ()):
+        return self.field.validate(value, values, loc=loc)
+
+    def serialize(self, value: Any, **options: Any) -> bytes:
+        return self.adapter.dump_json(value, **options)
+
+
+class ColumnarJSONResponseField(JSONResponseField):
+    def serialize(self, value: Any, **options: Any) -> bytes:
+        return dump_columns(self.adapter, value, **options)
+
+
+class MsgPackResponseField(JSONResponseField):
+    def serialize(self, value: Any, **options: Any) -> bytes:
+        return dump_msgpack(self.adapter, value, **options)
+
+
+# Encodings a list response can be negotiated into with Accept, besides
+# JSON, which is the default
+LIST_ENCODINGS = {
+    COLUMNAR_JSON_MEDIA_TYPE: (
+        ColumnarJSONResponse,
+        ColumnarJSONResponseField,
+    ),
+    MSGPACK_MEDIA_TYPE: (MsgPackResponse, MsgPackResponseField),
+}
+
+
+class JSONRoute(APIRoute):
+    """Route encoding its response model to JSON in one step.
+
+    FastAPI validates what an endpoint returns against the response
+    model, dumps it to JSON-compatible Python objects and then has the
+    response class encode those. Endpoints here return instances of their
+    response model already, which pass validation unchanged; the dump
+    then produces the JSON bytes directly, for JSONBytesResponse to send.
+
+    Routes responding with a list also offer the LIST_ENCODINGS, chosen
+    by the request's Accept header.
+    """
+
+    def get_route_handler(
+        self,
+    ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+
+        field = self.secure_cloned_response_field
+        if field is None or not issubclass(response_class, JSONBytesResponse):
+            return super().get_route_handler()
+
+        self.secure_cloned_response_field = JSONResponseField(field)
+        json_handler = super().get_route_handler()
+        if get_origin(field.field_info.annotation) is not list:
+            return json_handler
+
+        handlers = {}
+        for media_type, (encoding, encoding_field) in LIST_ENCODINGS.items():
+            handlers[media_type] = self.get_encoding_handler(
+                encoding, encoding_field(field)
+            )
+
+        async def negotiated_handler(request: Request) -> Response:
+            media_type = negotiate(
+                request.headers.get("accept"),
+                [response_class.media_type] + list(handlers),
+            )
+            handler = handlers.get(media_type, json_handler)
+            response = await handler(request)
+            response.headers.add_vary_header("Accept")
+
+            return response
+
+        return negotiated_handler
+
+    def get_encoding_handler(
+        self, response_class: type[Response], response_field: Any
+    ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """The route's handler, responding in another encoding."""
+        return get_request_handler(
+            dependant=self.dependant,
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=response_class,
+            response_field=response_field,
+            response_model_include=self.response_model_include,
+            response_model_exclude=self.response_model_exclude,
+            response_model_by_alias=self.response_model_by_alias,
+            response_model_exclude_unset=self.response_model_exclude_unset,
+            response_model_exclude_defaults=(
+                self.response_model_exclude_defaults
+            ),
+            response_model_exclude_none=self.response_model_exclude_none,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+        )
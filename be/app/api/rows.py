@@ -0,0 +1,31 @@
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement
+
+from app.models import Task as TaskModel
+from app.schemas import Task
+
+
+def response_columns(
+    model: Any, schema: type[BaseModel], **expressions: ColumnElement
+) -> list[ColumnElement]:
+    """Select the columns of ``model`` that ``schema`` is made of.
+
+    Listings select these instead of whole ORM instances and validate the
+    rows in one call to the schema's list adapter, so that no objects are
+    built or tracked in the session for them. Fields that are computed by
+    the query are given as labelled ``expressions``.
+    """
+    return [
+        (
+            expressions[name].label(name)
+            if name in expressions
+            else getattr(model, name)
+        )
+        for name in schema.model_fields
+    ]
+
+
+# Columns of a task listing
+TASK_COLUMNS = response_columns(TaskModel, Task)
@@ -0,0 +1,115 @@
+import asyncio
+from typing import AsyncIterator, Literal, Optional
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.types import Receive, Scope, Send
+
+from app.config.settings import settings
+
+StreamFormat = Literal["json", "ndjson"]
+
+STREAM_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+# Held by each streamed listing while it is sent (see ListingStreamResponse)
+stream_slots = asyncio.Semaphore(settings.STREAM_MAX_CONCURRENT)
+
+
+async def stream_rows(
+    session_factory: async_sessionmaker[AsyncSession],
+    query: Select,
+    adapter: TypeAdapter,
+    format: StreamFormat,
+) -> AsyncIterator[bytes]:
+    """Encode the rows of ``query`` a chunk at a time.
+
+    The rows are read from a server-side cursor, STREAM_CHUNK_SIZE at a
+    time, and validated with the list ``adapter``; only one chunk is held
+    in memory at any time. ``json`` produces one JSON array, ``ndjson`` a
+    line per row.
+    """
+    async with session_factory() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=settings.STREAM_CHUNK_SIZE)
+        )
+
+        separator = b"["
+        async for rows in result.mappings().partitions():
+            items = adapter.validate_python(rows)
+            if format == "ndjson":
+                yield b"".join(to_json(item) + b"\n" for item in items)
+            else:
+                # Drop the brackets of each chunk's array to join them
+                yield separator + adapter.dump_json(items)[1:-1]
+                separator = b","
+
+        if format == "json":
+            yield b"[]" if separator == b"[" else b"]"
+
+
+class ListingStreamResponse(StreamingResponse):
+    """A streamed listing, sent only while a stream slot is free.
+
+    Each stream holds a read connection, and the snapshot it reads, until
+    its client has read the last row, so a few slow clients could take
+    the whole read pool and block every other GET and WAL checkpoints.
+    At most STREAM_MAX_CONCURRENT listings are sent at once; beyond that
+    the client is told to retry rather than queued, since a queued
+    request would wait on the slowest readers.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if stream_slots.locked():
+            busy = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Too many streams, please retry"},
+                headers={"Retry-After": "1"},
+            )
+            await busy(scope, receive, send)
+            return
+
+        async with stream_slots:
+            await super().__call__(scope, receive, send)
+
+
+def stream_listing(
+    session_factory: async_sessionmaker[AsyncSession],
+    query: Select,
+    adapter: TypeAdapter,
+    format: StreamFormat,
+    response: Response,
+) -> StreamingResponse:
+    """Respond with the rows of a listing query as they are read.
+
+    The rows are read in a session of their own, since the request's
+    session is closed before the response is sent. Headers already set
+    on ``response`` (ETag, X-Query-Plan) are kept. At most
+    STREAM_MAX_CONCURRENT are sent at once (see ListingStreamResponse).
+    """
+    streaming = ListingStreamResponse(
+        stream_rows(session_factory, query, adapter, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+    )
+    streaming.headers.raw.extend(response.headers.raw)
+
+    return streaming
+
+
+def check_stream_params(
+    stream: Optional[StreamFormat],
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> None:
+    """Reject pagination of a streamed listing, which is never paged."""
+    if stream is not None and (limit is not None or cursor is not None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="stream cannot be combined with limit or cursor",
+        )
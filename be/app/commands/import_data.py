@@ -0,0 +1,588 @@
+"""Import projects and tasks from a file written by GET /export.
+
+Reads NDJSON or CSV a chunk of IMPORT_CHUNK_SIZE rows at a time. A chunk
+is validated at once and written in one transaction: its projects parent
+first under new ids, then its tasks, in the new projects, with their tags.
+Rows that don't validate, or whose project or parent project was not
+imported, are reported and skipped.
+
+Every transaction also records in an import job how far the import got,
+so an import that stopped partway through can be resumed after the last
+chunk it committed.
+
+A running server keeps the user's tag bitmaps it has already built, so
+its tag filters see the imported tags once those expire, after at most
+TAG_INDEX_TTL_SECONDS; restart it to see them at once. Usage::
+
+    python -m app.commands.import_data EMAIL FILE [--format csv]
+        [--resume JOB_ID]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
+from typing import AsyncIterator, Iterable, Iterator, Literal, TextIO
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Table, bindparam, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config.settings import settings
+from app.db import AsyncSessionLocal
+from app.models import ImportJob, Project, Status, Tag, Task, User, task_tag
+from app.models.project_closure import LINK_PROJECT
+from app.models.project_counters import add_to_counters
+from app.models.search_index import index_tasks
+from app.schemas import (
+    ImportList,
+    ProjectImport,
+    ProjectImportList,
+    TaskImport,
+    TaskImportList,
+)
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# A skipped input row: its number, from 1, and why
+RowError = tuple[int, str]
+
+# Task insert triggers that are dropped while a chunk's tasks are inserted,
+# each replaced by one set-based statement for all of them
+BULK_INSERT_TRIGGERS = [
+    "task_version_insert",
+    "task_counters_insert",
+    "task_search_insert",
+]
+
+# Rows per multi-row INSERT, well within SQLite's limit on parameters
+INSERT_ROWS = 250
+
+PROJECT_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "status",
+    "is_flagged",
+    "is_inbox",
+    "parent_id",
+    "owner_id",
+    "created_at",
+    "updated_at",
+)
+TASK_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "is_flagged",
+    "due_date",
+    "priority",
+    "project_id",
+    "owner_id",
+    "created_at",
+    "updated_at",
+    "completed_at",
+    "change_seq",
+)
+
+# CSV columns whose empty cells are empty strings rather than missing
+CSV_STRING_COLUMNS = ("name", "title")
+
+
+def read_records(file: TextIO, format: ImportFormat) -> Iterator:
+    """Iterate over the rows of an export, not yet parsed."""
+    if format == "csv":
+        return csv.DictReader(file)
+
+    return (line for line in file if line.strip())
+
+
+def parse_record(record, format: ImportFormat):
+    if format == "ndjson":
+        return json.loads(record)
+
+    # A row leaves the columns of the other kind empty
+    row = {
+        name: value
+        for name, value in record.items()
+        if value or name in CSV_STRING_COLUMNS
+    }
+    if "tags" in row:
+        row["tags"] = row["tags"].split()
+
+    return row
+
+
+def validate_batch(
+    adapter: TypeAdapter, rows: list[tuple[int, dict]], errors: list
+) -> list:
+    """Validate numbered rows at once, moving the invalid ones to
+    ``errors``."""
+    try:
+        items = adapter.validate_python([row for _, row in rows])
+    except ValidationError as error:
+        invalid = {}
+        for detail in error.errors():
+            index, *location = detail["loc"]
+            field = ".".join(map(str, location))
+            invalid.setdefault(
+                index,
+                f"{field}: {detail['msg']}" if field else detail["msg"],
+            )
+        errors += [
+            (rows[index][0], message) for index, message in invalid.items()
+        ]
+        rows = [row for index, row in enumerate(rows) if index not in invalid]
+        items = adapter.validate_python([row for _, row in rows])
+
+    return [(number, item) for (number, _), item in zip(rows, items)]
+
+
+def validate_rows(
+    records: list, format: ImportFormat, first_row: int
+) -> tuple[
+    list[tuple[int, ProjectImport]],
+    list[tuple[int, TaskImport]],
+    list[RowError],
+]:
+    """Parse and validate a chunk of rows, split into projects and tasks.
+
+    NDJSON is parsed and validated in one go, and only taken row by row
+    when that fails, to tell which rows are invalid.
+    """
+    projects, tasks, errors = [], [], []
+    if format == "ndjson":
+        try:
+            items = ImportList.validate_json(f"[{','.join(records)}]")
+        except ValidationError:
+            pass
+        else:
+            for number, item in enumerate(items, first_row):
+                if item.kind == "project":
+                    projects.append((number, item))
+                else:
+                    tasks.append((number, item))
+            return projects, tasks, errors
+
+    for number, record in enumerate(records, first_row):
+        try:
+            row = parse_record(record, format)
+        except ValueError as error:
+            errors.append((number, f"invalid row: {error}"))
+            continue
+
+        kind = row.get("kind") if isinstance(row, dict) else None
+        if kind == "project":
+            projects.append((number, row))
+        elif kind == "task":
+            tasks.append((number, row))
+        else:
+            errors.append((number, f"unknown kind: {kind!r}"))
+
+    return (
+        validate_batch(ProjectImportList, projects, errors),
+        validate_batch(TaskImportList, tasks, errors),
+        errors,
+    )
+
+
+@lru_cache
+def insert_sql(table: str, columns: tuple[str, ...], rows: int) -> str:
+    values = "(" + ", ".join("?" * len(columns)) + ")"
+
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ", ".join(
+        [values] * rows
+    )
+
+
+async def insert_rows(
+    session: AsyncSession,
+    table: Table,
+    columns: tuple[str, ...],
+    rows: list[tuple],
+) -> None:
+    """Insert rows with multi-row INSERTs of INSERT_ROWS rows each.
+
+    Compiling an insert with that many VALUES costs more than running it,
+    so the statement is written once per size, and the values are bound
+    as SQLAlchemy would bind them.
+    """
+    connection = await session.connection()
+    dialect = connection.dialect
+    values = list(zip(*rows))
+    for index, name in enumerate(columns):
+        type_ = table.c[name].type.dialect_impl(dialect)
+        process = type_.bind_processor(dialect)
+        if process is not None:
+            values[index] = map(process, values[index])
+    # Row by row again, flattened
+    values = list(chain.from_iterable(zip(*values)))
+
+    width = len(columns)
+    for start in range(0, len(rows), INSERT_ROWS):
+        batch = values[start * width : (start + INSERT_ROWS) * width]
+        await connection.exec_driver_sql(
+            insert_sql(table.name, columns, len(batch) // width),
+            tuple(batch),
+        )
+
+
+async def drop_triggers(session: AsyncSession, names: list[str]) -> list[str]:
+    """Drop triggers, returning the statements that create them again."""
+    result = await session.execute(
+        text(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'trigger' AND name IN :names"
+        ).bindparams(bindparam("names", expanding=True)),
+        {"names": names},
+    )
+    triggers = result.all()
+
+    connection = await session.connection()
+    for name, _ in triggers:
+        await connection.exec_driver_sql(f"DROP TRIGGER {name}")
+
+    return [sql for _, sql in triggers]
+
+
+async def insert_projects(
+    session: AsyncSession,
+    owner_id: int,
+    projects: list[tuple[int, ProjectImport]],
+    project_ids: dict[int, int],
+    errors: list[RowError],
+) -> int:
+    """Insert projects parent first, adding their new ids to
+    ``project_ids``.
+
+    Parents must have been imported by now or be in the same chunk. An
+    exported inbox stands for the user's inbox, if there is one.
+    """
+    inbox_id = None
+    if any(project.is_inbox for _, project in projects):
+        inbox_id = await session.scalar(
+            select(Project.id)
+            .where(Project.owner_id == owner_id, Project.is_inbox)
+            .order_by(Project.id)
+            .limit(1)
+        )
+    # Ids are taken in advance, so that children can refer to parents
+    last_id = await session.scalar(select(func.max(Project.id))) or 0
+    now = datetime.now()
+
+    rows, links = [], []
+    pending = projects
+    while pending:
+        waiting = []
+        for number, project in pending:
+            if project.id in project_ids:
+                errors.append((number, f"duplicate project {project.id}"))
+            elif project.parent_id is not None and (
+                project.parent_id not in project_ids
+            ):
+                waiting.append((number, project))
+            elif project.is_inbox and inbox_id is not None:
+                project_ids[project.id] = inbox_id
+            else:
+                last_id += 1
+                project_ids[project.id] = last_id
+                parent_id = project_ids.get(project.parent_id)
+                created_at = project.created_at or now
+                rows.append(
+                    (
+                        last_id,
+                        project.name,
+                        project.description,
+                        project.status,
+                        project.is_flagged,
+                        project.is_inbox,
+                        parent_id,
+                        owner_id,
+                        created_at,
+                        project.updated_at or created_at,
+                    )
+                )
+                links.append({"project_id": last_id, "parent_id": parent_id})
+
+        if len(waiting) == len(pending):
+            errors += [
+                (number, f"unknown parent project {project.parent_id}")
+                for number, project in waiting
+            ]
+            break
+        pending = waiting
+
+    if rows:
+        # The version and search triggers on project stay in place, but
+        # the closure is only linked by the ORM, parents first
+        await insert_rows(session, Project.__table__, PROJECT_COLUMNS, rows)
+        await session.execute(LINK_PROJECT, links)
+
+    return len(rows)
+
+
+async def insert_tasks(
+    session: AsyncSession,
+    owner_id: int,
+    tasks: list[tuple[int, TaskImport]],
+    project_ids: dict[int, int],
+    errors: list[RowError],
+) -> int:
+    """Insert tasks into the projects they were imported as, with their
+    tags.
+
+    Must run with BULK_INSERT_TRIGGERS dropped: the tasks take their ids,
+    change sequence numbers and completed_at in advance, as the triggers
+    would have given them one by one, and the counters and search index
+    are brought up to date with one statement each afterwards.
+    """
+    data_version = await session.scalar(
+        select(User.data_version).where(User.id == owner_id)
+    )
+    first_id = (await session.scalar(select(func.max(Task.id))) or 0) + 1
+    now = datetime.now()
+
+    rows, tags = [], []
+    for number, task in tasks:
+        project_id = project_ids.get(task.project_id)
+        if project_id is None:
+            errors.append((number, f"unknown project {task.project_id}"))
+            continue
+
+        task_id = first_id + len(rows)
+        created_at = task.created_at or now
+        updated_at = task.updated_at or created_at
+        rows.append(
+            (
+                task_id,
+                task.title,
+                task.description,
+                task.status,
+                task.is_flagged,
+                task.due_date,
+                task.priority,
+                project_id,
+                owner_id,
+                created_at,
+                updated_at,
+                (
+                    task.completed_at or updated_at
+                    if task.status == Status.DONE
+                    else None
+                ),
+                data_version + len(rows) + 1,
+            )
+        )
+        tags += [(name, task_id) for name in task.tags]
+
+    if not rows:
+        return 0
+
+    await insert_rows(session, Task.__table__, TASK_COLUMNS, rows)
+    inserted = Task.id.between(first_id, first_id + len(rows) - 1)
+    await session.execute(
+        update(User)
+        .where(User.id == owner_id)
+        .values(data_version=data_version + len(rows))
+        .execution_options(synchronize_session=False)
+    )
+    # Stamps the projects, after the tasks, as the triggers would
+    await session.execute(add_to_counters(inserted))
+    await session.execute(index_tasks(inserted))
+    await tag_tasks(session, owner_id, tags)
+
+    return len(rows)
+
+
+async def tag_tasks(
+    session: AsyncSession, owner_id: int, tags: list[tuple[str, int]]
+) -> None:
+    """Tag tasks by tag name, creating tags that don't exist yet."""
+    names = {name for name, _ in tags}
+    if not names:
+        return
+
+    tag_ids = dict(
+        (
+            await session.execute(
+                select(Tag.name, Tag.id).where(
+                    Tag.owner_id == owner_id, Tag.name.in_(names)
+                )
+            )
+        ).all()
+    )
+    missing = sorted(names - tag_ids.keys())
+    if missing:
+        created = await session.execute(
+            insert(Tag).returning(Tag.name, Tag.id),
+            [{"name": name, "owner_id": owner_id} for name in missing],
+        )
+        tag_ids.update(created.all())
+
+    await insert_rows(
+        session,
+        task_tag,
+        ("tag_id", "task_id"),
+        [(tag_ids[name], task_id) for name, task_id in tags],
+    )
+
+
+async def import_chunks(
+    session_factory: async_sessionmaker[AsyncSession],
+    job: ImportJob,
+    records: Iterable,
+    format: ImportFormat,
+    chunk_size: int,
+) -> AsyncIterator[list[RowError]]:
+    """Import the rows of ``records`` that the job has not read yet.
+
+    Each chunk of ``chunk_size`` rows is committed in one transaction
+    together with the job's progress, which is then copied to ``job``.
+    Yields the rows each chunk skipped.
+    """
+    records = islice(records, job.rows_read, None)
+    project_ids = {
+        int(exported): imported
+        for exported, imported in json.loads(job.project_ids).items()
+    }
+
+    while chunk := list(islice(records, chunk_size)):
+        projects, tasks, errors = validate_rows(
+            chunk, format, job.rows_read + 1
+        )
+        chunk_ids = dict(project_ids)
+        async with session_factory() as session:
+            # A write first, for the write lock: a transaction that reads
+            # first can't write once another has committed since, and the
+            # new ids follow the largest ones in the tables
+            await session.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job.id)
+                .values(updated_at=datetime.now())
+                .execution_options(synchronize_session=False)
+            )
+            triggers = await drop_triggers(session, BULK_INSERT_TRIGGERS)
+            projects_imported = await insert_projects(
+                session, job.owner_id, projects, chunk_ids, errors
+            )
+            tasks_imported = await insert_tasks(
+                session, job.owner_id, tasks, chunk_ids, errors
+            )
+            connection = await session.connection()
+            for sql in triggers:
+                await connection.exec_driver_sql(sql)
+
+            progress = {
+                "rows_read": job.rows_read + len(chunk),
+                "rows_skipped": job.rows_skipped + len(errors),
+                "projects_imported": job.projects_imported + projects_imported,
+                "tasks_imported": job.tasks_imported + tasks_imported,
+                "project_ids": json.dumps(chunk_ids),
+            }
+            await session.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job.id)
+                .values(progress)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        for name, value in progress.items():
+            setattr(job, name, value)
+        project_ids = chunk_ids
+
+        yield sorted(errors)
+
+    job.finished_at = datetime.now()
+    async with session_factory() as session:
+        await session.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job.id)
+            .values(finished_at=job.finished_at)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+
+async def main(
+    email: str, path: str, format: ImportFormat, resume: int | None
+) -> None:
+    async with AsyncSessionLocal() as session:
+        owner_id = await session.scalar(
+            select(User.id).where(User.email == email)
+        )
+        if owner_id is None:
+            sys.exit(f"no user {email}")
+
+        if resume is None:
+            job = ImportJob(owner_id=owner_id, source=path)
+            session.add(job)
+            await session.commit()
+        else:
+            job = await session.get(ImportJob, resume)
+            if job is None or job.owner_id != owner_id:
+                sys.exit(f"no import {resume} for {email}")
+            if job.finished_at is not None:
+                sys.exit(f"import {resume} has already finished")
+
+    print(f"import {job.id} of {path}, from row {job.rows_read + 1}")
+    start = time.perf_counter()
+    tasks_before = job.tasks_imported
+    with open(path, newline="", encoding="utf-8") as file:
+        try:
+            async for errors in import_chunks(
+                AsyncSessionLocal,
+                job,
+                read_records(file, format),
+                format,
+                settings.IMPORT_CHUNK_SIZE,
+            ):
+                for number, message in errors:
+                    print(f"row {number}: {message}", file=sys.stderr)
+                rate = (job.tasks_imported - tasks_before) / (
+                    time.perf_counter() - start
+                )
+                print(
+                    f"{job.rows_read} rows read: "
+                    f"{job.projects_imported} projects, "
+                    f"{job.tasks_imported} tasks, "
+                    f"{job.rows_skipped} skipped ({rate:,.0f} tasks/s)"
+                )
+        except BaseException:
+            print(
+                f"import {job.id} stopped after row {job.rows_read}, "
+                f"continue it with --resume {job.id}",
+                file=sys.stderr,
+            )
+            raise
+
+    print(
+        f"import {job.id} finished; tag filters of a running server see "
+        f"the imported tags within {settings.TAG_INDEX_TTL_SECONDS} s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("email", help="the user to import for")
+    parser.add_argument("file", help="a file written by GET /export")
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "csv"],
+        help="the file's format; by default, from its extension",
+    )
+    parser.add_argument(
+        "--resume",
+        type=int,
+        metavar="JOB_ID",
+        help="continue an import that stopped partway through",
+    )
+    args = parser.parse_args()
+    format = args.format or ("csv" if args.file.endswith(".csv") else "ndjson")
+    asyncio.run(main(args.email, args.file, format, args.resume))
@@ -0,0 +1,97 @@
+"""Recompute the task counters of every project and report any drift.
+
+The counters are kept current by triggers, so drift means rows were
+written with the triggers missing, e.g. by an older schema or by hand.
+Usage::
+
+    python -m app.commands.repair_counters [--dry-run]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import AsyncSessionLocal
+from app.models import PROJECT_COUNTERS, Project
+from app.models.project_counters import expected_counters
+
+
+async def repair_counters(
+    session: AsyncSession, dry_run: bool = False
+) -> list[dict]:
+    """Reset drifted counters to the values recomputed from the tasks.
+
+    Returns one entry per wrong counter. With ``dry_run`` nothing is
+    written. The caller commits.
+    """
+    expected = expected_counters().subquery()
+    result = await session.execute(
+        select(
+            Project.id,
+            *(getattr(Project, name) for name in PROJECT_COUNTERS),
+            *(
+                expected.c[name].label(f"expected_{name}")
+                for name in PROJECT_COUNTERS
+            ),
+        )
+        .join(expected, expected.c.id == Project.id)
+        .where(
+            or_(
+                *(
+                    getattr(Project, name) != expected.c[name]
+                    for name in PROJECT_COUNTERS
+                )
+            )
+        )
+        .order_by(Project.id)
+    )
+
+    drift = []
+    fixes = []
+    for row in result.mappings():
+        values = {name: row[f"expected_{name}"] for name in PROJECT_COUNTERS}
+        drift += [
+            {
+                "project_id": row["id"],
+                "counter": name,
+                "stored": row[name],
+                "expected": value,
+            }
+            for name, value in values.items()
+            if row[name] != value
+        ]
+        fixes.append({"id": row["id"], **values})
+
+    if fixes and not dry_run:
+        await session.execute(update(Project), fixes)
+
+    return drift
+
+
+async def main(dry_run: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        drift = await repair_counters(session, dry_run)
+        await session.commit()
+
+    for entry in drift:
+        print(
+            "project {project_id}: {counter} {stored} -> {expected}".format(
+                **entry
+            )
+        )
+    projects = len({entry["project_id"] for entry in drift})
+    action = "found" if dry_run else "repaired"
+    print(f"{action} {len(drift)} wrong counters in {projects} projects")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report drift, don't fix it",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,12 +18,75 @@ class Settings(BaseSettings):
 
     SQLALCHEMY_DATABASE_URI: str = "sqlite+aiosqlite:///./todo.db"
     DB_ECHO_LOG: bool = False
+    # Connections in the read-only pool; writes always use one connection
+    DB_READ_POOL_SIZE: int = 8
+
+    # Batch concurrent mutations into one commit (see app.db.writer)
+    DB_GROUP_COMMIT_ENABLED: bool = False
+    DB_GROUP_COMMIT_WINDOW_MS: float = 2.0
+    DB_GROUP_COMMIT_MAX_BATCH: int = 64
+
+    # SQLite connection pragmas (see app.db.session.SQLITE_PRAGMA_PROFILES)
+    SQLITE_PRAGMA_PROFILE: Literal["none", "performance"] = "performance"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456
+    SQLITE_WAL_CHECKPOINT_SECONDS: int = 300
 
     SECRET_KEY: str = "temp-secret-key-for-dev"  # TODO: Change in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 300
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # In-process cache for authenticated users (see app.core.cache)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 1024
+
+    # Worker pool for bcrypt: "thread", "process" or "inline"
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+
+    # Keyset pagination for list endpoints
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 1000
+
+    # Rows read and encoded at a time by streamed listings (?stream=) and
+    # by GET /export
+    STREAM_CHUNK_SIZE: int = 1000
+    # Streamed listings sent at once; each holds a read connection while
+    # its client reads, so keep this below DB_READ_POOL_SIZE to leave
+    # connections for every other GET. Further ones get 503.
+    STREAM_MAX_CONCURRENT: int = 4
+
+    # Responses of at least this many bytes are compressed with brotli or
+    # gzip, as the client accepts (see app.api.compression)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    BROTLI_QUALITY: int = 4
+    GZIP_COMPRESS_LEVEL: int = 6
+
+    # Input rows written per transaction by app.commands.import_data. The
+    # server's writers wait for the write lock while a chunk is written,
+    # so a chunk must take well under SQLITE_BUSY_TIMEOUT_MS.
+    IMPORT_CHUNK_SIZE: int = 10000
+
+    # Upper bound on operations in one POST /tasks/bulk request
+    MAX_BULK_OPERATIONS: int = 1000
+
+    # Per-user tag bitmaps for tag filters, rebuilt from task_tag on a miss
+    TAG_INDEX_TTL_SECONDS: int = 300
+    TAG_INDEX_MAX_USERS: int = 1024
+
+    # GET /search ranks at most this many of the newest matches, so that
+    # queries for very common words do not score the whole index; it says
+    # so in X-Search-Truncated when more matched
+    SEARCH_RANK_WINDOW: int = 2000
+
+    # GET /events: events buffered per connection before the client is
+    # told to resync instead, and the interval of keep-alive comments
+    EVENT_BUFFER_SIZE: int = 256
+    EVENT_HEARTBEAT_SECONDS: float = 15.0
+
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000"]
 
 
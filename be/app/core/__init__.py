@@ -1,13 +1,29 @@
+from .cache import TTLCache, user_cache
+from .events import EventBroker, Subscription, event_broker
+from .executor import BoundedExecutor, ExecutorSaturatedError
 from .security import (
     create_access_token,
     create_refresh_token,
     get_password_hash,
+    get_password_hash_async,
+    password_executor,
     verify_password,
+    verify_password_async,
 )
 
 __all__ = [
+    "BoundedExecutor",
+    "EventBroker",
+    "ExecutorSaturatedError",
+    "Subscription",
+    "TTLCache",
     "create_access_token",
     "create_refresh_token",
     "get_password_hash",
+    "get_password_hash_async",
+    "event_broker",
+    "password_executor",
+    "user_cache",
     "verify_password",
+    "verify_password_async",
 ]
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Any, Optional
+
+from app.config.settings import settings
+
+Event = tuple[str, dict[str, Any]]
+
+# Sent in place of the events a subscriber could not keep up with
+RESYNC: Event = ("resync", {})
+
+
+class Subscription:
+    """One connected client's buffer of events not yet sent to it.
+
+    The buffer holds at most ``maxsize`` events. A subscriber that falls
+    further behind loses its buffered events and gets a single RESYNC
+    instead, telling the client to catch up through GET /sync, so a slow
+    client costs neither memory nor the publishers' time.
+
+    Idle subscriptions are kept small: the buffer is a plain list and the
+    waiting client a bare future, which asyncio.Event and deque would each
+    add a few hundred bytes to.
+    """
+
+    __slots__ = ("user_id", "maxsize", "_events", "_waiter", "overflowed")
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.maxsize = maxsize
+        self._events: list[Event] = []
+        self._waiter: Optional[asyncio.Future] = None
+        self.overflowed = False
+
+    def put(self, event: Event) -> int:
+        """Buffer an event without waiting; return how many were dropped."""
+        if self.overflowed:
+            return 1
+
+        dropped = 0
+        if len(self._events) >= self.maxsize:
+            dropped = len(self._events) + 1
+            self._events = [RESYNC]
+            self.overflowed = True
+        else:
+            self._events.append(event)
+
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        return dropped
+
+    async def get(self, timeout: Optional[float] = None) -> list[Event]:
+        """Wait for events and take all of them; [] on timeout."""
+        if not self._events:
+            self._waiter = asyncio.get_running_loop().create_future()
+            # A timeout scope rather than wait_for(), which would start a
+            # task per wait for every idle connection
+            try:
+                async with asyncio.timeout(timeout):
+                    await self._waiter
+            except TimeoutError:
+                return []
+            finally:
+                self._waiter = None
+
+        events, self._events = self._events, []
+        self.overflowed = False
+        return events
+
+
+class EventBroker:
+    """In-process pub/sub of change notifications, by user.
+
+    Publishing never waits: events go into the bounded buffer of each of
+    the user's subscriptions. Only clients connected to this process are
+    reached.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self._subscriptions: dict[int, set[Subscription]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, self.buffer_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None:
+            return
+
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id: int, event: str, **data: Any) -> None:
+        """Notify every connected client of a user. Call after commit."""
+        self.published += 1
+        for subscription in self._subscriptions.get(user_id, ()):
+            self.dropped += subscription.put((event, data))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "users": len(self._subscriptions),
+            "subscriptions": sum(map(len, self._subscriptions.values())),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+# Change notifications for GET /events
+event_broker = EventBroker(buffer_size=settings.EVENT_BUFFER_SIZE)
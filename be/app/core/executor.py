@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+EXECUTOR_KINDS = ("inline", "thread", "process")
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when a BoundedExecutor has no free slot for more work."""
+
+
+class BoundedExecutor:
+    """Run blocking calls in a worker pool with a bounded backlog.
+
+    At most ``max_workers + queue_size`` calls may be running or waiting
+    at once. Further calls fail fast with ExecutorSaturatedError instead
+    of piling up behind the pool. The ``inline`` kind runs calls directly
+    on the event loop and exists for benchmarking and debugging.
+    """
+
+    def __init__(self, kind: str, max_workers: int, queue_size: int):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.capacity = max_workers + queue_size
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="bounded-executor"
+                )
+
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the pool and wait for the result."""
+        if self.kind == "inline":
+            return fn(*args)
+
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise ExecutorSaturatedError("Executor is saturated")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), partial(fn, *args)
+            )
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "capacity": self.capacity,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
@@ -6,8 +6,17 @@ from passlib.context import CryptContext
 
 from app.config.settings import settings
 
+from .executor import BoundedExecutor
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow, so it must not run on the event loop
+password_executor = BoundedExecutor(
+    settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -45,3 +54,13 @@ def verify_password(plain_password: str, hashed_password: str):
 
 def get_password_hash(password: str):
     return pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await password_executor.run(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str):
+    return await password_executor.run(get_password_hash, password)
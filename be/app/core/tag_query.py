@@ -0,0 +1,142 @@
+"""Boolean tag expressions evaluated against per-tag bitmaps.
+
+A bitmap is a Python int with bit ``n`` set for task ``n``, numbered as
+the caller likes (app.db.tag_index numbers each user's tagged tasks).
+``NOT`` is ``~``, so a negative result stands for "every task except" the
+bits of its complement, without needing a bitmap of all tasks.
+
+Grammar (operators are case-insensitive, adjacent terms are ANDed)::
+
+    expr   := term ("OR" term)*
+    term   := factor (["AND"] factor)*
+    factor := "NOT" factor | "@tag" | "(" expr ")"
+"""
+
+import re
+from typing import Iterable, Mapping, Union
+
+TagQuery = Union[str, tuple]
+
+_TOKEN = re.compile(r"\s*(?:(\()|(\))|@([^\s()@]+)|(\w+))")
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+class TagQuerySyntaxError(ValueError):
+    """Raised when a tag expression cannot be parsed."""
+
+
+def normalize_tag(name: str) -> str:
+    """Tags are matched case-insensitively and written without the @."""
+    return name.strip().removeprefix("@").lower()
+
+
+def _tokenize(query: str) -> list[str]:
+    tokens = []
+    position = 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        if match is None:
+            raise TagQuerySyntaxError(
+                f"Unexpected character at position {position}"
+            )
+        open_, close, tag, word = match.groups()
+        if tag is not None:
+            tokens.append("@" + normalize_tag(tag))
+        elif word is not None:
+            if word.upper() not in _OPERATORS:
+                raise TagQuerySyntaxError(
+                    f"Unknown operator {word!r}; tags start with @"
+                )
+            tokens.append(word.upper())
+        else:
+            tokens.append(open_ or close)
+        position = match.end()
+    return tokens
+
+
+def parse_tag_query(query: str) -> TagQuery:
+    """Parse an expression into nested ``("and" | "or", a, b)`` and
+    ``("not", a)`` tuples with tag names as leaves."""
+    tokens = _tokenize(query)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def expr():
+        node = term()
+        while peek() == "OR":
+            take()
+            node = ("or", node, term())
+        return node
+
+    def term():
+        node = factor()
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                take()
+            node = ("and", node, factor())
+        return node
+
+    def factor():
+        token = peek()
+        if token is None:
+            raise TagQuerySyntaxError("Unexpected end of expression")
+        take()
+        if token == "NOT":
+            return ("not", factor())
+        if token == "(":
+            node = expr()
+            if peek() != ")":
+                raise TagQuerySyntaxError("Missing closing parenthesis")
+            take()
+            return node
+        if token.startswith("@"):
+            return token[1:]
+        raise TagQuerySyntaxError(f"Unexpected {token!r}")
+
+    node = expr()
+    if peek() is not None:
+        raise TagQuerySyntaxError(f"Unexpected {peek()!r}")
+    return node
+
+
+def evaluate(query: TagQuery, bitmaps: Mapping[str, int]) -> int:
+    """Evaluate a parsed expression. Unknown tags match nothing."""
+    if isinstance(query, str):
+        return bitmaps.get(query, 0)
+
+    op, *args = query
+    if op == "not":
+        return ~evaluate(args[0], bitmaps)
+
+    left, right = (evaluate(arg, bitmaps) for arg in args)
+    return left & right if op == "and" else left | right
+
+
+def ids_bitmap(ids: Iterable[int]) -> int:
+    """Build a bitmap from ids in one pass, rather than one OR per id."""
+    bits = bytearray()
+    for id_ in ids:
+        byte = id_ >> 3
+        if byte >= len(bits):
+            bits.extend(bytes(byte - len(bits) + 1))
+        bits[byte] |= 1 << (id_ & 7)
+    return int.from_bytes(bits, "little")
+
+
+def bitmap_ids(bitmap: int) -> list[int]:
+    """Ids of the set bits of a non-negative bitmap, in ascending order."""
+    bits = bin(bitmap)[:1:-1]
+    ids = []
+    index = bits.find("1")
+    while index != -1:
+        ids.append(index)
+        index = bits.find("1", index + 1)
+    return ids
@@ -1,9 +1,27 @@
 from .init_db import create_inbox_project, init_db
-from .session import AsyncSessionLocal, engine
+from .query_plan import query_plans
+from .session import (
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    checkpoint_wal,
+    engine,
+    read_engine,
+    read_snapshot,
+)
+from .tag_index import tag_index
+from .writer import group_writer, run_write
 
 __all__ = [
     "init_db",
     "create_inbox_project",
     "AsyncSessionLocal",
+    "ReadSessionLocal",
+    "checkpoint_wal",
     "engine",
+    "group_writer",
+    "query_plans",
+    "read_engine",
+    "read_snapshot",
+    "run_write",
+    "tag_index",
 ]
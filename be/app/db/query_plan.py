@@ -0,0 +1,98 @@
+import logging
+import re
+from typing import Any, Hashable, Iterable, Sequence
+
+from sqlalchemy import Executable
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.models import Base
+
+logger = logging.getLogger(__name__)
+
+# Set on responses whose query had no supporting index
+QUERY_PLAN_HEADER = "X-Query-Plan"
+
+# "SCAN task", "SCAN task USING INDEX ix_task_title", ... A full pass over
+# a table or an index, as opposed to a SEARCH on an index prefix.
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+async def explain(
+    conn: AsyncConnection, statement: str, parameters: Sequence[Any] = ()
+) -> list[str]:
+    """Return the detail lines of SQLite's EXPLAIN QUERY PLAN."""
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", tuple(parameters)
+    )
+
+    return [row[-1] for row in result.all()]
+
+
+def find_scans(plan: Iterable[str], tables: Iterable[str]) -> list[str]:
+    """Plan lines that scan one of ``tables`` or sort with a temp B-tree.
+
+    Scans of CTEs and subqueries are not reported, only real tables.
+    """
+    tables = set(tables)
+    problems = []
+    for line in plan:
+        match = _SCAN.match(line)
+        if match and match.group(1) in tables:
+            problems.append(line)
+        elif line.startswith("USE TEMP B-TREE"):
+            problems.append(line)
+
+    return problems
+
+
+class PlanChecker:
+    """Remember which query shapes SQLite cannot answer from an index.
+
+    Callers describe the shape of a statement with a hashable key, such as
+    the set of filters in use. The first statement of each shape is run
+    through EXPLAIN QUERY PLAN, and the scans it reports are cached under
+    the key, so the check costs one extra round trip per shape and a dict
+    lookup afterwards.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._problems: dict[Hashable, list[str]] = {}
+
+    async def check(
+        self, conn: AsyncConnection, key: Hashable, statement: Executable
+    ) -> list[str]:
+        """Return the scans in the plan of ``statement``, by shape."""
+        problems = self._problems.get(key)
+        if problems is not None:
+            return problems
+
+        compiled = statement.compile(
+            dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        # The plan is fixed when the statement is prepared, not by values
+        parameters = [None] * len(compiled.positiontup or ())
+        plan = await explain(conn, str(compiled), parameters)
+
+        problems = find_scans(plan, Base.metadata.tables)
+        if problems:
+            logger.warning(
+                "Query without a supporting index: %s\n%s",
+                compiled,
+                "\n".join(problems),
+            )
+        if len(self._problems) < self.maxsize:
+            self._problems[key] = problems
+        return problems
+
+    def clear(self) -> None:
+        self._problems.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "shapes": len(self._problems),
+            "unindexed": sum(1 for p in self._problems.values() if p),
+        }
+
+
+query_plans = PlanChecker()
@@ -1,4 +1,11 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -7,12 +14,134 @@ from sqlalchemy.orm import declarative_base
 
 from app.config.settings import settings
 
-# Create async engine
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI, echo=settings.DB_ECHO_LOG, future=True
+logger = logging.getLogger(__name__)
+
+# Connection pragmas per SQLITE_PRAGMA_PROFILE. "none" keeps SQLite's
+# defaults (rollback journal, synchronous=FULL, no busy timeout).
+SQLITE_PRAGMA_PROFILES: dict[str, dict[str, Any]] = {
+    "none": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE_BYTES,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Added to the profile for the read pool so a stray write fails loudly
+READ_ONLY_PRAGMAS: dict[str, Any] = {"query_only": "ON"}
+
+
+def apply_pragmas(engine: AsyncEngine, pragmas: dict[str, Any]) -> None:
+    """Run ``PRAGMA name = value`` on every new SQLite connection."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def use_explicit_transactions(engine: AsyncEngine) -> None:
+    """Let SQLAlchemy emit BEGIN IMMEDIATE itself instead of the sqlite3
+    driver.
+
+    The driver only starts a transaction before the first INSERT/UPDATE/
+    DELETE, so a SAVEPOINT issued earlier opens (and its RELEASE commits)
+    a transaction of its own. Taking over BEGIN makes SAVEPOINTs nest
+    inside the session's transaction as they should.
+
+    The transaction takes the write lock up front: one that read first
+    and found another connection had committed since could not write at
+    all, failing with SQLITE_BUSY at once instead of waiting out the busy
+    timeout.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+@asynccontextmanager
+async def read_snapshot(session: AsyncSession) -> AsyncIterator[None]:
+    """Run a session's queries on one snapshot of the database.
+
+    The sqlite3 driver starts no transaction for a SELECT, so each query
+    of a read session sees whatever was committed last. A BEGIN makes the
+    queries inside share the snapshot the first of them takes. A session
+    that is in a transaction already has one.
+    """
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    if raw.driver_connection.in_transaction:
+        yield
+        return
+
+    await conn.exec_driver_sql("BEGIN")
+    try:
+        yield
+    finally:
+        await conn.exec_driver_sql("COMMIT")
+
+
+def create_engine(
+    url: str, pragmas: dict[str, Any], **kwargs: Any
+) -> AsyncEngine:
+    """Create an async engine whose connections get ``pragmas``."""
+    engine = create_async_engine(
+        url, echo=settings.DB_ECHO_LOG, future=True, **kwargs
+    )
+    apply_pragmas(engine, pragmas)
+
+    return engine
+
+
+async def checkpoint_wal(engine: AsyncEngine, interval: float) -> None:
+    """Run a PASSIVE WAL checkpoint every ``interval`` seconds.
+
+    SQLite checkpoints automatically on commit, but never past a page a
+    reader still needs, so under steady read traffic the WAL keeps growing.
+    A passive checkpoint copies what it can without blocking anyone.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+        except Exception:
+            logger.exception("WAL checkpoint failed")
+
+
+_pragmas = SQLITE_PRAGMA_PROFILES[settings.SQLITE_PRAGMA_PROFILE]
+
+# SQLite allows a single writer, so all mutations share one connection
+# and queue for it here rather than on the database file lock.
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI, _pragmas, pool_size=1, max_overflow=0
 )
+use_explicit_transactions(engine)
 
-# Create async session factory
+# In WAL mode readers don't block the writer or each other, so reads get
+# a pool of their own.
+read_engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    {**_pragmas, **READ_ONLY_PRAGMAS},
+    pool_size=settings.DB_READ_POOL_SIZE,
+    max_overflow=0,
+)
+
+# Create async session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -21,4 +150,12 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 Base = declarative_base()
@@ -0,0 +1,135 @@
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.core.cache import TTLCache
+from app.core.tag_query import bitmap_ids, ids_bitmap
+from app.models import Tag, task_tag
+
+
+class UserTags:
+    """One user's tags, as bitmaps over dense ordinals of task ids.
+
+    Tagged tasks are numbered 0, 1, 2, ... in the order they are first
+    seen, so a bitmap takes a bit per tagged task of this user rather than
+    one per task id in the whole database.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, int]]):
+        self.task_ids: list[int] = []
+        self.ordinals: dict[int, int] = {}
+        ordinals: dict[str, list[int]] = {}
+        for name, task_id in rows:
+            ordinals.setdefault(name, []).append(self.ordinal(task_id))
+        self.bitmaps = {name: ids_bitmap(o) for name, o in ordinals.items()}
+
+    def ordinal(self, task_id: int) -> int:
+        """The task's ordinal, numbering it next if it has none yet."""
+        ordinal = self.ordinals.get(task_id)
+        if ordinal is None:
+            ordinal = self.ordinals[task_id] = len(self.task_ids)
+            self.task_ids.append(task_id)
+        return ordinal
+
+    def ids(self, bitmap: int) -> list[int]:
+        """Task ids of the set bits of a non-negative bitmap."""
+        return [self.task_ids[ordinal] for ordinal in bitmap_ids(bitmap)]
+
+
+class TagIndex:
+    """Per-user inverted index from tag name to a bitmap of tasks.
+
+    A user's bitmaps are built from ``task_tag`` with one indexed query
+    the first time they are needed, then kept current by the write paths
+    that change tags. Writes that remove tasks in bulk drop the user's
+    bitmaps instead, and the TTL bounds how long another process's writes
+    can go unnoticed. Call the update methods only after the write has
+    been committed.
+
+    A build that a write was reported during may have read the tags from
+    before it, so it answers the request that asked for it but is not
+    cached.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache[int, UserTags] = TTLCache(maxsize, ttl)
+        # A token per user whose bitmaps are being built, dropped by any
+        # write reported in the meantime
+        self._builds: dict[int, object] = {}
+
+    async def get(self, db: AsyncSession, owner_id: int) -> UserTags:
+        """Return the user's bitmaps, building them on a miss."""
+        tags = self._cache.get(owner_id)
+        if tags is not None:
+            return tags
+
+        build = self._builds[owner_id] = object()
+        try:
+            result = await db.execute(
+                select(Tag.name, task_tag.c.task_id)
+                .join(task_tag, task_tag.c.tag_id == Tag.id)
+                .where(Tag.owner_id == owner_id)
+            )
+            tags = UserTags(result)
+        finally:
+            current = self._builds.get(owner_id)
+            if current is build:
+                del self._builds[owner_id]
+
+        if current is build:
+            self._cache.set(owner_id, tags)
+        return tags
+
+    def set_task_tags(
+        self, owner_id: int, task_id: int, names: Iterable[str]
+    ) -> None:
+        """Replace the tags of one task."""
+        self._builds.pop(owner_id, None)
+        tags = self._cache.get(owner_id)
+        if tags is None:
+            return
+
+        names = set(names)
+        if not names and task_id not in tags.ordinals:
+            return
+        bit = 1 << tags.ordinal(task_id)
+        bitmaps = tags.bitmaps
+        for name in names | bitmaps.keys():
+            if name in names:
+                bitmaps[name] = bitmaps.get(name, 0) | bit
+            elif bitmaps[name] & bit:
+                bitmaps[name] &= ~bit
+
+    def discard_tasks(self, owner_id: int, task_ids: Iterable[int]) -> None:
+        """Forget deleted tasks."""
+        self._builds.pop(owner_id, None)
+        tags = self._cache.get(owner_id)
+        if tags is None:
+            return
+
+        mask = ids_bitmap(
+            tags.ordinals[task_id]
+            for task_id in task_ids
+            if task_id in tags.ordinals
+        )
+        bitmaps = tags.bitmaps
+        for name in bitmaps:
+            bitmaps[name] &= ~mask
+
+    def invalidate(self, owner_id: int) -> None:
+        self._builds.pop(owner_id, None)
+        self._cache.invalidate(owner_id)
+
+    def clear(self) -> None:
+        self._builds.clear()
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+
+tag_index = TagIndex(
+    maxsize=settings.TAG_INDEX_MAX_USERS, ttl=settings.TAG_INDEX_TTL_SECONDS
+)
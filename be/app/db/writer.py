@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config.settings import settings
+
+from .session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# A unit of work for one request. It may read and write through the
+# session it is given but must not commit, and it may run more than once
+# if its batch is replayed. It should return plain data (e.g. validated
+# schemas), since the session is closed afterwards.
+WriteOp = Callable[[AsyncSession], Awaitable[T]]
+
+
+class GroupCommitWriter:
+    """Apply write operations from concurrent requests in shared commits.
+
+    Operations are queued and applied in batches of up to ``max_batch``,
+    collected for at most ``window_ms`` after the first one arrives, and
+    the whole batch costs a single commit (and fsync). If an operation
+    fails, the batch is rolled back and replayed with each operation in
+    its own SAVEPOINT, so the failure only undoes its own changes. Every
+    caller receives its own result or error.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        window_ms: float,
+        max_batch: int,
+    ):
+        self._session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.operations = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Apply what is already queued, then stop the writer task."""
+        if self._task is None:
+            return
+
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(self, op: WriteOp[T]) -> T:
+        """Queue ``op`` and wait until its batch has been committed."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, future))
+
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(self._queue.get(), timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                await self._apply(batch)
+            except Exception as exc:
+                logger.exception("Group commit failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _apply(self, batch: list) -> None:
+        async with self._session_factory() as session:
+            try:
+                outcomes = [
+                    (future, await op(session), None) for op, future in batch
+                ]
+            except Exception:
+                # Some operation failed and may have left partial changes.
+                # Start over with every operation in its own SAVEPOINT.
+                await session.rollback()
+                outcomes = await self._apply_isolated(session, batch)
+
+            await session.commit()
+
+        self.batches += 1
+        self.operations += len(batch)
+
+        for future, result, exc in outcomes:
+            if future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    async def _apply_isolated(self, session: AsyncSession, batch: list):
+        outcomes = []
+        for op, future in batch:
+            try:
+                async with session.begin_nested():
+                    outcomes.append((future, await op(session), None))
+            except Exception as exc:
+                outcomes.append((future, None, exc))
+
+        return outcomes
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "running": int(self.running),
+            "queued": self._queue.qsize(),
+            "batches": self.batches,
+            "operations": self.operations,
+        }
+
+
+group_writer = GroupCommitWriter(
+    AsyncSessionLocal,
+    window_ms=settings.DB_GROUP_COMMIT_WINDOW_MS,
+    max_batch=settings.DB_GROUP_COMMIT_MAX_BATCH,
+)
+
+
+async def run_write(db: AsyncSession, op: WriteOp[T]) -> T:
+    """Apply ``op`` and commit it.
+
+    With group commit enabled the operation joins the next batch of the
+    group writer; otherwise it runs on ``db`` and is committed right away.
+    """
+    if group_writer.running:
+        return await group_writer.submit(op)
+
+    result = await op(db)
+    await db.commit()
+
+    return result
@@ -1,11 +1,37 @@
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-
-from .api.endpoints import auth, projects, tasks
+from fastapi.responses import JSONResponse
+
+from .api.compression import CompressionMiddleware
+from .api.endpoints import (
+    admin,
+    auth,
+    events,
+    export,
+    projects,
+    search,
+    sync,
+    tags,
+    tasks,
+)
+from .api.endpoints.search import SEARCH_TRUNCATED_HEADER
+from .api.etag import ETAG_HEADER
+from .api.pagination import NEXT_CURSOR_HEADER
+from .api.responses import JSONBytesResponse
 from .config.settings import settings
-from .db import AsyncSessionLocal, create_inbox_project, init_db
+from .core import ExecutorSaturatedError, password_executor
+from .db import (
+    AsyncSessionLocal,
+    checkpoint_wal,
+    create_inbox_project,
+    engine,
+    group_writer,
+    init_db,
+)
+from .db.query_plan import QUERY_PLAN_HEADER
 
 
 @asynccontextmanager
@@ -17,10 +43,38 @@ async def lifespan(app: FastAPI):
     async with AsyncSessionLocal() as session:
         await create_inbox_project(session)
 
+    wal_checkpoints = None
+    if (
+        settings.SQLITE_PRAGMA_PROFILE == "performance"
+        and settings.SQLITE_WAL_CHECKPOINT_SECONDS > 0
+    ):
+        wal_checkpoints = asyncio.create_task(
+            checkpoint_wal(engine, settings.SQLITE_WAL_CHECKPOINT_SECONDS)
+        )
+
+    if settings.DB_GROUP_COMMIT_ENABLED:
+        group_writer.start()
+
     yield
 
     # Shutdown
-    pass
+    await group_writer.stop()
+
+    if wal_checkpoints is not None:
+        wal_checkpoints.cancel()
+
+    password_executor.shutdown()
+
+
+async def executor_saturated_handler(
+    request: Request, exc: ExecutorSaturatedError
+):
+    """Tell clients to back off when a worker pool is full."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
 
 
 def create_application() -> FastAPI:
@@ -30,6 +84,8 @@ def create_application() -> FastAPI:
         version=settings.VERSION,
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         lifespan=lifespan,
+        # Routers use JSONRoute to serialize responses to bytes in one step
+        default_response_class=JSONBytesResponse,
     )
 
     # Set up CORS middleware
@@ -39,6 +95,20 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[
+            NEXT_CURSOR_HEADER,
+            ETAG_HEADER,
+            QUERY_PLAN_HEADER,
+            SEARCH_TRUNCATED_HEADER,
+        ],
+    )
+
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE
+    )
+
+    app.add_exception_handler(
+        ExecutorSaturatedError, executor_saturated_handler
     )
 
     # Include routers
@@ -53,12 +123,48 @@ def create_application() -> FastAPI:
         tags=["projects"],
     )
 
+    app.include_router(
+        tags.router,
+        prefix=settings.API_V1_STR,
+        tags=["tags"],
+    )
+
+    app.include_router(
+        search.router,
+        prefix=settings.API_V1_STR,
+        tags=["search"],
+    )
+
+    app.include_router(
+        sync.router,
+        prefix=settings.API_V1_STR,
+        tags=["sync"],
+    )
+
+    app.include_router(
+        events.router,
+        prefix=settings.API_V1_STR,
+        tags=["events"],
+    )
+
+    app.include_router(
+        export.router,
+        prefix=settings.API_V1_STR,
+        tags=["export"],
+    )
+
     app.include_router(
         auth.router,
         prefix=f"{settings.API_V1_STR}/auth",
         tags=["auth"],
     )
 
+    app.include_router(
+        admin.router,
+        prefix=f"{settings.API_V1_STR}/admin",
+        tags=["admin"],
+    )
+
     return app
 
 
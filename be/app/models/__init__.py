@@ -3,9 +3,29 @@ Database models package.
 """
 
 from .base import Base
+from .data_version import DATA_VERSION_DDL, tombstone
+from .import_job import ImportJob
 from .project import Project
+from .project_closure import project_closure
+from .project_counters import PROJECT_COUNTERS
+from .search_index import search_index
 from .status import Status
+from .tag import Tag, task_tag
 from .task import Task
 from .user import User
 
-__all__ = ["Base", "Project", "Status", "Task", "User"]
+__all__ = [
+    "DATA_VERSION_DDL",
+    "PROJECT_COUNTERS",
+    "Base",
+    "ImportJob",
+    "Project",
+    "Status",
+    "Tag",
+    "Task",
+    "User",
+    "project_closure",
+    "search_index",
+    "task_tag",
+    "tombstone",
+]
@@ -0,0 +1,124 @@
+from sqlalchemy import DDL, Column, ForeignKey, Integer, String, Table, event
+
+from .base import Base
+
+# Deleted projects and tasks, for clients syncing changes since a point in
+# the user's change sequence. Each row takes the sequence number of the
+# delete, so the primary key also serves those reads.
+tombstone = Table(
+    "tombstone",
+    Base.metadata,
+    Column("owner_id", Integer, ForeignKey("user.id"), primary_key=True),
+    Column("change_seq", Integer, primary_key=True),
+    Column("kind", String, nullable=False),
+    Column("item_id", Integer, nullable=False),
+)
+
+# A per-user change sequence. Every insert, update and delete of one of
+# the user's projects or tasks, on every write path, bumps the user's
+# data_version and stamps the row (or its tombstone) with the new value.
+# Writes are serialized, so a client that has seen everything up to a
+# number never misses a later change. Conditional GETs compare the
+# version instead of reading the rows themselves.
+#
+# Task stamps also keep completed_at, the time the task was marked done:
+# the updated_at of the write that made it DONE, NULL while it is not.
+# An insert may carry its own.
+#
+# Stamping a row is itself an update of the row; the WHEN clauses keep it
+# from being counted as a change again. Task writes that change a
+# project's counters also stamp the project, since its counters changed.
+DATA_VERSION_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_insert
+    AFTER INSERT ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE task
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        ),
+        completed_at = CASE
+            WHEN new.status = 'DONE'
+            THEN coalesce(new.completed_at, new.updated_at)
+        END
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_update
+    AFTER UPDATE ON task
+    WHEN new.change_seq IS old.change_seq
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE task
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        ),
+        completed_at = CASE
+            WHEN new.status != 'DONE' THEN NULL
+            WHEN old.status = 'DONE' THEN new.completed_at
+            ELSE new.updated_at
+        END
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_version_delete
+    AFTER DELETE ON task
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = old.owner_id;
+        INSERT INTO tombstone (owner_id, change_seq, kind, item_id)
+        SELECT id, data_version, 'task', old.id
+        FROM user WHERE id = old.owner_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_insert
+    AFTER INSERT ON project
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE project
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        )
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_update
+    AFTER UPDATE ON project
+    WHEN new.change_seq IS old.change_seq
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = new.owner_id;
+        UPDATE project
+        SET change_seq = (
+            SELECT data_version FROM user WHERE id = new.owner_id
+        )
+        WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_version_delete
+    AFTER DELETE ON project
+    BEGIN
+        UPDATE user SET data_version = data_version + 1
+        WHERE id = old.owner_id;
+        INSERT INTO tombstone (owner_id, change_seq, kind, item_id)
+        SELECT id, data_version, 'project', old.id
+        FROM user WHERE id = old.owner_id;
+    END
+    """,
+]
+
+for statement in DATA_VERSION_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
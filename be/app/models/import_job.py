@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+
+from .base import Base
+
+
+class ImportJob(Base):
+    """Progress of an import (see app.commands.import_data).
+
+    Every chunk of the input is written in one transaction that also
+    advances its job, so an import that failed partway through resumes
+    after the last chunk it committed, with the ids its projects got.
+    """
+
+    __tablename__ = "import_job"
+
+    owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    source = Column(String, nullable=False)
+
+    # Input rows read by the committed chunks, imported or not
+    rows_read = Column(Integer, default=0, nullable=False)
+    rows_skipped = Column(Integer, default=0, nullable=False)
+    projects_imported = Column(Integer, default=0, nullable=False)
+    tasks_imported = Column(Integer, default=0, nullable=False)
+    # JSON object from exported to imported project ids, as tasks in
+    # later chunks refer to the projects by their exported ids
+    project_ids = Column(Text, default="{}", nullable=False)
+
+    finished_at = Column(DateTime, nullable=True)
@@ -1,5 +1,13 @@
-from sqlalchemy import Boolean, Column, Enum, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.orm import query_expression, relationship
 
 from .base import Base
 from .status import Status
@@ -8,6 +16,15 @@ from .status import Status
 class Project(Base):
     """Project model."""
 
+    __table_args__ = (
+        # Children of a project (tree walks and the parent_id foreign key)
+        Index("ix_project_parent_id", "parent_id"),
+        # Top-level or child projects of one user
+        Index("ix_project_owner_id_parent_id", "owner_id", "parent_id"),
+        # A user's projects changed since a point in their change sequence
+        Index("ix_project_owner_id_change_seq", "owner_id", "change_seq"),
+    )
+
     name = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     status = Column(Enum(Status), default=Status.TODO, nullable=False)
@@ -21,5 +38,27 @@ class Project(Base):
 
     tasks = relationship("Task", back_populates="project")
 
-    owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    # Task counters, maintained by the triggers in project_counters.py.
+    # Flagged tasks are only counted while they are still to do.
+    todo_count = Column(Integer, default=0, server_default="0", nullable=False)
+    done_count = Column(Integer, default=0, server_default="0", nullable=False)
+    dropped_count = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    deferred_count = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    flagged_count = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Depends on the current time, so it is computed by the queries that
+    # need it, see project_counters.overdue_count
+    overdue_count = query_expression()
+
+    owner_id = Column(
+        Integer, ForeignKey("user.id"), index=True, nullable=False
+    )
     owner = relationship("User", back_populates="projects")
+
+    # Set by the triggers in data_version.py on every change
+    change_seq = Column(Integer, default=0, server_default="0", nullable=False)
@@ -0,0 +1,139 @@
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    Table,
+    bindparam,
+    event,
+    inspect,
+    literal,
+    or_,
+    select,
+    true,
+    union_all,
+)
+
+from .base import Base
+from .project import Project
+
+# One row for every (ancestor, descendant) pair of the project hierarchy,
+# including each project paired with itself at depth 0. Subtree reads,
+# moves and cascades are joins against this table instead of tree walks.
+project_closure = Table(
+    "project_closure",
+    Base.metadata,
+    Column(
+        "ancestor_id",
+        Integer,
+        ForeignKey("project.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "descendant_id",
+        Integer,
+        ForeignKey("project.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("depth", Integer, nullable=False),
+    # Ancestors of a project, nearest first
+    Index("ix_project_closure_descendant_id_depth", "descendant_id", "depth"),
+)
+
+_project_id = bindparam("project_id", type_=Integer)
+_parent_id = bindparam("parent_id", type_=Integer)
+_ancestor = project_closure.alias("ancestor")
+_descendant = project_closure.alias("descendant")
+
+# Link a new leaf project to itself and to every ancestor of its parent.
+LINK_PROJECT = project_closure.insert().from_select(
+    ["ancestor_id", "descendant_id", "depth"],
+    union_all(
+        select(_project_id, _project_id, literal(0)),
+        select(
+            project_closure.c.ancestor_id,
+            _project_id,
+            project_closure.c.depth + 1,
+        ).where(project_closure.c.descendant_id == _parent_id),
+    ),
+)
+
+# Cut the subtree of a project off from the project's ancestors.
+DETACH_SUBTREE = project_closure.delete().where(
+    project_closure.c.descendant_id.in_(
+        select(_descendant.c.descendant_id).where(
+            _descendant.c.ancestor_id == _project_id
+        )
+    ),
+    project_closure.c.ancestor_id.in_(
+        select(_ancestor.c.ancestor_id).where(
+            _ancestor.c.descendant_id == _project_id,
+            _ancestor.c.depth > 0,
+        )
+    ),
+)
+
+# Hang a detached subtree under a new parent and all of its ancestors.
+ATTACH_SUBTREE = project_closure.insert().from_select(
+    ["ancestor_id", "descendant_id", "depth"],
+    select(
+        _ancestor.c.ancestor_id,
+        _descendant.c.descendant_id,
+        _ancestor.c.depth + _descendant.c.depth + 1,
+    )
+    # Every ancestor of the new parent with every node of the subtree
+    .join_from(_ancestor, _descendant, true()).where(
+        _ancestor.c.descendant_id == _parent_id,
+        _descendant.c.ancestor_id == _project_id,
+    ),
+)
+
+# Drop every link of a project that is about to be deleted on its own.
+UNLINK_PROJECT = project_closure.delete().where(
+    or_(
+        project_closure.c.ancestor_id == _project_id,
+        project_closure.c.descendant_id == _project_id,
+    )
+)
+
+# Drop every link into a subtree that is deleted as a whole.
+UNLINK_SUBTREE = project_closure.delete().where(
+    project_closure.c.descendant_id.in_(
+        select(_descendant.c.descendant_id).where(
+            _descendant.c.ancestor_id == _project_id
+        )
+    )
+)
+
+
+def subtree_ids(project_id: int):
+    """Select the ids of a project and all of its descendants."""
+    return select(project_closure.c.descendant_id).where(
+        project_closure.c.ancestor_id == project_id
+    )
+
+
+@event.listens_for(Project, "after_insert")
+def _link_inserted(mapper, connection, target):
+    connection.execute(
+        LINK_PROJECT,
+        {"project_id": target.id, "parent_id": target.parent_id},
+    )
+
+
+@event.listens_for(Project, "after_update")
+def _move_updated(mapper, connection, target):
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+
+    params = {"project_id": target.id, "parent_id": target.parent_id}
+    connection.execute(DETACH_SUBTREE, params)
+    connection.execute(ATTACH_SUBTREE, params)
+
+
+@event.listens_for(Project, "after_delete")
+def _unlink_deleted(mapper, connection, target):
+    # Children the ORM detached in the same flush become roots
+    params = {"project_id": target.id}
+    connection.execute(DETACH_SUBTREE, params)
+    connection.execute(UNLINK_PROJECT, params)
@@ -0,0 +1,155 @@
+from datetime import datetime
+
+from sqlalchemy import DDL, and_, case, event, func, select, update
+
+from .base import Base
+from .project import Project
+from .status import Status
+from .task import Task
+
+# Counter columns of Project, with the tasks each of them counts
+PROJECT_COUNTERS = {
+    "todo_count": Task.status == Status.TODO,
+    "done_count": Task.status == Status.DONE,
+    "dropped_count": Task.status == Status.DROPPED,
+    "deferred_count": Task.status == Status.DEFERRED,
+    "flagged_count": and_(Task.is_flagged, Task.status == Status.TODO),
+}
+
+# The triggers below keep the counters of a task's project current on
+# every write path (ORM, bulk and set-based statements), inside the
+# writing transaction. An update that moves a task or changes what it
+# counts as takes it out of the old counters and adds it to the new ones.
+# Statuses are stored by enum name.
+_ADD = """
+    UPDATE project SET
+        todo_count = todo_count + (new.status = 'TODO'),
+        done_count = done_count + (new.status = 'DONE'),
+        dropped_count = dropped_count + (new.status = 'DROPPED'),
+        deferred_count = deferred_count + (new.status = 'DEFERRED'),
+        flagged_count = flagged_count
+            + (new.is_flagged AND new.status = 'TODO')
+    WHERE id = new.project_id;
+"""
+_REMOVE = """
+    UPDATE project SET
+        todo_count = todo_count - (old.status = 'TODO'),
+        done_count = done_count - (old.status = 'DONE'),
+        dropped_count = dropped_count - (old.status = 'DROPPED'),
+        deferred_count = deferred_count - (old.status = 'DEFERRED'),
+        flagged_count = flagged_count
+            - (old.is_flagged AND old.status = 'TODO')
+    WHERE id = old.project_id;
+"""
+
+PROJECT_COUNTERS_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_counters_insert AFTER INSERT ON task
+    BEGIN
+        {_ADD}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_counters_update
+    AFTER UPDATE OF status, is_flagged, project_id ON task
+    WHEN old.status IS NOT new.status
+        OR old.is_flagged IS NOT new.is_flagged
+        OR old.project_id IS NOT new.project_id
+    BEGIN
+        {_REMOVE}
+        {_ADD}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_counters_delete AFTER DELETE ON task
+    BEGIN
+        {_REMOVE}
+    END
+    """,
+]
+
+for statement in PROJECT_COUNTERS_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+
+
+def _task_counts(*conditions):
+    """Select the counters of the tasks matching ``conditions``."""
+    return (
+        select(
+            Task.project_id,
+            *(
+                func.sum(case((condition, 1), else_=0)).label(name)
+                for name, condition in PROJECT_COUNTERS.items()
+            ),
+        )
+        .where(*conditions)
+        .group_by(Task.project_id)
+        .subquery()
+    )
+
+
+def expected_counters():
+    """Select every project's counters as recomputed from its tasks."""
+    counts = _task_counts()
+
+    return select(
+        Project.id,
+        *(
+            func.coalesce(counts.c[name], 0).label(name)
+            for name in PROJECT_COUNTERS
+        ),
+    ).outerjoin(counts, counts.c.project_id == Project.id)
+
+
+def add_to_counters(*conditions):
+    """Add the tasks matching ``conditions`` to their projects' counters.
+
+    What task_counters_insert does row by row, in one statement, for tasks
+    inserted with the trigger dropped (see app.commands.import_data).
+    """
+    counts = _task_counts(*conditions)
+
+    return (
+        update(Project)
+        .where(Project.id == counts.c.project_id)
+        .values(
+            {
+                name: getattr(Project, name) + counts.c[name]
+                for name in PROJECT_COUNTERS
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def overdue_count(now: datetime):
+    """Count a project's tasks to do that were due before ``now``."""
+    return (
+        select(func.count())
+        .where(
+            Task.project_id == Project.id,
+            Task.status == Status.TODO,
+            Task.due_date < now,
+        )
+        .scalar_subquery()
+    )
+
+
+def next_overdue(owner_id: int, now: datetime):
+    """Select when the next of a user's tasks to do becomes overdue.
+
+    Overdue counts read at ``now`` stay valid until then.
+    """
+    return (
+        select(func.min(Task.due_date))
+        .where(
+            Task.owner_id == owner_id,
+            Task.status == Status.TODO,
+            Task.due_date >= now,
+        )
+        .scalar_subquery()
+    )
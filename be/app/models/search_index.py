@@ -0,0 +1,148 @@
+from sqlalchemy import DDL, column, event, literal, select, table
+
+from .base import Base
+from .task import Task
+
+# FTS5 index over task titles and descriptions and project names. It is
+# not a mapped table: the DDL below creates it together with the rest of
+# the schema, and triggers on task and project keep it up to date, so
+# every write path (ORM, bulk and set-based statements) is covered.
+#
+# rowids are derived from the source row, even for tasks and odd for
+# projects, so the triggers find a row without scanning the index. Prefix
+# indexes keep search-as-you-type queries (the last word is a prefix)
+# from merging the posting lists of every word that starts the same way.
+#
+# owner_id is indexed too, so that a search matches ``owner_id : <id>``
+# along with its words and FTS5 only ever walks one user's documents.
+# The rank weights it 0, and only weights title and description.
+search_index = table(
+    "search_index",
+    column("rowid"),
+    column("title"),
+    column("description"),
+    column("kind"),
+    column("item_id"),
+    column("project_id"),
+    column("owner_id"),
+)
+
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5 (
+        title,
+        description,
+        kind UNINDEXED,
+        item_id UNINDEXED,
+        project_id UNINDEXED,
+        owner_id,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3 4'
+    )
+    """,
+    """
+    INSERT INTO search_index (search_index, rank)
+    VALUES ('rank', 'bm25(1.0, 1.0, 0.0, 0.0, 0.0, 0.0)')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_search_insert AFTER INSERT ON task
+    BEGIN
+        INSERT INTO search_index (
+            rowid, title, description, kind, item_id, project_id, owner_id
+        )
+        VALUES (
+            new.id * 2, new.title, new.description, 'task', new.id,
+            new.project_id, new.owner_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_search_update
+    AFTER UPDATE OF title, description, project_id, owner_id ON task
+    BEGIN
+        UPDATE search_index
+        SET title = new.title,
+            description = new.description,
+            project_id = new.project_id,
+            owner_id = new.owner_id
+        WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_search_delete AFTER DELETE ON task
+    BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_search_insert
+    AFTER INSERT ON project
+    BEGIN
+        INSERT INTO search_index (
+            rowid, title, kind, item_id, project_id, owner_id
+        )
+        VALUES (
+            new.id * 2 + 1, new.name, 'project', new.id, new.id,
+            new.owner_id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_search_update
+    AFTER UPDATE OF name, owner_id ON project
+    BEGIN
+        UPDATE search_index
+        SET title = new.name, owner_id = new.owner_id
+        WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS project_search_delete
+    AFTER DELETE ON project
+    BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+for statement in SEARCH_INDEX_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+
+# The triggers are dropped with their tables
+event.listen(
+    Base.metadata,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS search_index").execute_if(dialect="sqlite"),
+)
+
+
+def index_tasks(*conditions):
+    """Index the tasks matching ``conditions``.
+
+    What task_search_insert does row by row, in one statement, for tasks
+    inserted with the trigger dropped (see app.commands.import_data).
+    """
+    return search_index.insert().from_select(
+        [
+            "rowid",
+            "title",
+            "description",
+            "kind",
+            "item_id",
+            "project_id",
+            "owner_id",
+        ],
+        select(
+            Task.id * 2,
+            Task.title,
+            Task.description,
+            literal("task"),
+            Task.id,
+            Task.project_id,
+            Task.owner_id,
+        ).where(*conditions),
+    )
@@ -0,0 +1,64 @@
+from sqlalchemy import (
+    DDL,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    UniqueConstraint,
+    event,
+)
+
+from .base import Base
+
+
+class Tag(Base):
+    """Tag model."""
+
+    __table_args__ = (
+        # A user's tags by name
+        UniqueConstraint("owner_id", "name", name="uq_tag_owner_id_name"),
+    )
+
+    name = Column(String, nullable=False)
+    owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+
+
+task_tag = Table(
+    "task_tag",
+    Base.metadata,
+    Column(
+        "tag_id",
+        Integer,
+        ForeignKey("tag.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "task_id",
+        Integer,
+        ForeignKey("task.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    # Tags of a task
+    Index("ix_task_tag_task_id", "task_id"),
+)
+
+# Foreign keys are not enforced, so deleted tasks are untagged by a
+# trigger. It covers ORM, bulk and set-based deletes alike, and keeps a
+# reused task id from inheriting the tags of a deleted task.
+TASK_TAG_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_tag_delete AFTER DELETE ON task
+    BEGIN
+        DELETE FROM task_tag WHERE task_id = old.id;
+    END
+    """,
+]
+
+for statement in TASK_TAG_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
@@ -4,6 +4,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -17,6 +18,35 @@ from .status import Status
 class Task(Base):
     """Task model."""
 
+    __table_args__ = (
+        # Tasks of a project in due order
+        Index("ix_task_project_id_due_date", "project_id", "due_date"),
+        # Tasks of a project with a given status, in due order
+        Index(
+            "ix_task_project_id_status_due_date",
+            "project_id",
+            "status",
+            "due_date",
+        ),
+        # Tasks of a project by priority
+        Index("ix_task_project_id_priority", "project_id", "priority"),
+        # A user's tasks across projects, in due order or by priority
+        Index("ix_task_owner_id_due_date", "owner_id", "due_date"),
+        Index("ix_task_owner_id_priority", "owner_id", "priority"),
+        # A user's tasks changed since a point in their change sequence
+        Index("ix_task_owner_id_change_seq", "owner_id", "change_seq"),
+        # A user's tasks with a given status across projects, in due order
+        Index(
+            "ix_task_owner_id_status_due_date",
+            "owner_id",
+            "status",
+            "due_date",
+        ),
+        # A user's tasks created or completed in a date range (exports)
+        Index("ix_task_owner_id_created_at", "owner_id", "created_at"),
+        Index("ix_task_owner_id_completed_at", "owner_id", "completed_at"),
+    )
+
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(Enum(Status), default=Status.TODO, nullable=False)
@@ -24,9 +54,20 @@ class Task(Base):
     due_date = Column(DateTime, nullable=True)
     priority = Column(Integer, default=0, nullable=False)
 
-    project_id = Column(Integer, ForeignKey("project.id"), nullable=False)
+    project_id = Column(
+        Integer, ForeignKey("project.id"), index=True, nullable=False
+    )
     project = relationship("Project", back_populates="tasks")
 
     # Relationships
-    owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    owner_id = Column(
+        Integer, ForeignKey("user.id"), index=True, nullable=False
+    )
     owner = relationship("User", back_populates="tasks")
+
+    # When the task was marked done, NULL while it is not; set by the
+    # triggers in data_version.py
+    completed_at = Column(DateTime, nullable=True)
+
+    # Set by the triggers in data_version.py on every change
+    change_seq = Column(Integer, default=0, server_default="0", nullable=False)
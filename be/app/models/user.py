@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -11,6 +11,11 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    # The user's change sequence, bumped by the triggers in
+    # data_version.py on every change to the user's projects and tasks
+    data_version = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     # Relationships
     projects = relationship("Project", back_populates="owner")
@@ -1,15 +1,64 @@
-from .project import Project, ProjectCreate, ProjectUpdate
-from .task import Task, TaskCreate, TaskUpdate
-from .user import User, UserCreate, UserUpdate
+from .export import (
+    EXPORT_CSV_COLUMNS,
+    ImportList,
+    ProjectExport,
+    ProjectExportList,
+    ProjectImport,
+    ProjectImportList,
+    TaskExport,
+    TaskExportList,
+    TaskImport,
+    TaskImportList,
+)
+from .project import (
+    Project,
+    ProjectCreate,
+    ProjectList,
+    ProjectTreeNode,
+    ProjectUpdate,
+)
+from .search import SearchResult
+from .sync import SyncPage, Tombstone
+from .tag import Tag, TaskTags
+from .task import (
+    Task,
+    TaskBulkRequest,
+    TaskBulkResult,
+    TaskCreate,
+    TaskList,
+    TaskUpdate,
+)
+from .user import User, UserCreate, UserInDB, UserUpdate
 
 __all__ = [
+    "EXPORT_CSV_COLUMNS",
+    "ImportList",
     "Project",
     "ProjectCreate",
+    "ProjectExport",
+    "ProjectExportList",
+    "ProjectImport",
+    "ProjectImportList",
+    "ProjectList",
+    "ProjectTreeNode",
     "ProjectUpdate",
+    "SearchResult",
+    "SyncPage",
+    "Tag",
     "Task",
+    "TaskBulkRequest",
+    "TaskBulkResult",
     "TaskCreate",
+    "TaskExport",
+    "TaskExportList",
+    "TaskImport",
+    "TaskImportList",
+    "TaskList",
+    "TaskTags",
     "TaskUpdate",
+    "Tombstone",
     "User",
     "UserCreate",
+    "UserInDB",
     "UserUpdate",
 ]
@@ -0,0 +1,92 @@
+import json
+from datetime import datetime
+from typing import Annotated, Literal, Union
+
+from pydantic import Field, TypeAdapter, field_validator
+
+from .project import ProjectBase
+from .tag import normalize_tags
+from .task import TaskBase
+
+
+class ProjectExport(ProjectBase):
+    """Project as written by GET /export."""
+
+    kind: Literal["project"] = "project"
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class TaskExport(TaskBase):
+    """Task as written by GET /export, with its tags."""
+
+    kind: Literal["task"] = "task"
+    id: int
+    project_id: int
+    tags: list[str] = []
+    created_at: datetime
+    updated_at: datetime
+    completed_at: datetime | None = None
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def parse_tags(cls, tags):
+        """Read tags selected as a JSON array, and sort them."""
+        if isinstance(tags, str):
+            tags = json.loads(tags)
+        return sorted(tags)
+
+
+class ProjectImport(ProjectExport):
+    """Project read back by the import command; timestamps are optional."""
+
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class TaskImport(TaskExport):
+    """Task read back by the import command; timestamps are optional."""
+
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    @field_validator("tags")
+    @classmethod
+    def check_tags(cls, tags: list[str]) -> list[str]:
+        return normalize_tags(tags) if tags else tags
+
+
+# Validates a chunk of exported or imported rows at once
+ProjectExportList = TypeAdapter(list[ProjectExport])
+TaskExportList = TypeAdapter(list[TaskExport])
+ProjectImportList = TypeAdapter(list[ProjectImport])
+TaskImportList = TypeAdapter(list[TaskImport])
+ImportList = TypeAdapter(
+    list[
+        Annotated[
+            Union[ProjectImport, TaskImport], Field(discriminator="kind")
+        ]
+    ]
+)
+
+# Columns of a CSV export, which holds projects and tasks alike; a row
+# leaves the columns of the other kind empty
+EXPORT_CSV_COLUMNS = [
+    "kind",
+    "id",
+    "project_id",
+    "parent_id",
+    "name",
+    "title",
+    "description",
+    "status",
+    "is_flagged",
+    "is_inbox",
+    "due_date",
+    "priority",
+    "tags",
+    "created_at",
+    "updated_at",
+    "completed_at",
+]
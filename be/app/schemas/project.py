@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from app.models.status import Status
 
@@ -27,6 +27,7 @@ class ProjectUpdate(BaseModel):
     name: str | None = None
     description: str | None = None
     is_inbox: bool | None = None
+    parent_id: int | None = None
     status: Status | None = None
     is_flagged: bool | None = None
 
@@ -35,8 +36,27 @@ class Project(ProjectBase):
     """Project response schema."""
 
     id: int
+    todo_count: int = 0
+    done_count: int = 0
+    dropped_count: int = 0
+    deferred_count: int = 0
+    flagged_count: int = 0
+    # Only computed for project listings
+    overdue_count: int | None = None
 
     class Config:
         """Pydantic config."""
 
         from_attributes = True
+
+
+# Validates a whole listing at once, from rows of the response columns
+ProjectList = TypeAdapter(list[Project])
+
+
+class ProjectTreeNode(Project):
+    """Project hierarchy node schema."""
+
+    depth: int
+    task_count: int
+    children: list["ProjectTreeNode"] = []
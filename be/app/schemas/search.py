@@ -0,0 +1,14 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    """Search result schema."""
+
+    kind: Literal["task", "project"]
+    id: int
+    project_id: int
+    title: str
+    snippet: str
+    rank: float
@@ -0,0 +1,27 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from .project import Project
+from .task import Task
+
+
+class Tombstone(BaseModel):
+    """Deleted project or task schema."""
+
+    kind: Literal["task", "project"]
+    id: int
+
+
+class SyncPage(BaseModel):
+    """Changes after a sync cursor schema.
+
+    ``cursor`` is passed as ``since`` to get the next page, or the next
+    changes once ``has_more`` is false.
+    """
+
+    projects: list[Project]
+    tasks: list[Task]
+    deleted: list[Tombstone]
+    cursor: int
+    has_more: bool
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, field_validator
+
+from app.core.tag_query import normalize_tag
+
+
+class Tag(BaseModel):
+    """Tag response schema."""
+
+    id: int
+    name: str
+
+    class Config:
+        """Pydantic config."""
+
+        from_attributes = True
+
+
+class TaskTags(BaseModel):
+    """Tags of a task, written with or without the leading @."""
+
+    tags: list[str]
+
+    @field_validator("tags")
+    @classmethod
+    def normalize(cls, tags: list[str]) -> list[str]:
+        return normalize_tags(tags)
+
+
+def normalize_tags(tags: list[str]) -> list[str]:
+    """Normalize and sort tag names, rejecting invalid ones."""
+    names = sorted({normalize_tag(tag) for tag in tags})
+    for name in names:
+        if not name or any(c in name for c in " \t\n()@"):
+            raise ValueError(f"Invalid tag name: {name!r}")
+    return names
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Annotated, Literal, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 
 from app.models.status import Status
 
@@ -43,3 +44,52 @@ class Task(TaskBase):
         """Pydantic config."""
 
         from_attributes = True
+
+
+# Validates a whole listing at once, from rows of the response columns
+TaskList = TypeAdapter(list[Task])
+
+
+class TaskBulkCreate(TaskCreate):
+    """Bulk operation creating a task in a project."""
+
+    op: Literal["create"]
+    project_id: int
+
+
+class TaskBulkUpdate(TaskUpdate):
+    """Bulk operation updating a task of a project."""
+
+    op: Literal["update"]
+    project_id: int
+    id: int
+
+
+class TaskBulkDelete(BaseModel):
+    """Bulk operation deleting a task of a project."""
+
+    op: Literal["delete"]
+    project_id: int
+    id: int
+
+
+TaskBulkOperation = Annotated[
+    Union[TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete],
+    Field(discriminator="op"),
+]
+
+
+class TaskBulkRequest(BaseModel):
+    """Bulk task request schema."""
+
+    operations: list[TaskBulkOperation]
+
+
+class TaskBulkResult(BaseModel):
+    """Outcome of one bulk operation, in request order."""
+
+    op: Literal["create", "update", "delete"]
+    status_code: int
+    id: int | None = None
+    task: Task | None = None
+    detail: str | None = None
@@ -0,0 +1,17 @@
+"""Benchmark scripts.
+
+Run them from the ``be`` directory, e.g. ``python -m benchmarks.login_storm``.
+
+Benchmarks run the application in-process against a throwaway SQLite
+database. The database URL is redirected here, in the package itself, so
+that it happens before any script imports from ``app``.
+"""
+
+import os
+import tempfile
+
+BENCH_DIR = tempfile.mkdtemp(prefix="minifocus-bench-")
+DATABASE_PATH = os.path.join(BENCH_DIR, "bench.db")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", f"sqlite+aiosqlite:///{DATABASE_PATH}"
+)
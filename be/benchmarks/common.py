@@ -0,0 +1,62 @@
+"""Shared helpers for the benchmark scripts."""
+
+import math
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core import create_access_token, get_password_hash
+from app.db import AsyncSessionLocal, engine
+from app.main import app
+from app.models import Base, Project, User
+from benchmarks import BENCH_DIR, DATABASE_PATH  # noqa: F401
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def print_table(headers: list[str], rows: list[list]) -> None:
+    widths = [
+        max(len(str(cell)) for cell in column)
+        for column in zip(headers, *rows)
+    ]
+    for row in [headers, *rows]:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
+
+
+async def create_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def setup_user(email: str = "bench@example.com") -> tuple[User, str]:
+    """Create the schema, a user with an Inbox, and an access token."""
+    await create_schema()
+
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=email,
+            hashed_password=get_password_hash(PASSWORD),
+            is_active=True,
+            is_superuser=False,
+        )
+        session.add(user)
+        await session.flush()
+        session.add(Project(name="Inbox", is_inbox=True, owner_id=user.id))
+        await session.commit()
+
+    return user, create_access_token(user.id)
+
+
+def client(token: str | None = None) -> AsyncClient:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://bench",
+        headers=headers,
+    )
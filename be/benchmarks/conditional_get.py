@@ -0,0 +1,102 @@
+"""Polling unchanged listings with and without If-None-Match.
+
+Measures the project list and a large task listing as a polling client
+sees them: a full 200 response, and a 304 for a client that sends the
+ETag of its copy. Usage::
+
+    python -m benchmarks.conditional_get [--projects 1000] [--tasks 5000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import insert
+
+from app.db import AsyncSessionLocal
+from app.models import Project, Task
+from app.models.project_closure import LINK_PROJECT
+from benchmarks.common import client, percentile, print_table, setup_user
+
+
+async def populate(owner_id: int, projects: int, tasks: int) -> int:
+    """Insert top-level projects, the first of which gets ``tasks``
+    tasks. Returns the id of that project."""
+    async with AsyncSessionLocal() as session:
+        ids = await session.scalars(
+            insert(Project).returning(
+                Project.id, sort_by_parameter_order=True
+            ),
+            [
+                {"name": f"Project {i}", "owner_id": owner_id}
+                for i in range(projects)
+            ],
+        )
+        ids = ids.all()
+        # Core inserts bypass the ORM hooks that maintain the closure
+        await session.execute(
+            LINK_PROJECT,
+            [{"project_id": p, "parent_id": None} for p in ids],
+        )
+        await session.execute(
+            insert(Task),
+            [
+                {
+                    "title": f"Task {i}",
+                    "project_id": ids[0],
+                    "owner_id": owner_id,
+                }
+                for i in range(tasks)
+            ],
+        )
+        await session.commit()
+
+    return ids[0]
+
+
+async def main(projects: int, tasks: int, runs: int) -> None:
+    user, token = await setup_user()
+    project_id = await populate(user.id, projects, tasks)
+
+    rows = []
+    async with client(token) as http:
+        for url in [
+            "/api/v1/projects/",
+            f"/api/v1/projects/{project_id}/tasks/",
+        ]:
+            response = await http.get(url)
+            etag = response.headers["ETag"]
+            size = len(response.content)
+
+            for mode, headers, expected in [
+                ("200", {}, 200),
+                ("304", {"If-None-Match": etag}, 304),
+            ]:
+                timings = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    response = await http.get(url, headers=headers)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    assert response.status_code == expected
+
+                rows.append(
+                    [
+                        url,
+                        mode,
+                        size if expected == 200 else 0,
+                        f"{percentile(timings, 50):.2f}",
+                        f"{percentile(timings, 99):.2f}",
+                    ]
+                )
+
+    print(f"{projects} projects, {tasks} tasks in one of them")
+    print_table(["url", "status", "bytes", "p50 ms", "p99 ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.projects, args.tasks, args.runs))
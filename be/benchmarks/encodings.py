@@ -0,0 +1,83 @@
+"""Bytes on the wire and encode time of each list encoding and coding.
+
+Encodes a list of ``--items`` tasks and one of projects in each list
+encoding a client can ask for with Accept (JSON, columnar JSON,
+MessagePack), then compresses the result with each content coding
+(none, gzip, brotli) at the configured levels. A coding's time
+includes the encoding's. No database is involved. Usage::
+
+    python -m benchmarks.encodings [--items 1000]
+"""
+
+import argparse
+import time
+
+from pydantic import TypeAdapter
+
+from app.api.compression import ENCODERS
+from app.api.responses import dump_columns, dump_msgpack
+from app.schemas import ProjectList, TaskList
+from benchmarks.common import print_table
+from benchmarks.serialization import project, task
+
+ROUNDS = 5
+
+ENCODINGS = {
+    "json": lambda adapter, value: adapter.dump_json(value),
+    "columnar": dump_columns,
+    "msgpack": dump_msgpack,
+}
+
+
+def encode(adapter: TypeAdapter, value: list, encoding: str, coding: str):
+    body = ENCODINGS[encoding](adapter, value)
+    if coding != "identity":
+        body = ENCODERS[coding]().finish(body)
+
+    return body
+
+
+def best_of(adapter: TypeAdapter, value: list, encoding: str, coding: str):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        body = encode(adapter, value, encoding, coding)
+        timings.append(time.perf_counter() - start)
+
+    return len(body), min(timings)
+
+
+def main(items: int) -> None:
+    cases = [
+        ("tasks", TaskList, [task(i) for i in range(items)]),
+        ("projects", ProjectList, [project(i) for i in range(items)]),
+    ]
+
+    rows = []
+    for name, adapter, value in cases:
+        baseline = None
+        for encoding in ENCODINGS:
+            for coding in ["identity", *ENCODERS]:
+                size, seconds = best_of(adapter, value, encoding, coding)
+                baseline = baseline or size
+                rows.append(
+                    [
+                        name,
+                        encoding,
+                        coding,
+                        f"{size / 1024:.1f}",
+                        f"{size / baseline:.0%}",
+                        f"{seconds * 1000:.2f}",
+                    ]
+                )
+
+    print_table(
+        ["list", "encoding", "coding", "KiB", "of json", "encode ms"], rows
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.items)
@@ -0,0 +1,201 @@
+"""Holding many idle GET /events connections.
+
+Opens ``--connections`` event streams, two per user, and reports what
+they cost while idle (allocated memory per connection, CPU time of a
+round of keep-alives, and the latency of an ordinary write with and
+without them open), and how long one event for every user takes to
+reach all of them. Streams are driven over
+ASGI directly, so the numbers are the application's share of a
+connection, without a server's sockets and buffers. Usage::
+
+    python -m benchmarks.events [--connections 1000 5000 10000]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+
+from app.config.settings import settings
+from app.core import create_access_token, event_broker
+from app.db import AsyncSessionLocal
+from app.main import app
+from app.models import User
+from benchmarks.common import client, percentile, print_table, setup_user
+
+BATCH_USERS = 250
+
+# Keep-alives are sent every 15 s by default; more often here, to measure
+# what one round of them costs
+HEARTBEAT_SECONDS = 1.0
+IDLE_ROUNDS = 3
+FAN_OUT_ROUNDS = 5
+settings.EVENT_HEARTBEAT_SECONDS = HEARTBEAT_SECONDS
+
+
+class Streams:
+    """Event stream requests, counting the events they receive."""
+
+    def __init__(self):
+        self.tasks: list[asyncio.Task] = []
+        self.started = 0
+        self.received = 0
+        self.keepalives = 0
+        self.counter, self.target = "started", 0
+        self.done = asyncio.Event()
+        self.disconnected = asyncio.Event()
+
+    def open(self, token: str) -> None:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/v1/events",
+            "raw_path": b"/api/v1/events",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"bench"),
+                (b"authorization", f"Bearer {token}".encode()),
+            ],
+            "client": ("bench", 1),
+            "server": ("bench", 80),
+        }
+        self.tasks.append(
+            asyncio.create_task(app(scope, self.receive, self.send))
+        )
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.started += 1
+        elif message["body"].startswith(b":"):
+            self.keepalives += 1
+        else:
+            self.received += 1
+        if getattr(self, self.counter) >= self.target:
+            self.done.set()
+
+    async def wait(self, counter: str, target: int) -> None:
+        """Wait until ``counter`` reaches ``target``."""
+        self.counter, self.target = counter, target
+        self.done.clear()
+        if getattr(self, counter) < target:
+            await self.done.wait()
+
+    async def close(self) -> None:
+        self.disconnected.set()
+        await asyncio.gather(*self.tasks)
+
+
+async def create_users(prefix: str, count: int) -> list[int]:
+    async with AsyncSessionLocal() as session:
+        ids = await session.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {"email": f"{prefix}{i}@example.com", "hashed_password": "x"}
+                for i in range(count)
+            ],
+        )
+        ids = ids.all()
+        await session.commit()
+
+    return ids
+
+
+async def write_latency(token: str, requests: int = 200) -> float:
+    """p50 of creating a project, in ms."""
+    timings = []
+    async with client(token) as http:
+        for i in range(requests):
+            start = time.perf_counter()
+            await http.post("/api/v1/projects/", json={"name": f"P{i}"})
+            timings.append((time.perf_counter() - start) * 1000)
+
+    return percentile(timings, 50)
+
+
+async def measure(connections: int, token: str, baseline: float) -> list:
+    users = await create_users(f"user{connections}-", connections // 2)
+    tokens = [create_access_token(user_id) for user_id in users]
+
+    streams = Streams()
+    # Clients connect a batch at a time rather than all at once, so their
+    # first requests don't all queue for the user lookup. Memory is only
+    # traced for the first batch, as tracing slows everything down.
+    for i in range(0, len(tokens), BATCH_USERS):
+        if i == 0:
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+        for token_ in tokens[i : i + BATCH_USERS]:
+            streams.open(token_)
+            streams.open(token_)
+        await streams.wait("started", len(streams.tasks))
+        if i == 0:
+            memory = tracemalloc.get_traced_memory()[0] - before
+            memory /= len(streams.tasks)
+            tracemalloc.stop()
+    assert event_broker.stats()["subscriptions"] == connections
+
+    # Idle: nothing but keep-alive comments
+    start, keepalives = time.process_time(), streams.keepalives
+    await asyncio.sleep(IDLE_ROUNDS * HEARTBEAT_SECONDS)
+    idle_cpu = (time.process_time() - start) / IDLE_ROUNDS
+    assert streams.keepalives - keepalives >= connections
+
+    idle_write = await write_latency(token)
+
+    fan_outs = []
+    for _ in range(FAN_OUT_ROUNDS):
+        start = time.perf_counter()
+        for user_id in users:
+            event_broker.publish(user_id, "task.updated", id=1, project_id=1)
+        await streams.wait("received", streams.received + connections)
+        fan_outs.append((time.perf_counter() - start) * 1000)
+
+    await streams.close()
+    assert event_broker.stats()["subscriptions"] == 0
+
+    return [
+        connections,
+        f"{memory / 1024:.1f}",
+        f"{idle_cpu * 1000:.0f}",
+        f"{baseline:.2f}",
+        f"{idle_write:.2f}",
+        f"{percentile(fan_outs, 50):.0f}",
+    ]
+
+
+async def main(connections: list[int]) -> None:
+    _, token = await setup_user()
+    baseline = await write_latency(token)
+
+    rows = [await measure(count, token, baseline) for count in connections]
+
+    print_table(
+        [
+            "connections",
+            "KiB/conn",
+            "CPU ms/heartbeat",
+            "write ms (none)",
+            "write ms (open)",
+            "event to all ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--connections", type=int, nargs="+", default=[1000, 5000, 10000]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.connections))
@@ -0,0 +1,134 @@
+"""Exporting a user's data with GET /export's keyset chunks.
+
+Exports ``--tasks`` tasks of one user (half of them done) as NDJSON and
+CSV, in full and limited to the completed ones, and reports rows per
+second, the slowest chunk (the longest any read transaction is held
+open) and the peak memory allocated while exporting. Chunk times stay
+flat however far into the export a chunk is. Usage::
+
+    python -m benchmarks.export [--tasks 100000 1000000]
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import delete, insert
+
+from app.api.endpoints.export import export_queries, export_rows
+from app.api.filters import ExportFilters
+from app.db import AsyncSessionLocal, ReadSessionLocal
+from app.models import Project, Status
+from app.models import Task as TaskModel
+from benchmarks.common import print_table, setup_user
+
+CHUNK = 50000
+
+
+async def populate(owner_id: int, tasks: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(TaskModel))
+        project = Project(name="Project", owner_id=owner_id)
+        session.add(project)
+        await session.flush()
+        for start in range(0, tasks, CHUNK):
+            await session.execute(
+                insert(TaskModel),
+                [
+                    {
+                        "title": f"Task {i}",
+                        "description": "A task to export",
+                        "status": Status.DONE if i % 2 else Status.TODO,
+                        "project_id": project.id,
+                        "owner_id": owner_id,
+                    }
+                    for i in range(start, min(tasks, start + CHUNK))
+                ],
+            )
+        await session.commit()
+
+
+async def run_export(owner_id: int, filters: ExportFilters, format: str):
+    """Lines and bytes exported, and the time of the slowest chunk."""
+    lines, size, slowest = 0, 0, 0.0
+    chunks = export_rows(
+        ReadSessionLocal, export_queries(owner_id, filters), format
+    )
+    while True:
+        start = time.perf_counter()
+        chunk = await anext(chunks, None)
+        if chunk is None:
+            return lines, size, slowest
+        slowest = max(slowest, time.perf_counter() - start)
+        lines += chunk.count(b"\n")
+        size += len(chunk)
+
+
+async def measure(owner_id: int, filters: ExportFilters, format: str):
+    gc.collect()
+    start = time.perf_counter()
+    lines, size, slowest = await run_export(owner_id, filters, format)
+    elapsed = time.perf_counter() - start
+
+    # Again, for the memory, as tracing slows everything down
+    gc.collect()
+    tracemalloc.start()
+    await run_export(owner_id, filters, format)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return [
+        lines,
+        f"{lines / elapsed:,.0f}",
+        f"{size / 2**20:,.0f}",
+        f"{slowest * 1000:.1f}",
+        f"{peak / 2**20:.1f}",
+    ]
+
+
+async def main(sizes: list[int]) -> None:
+    user, _ = await setup_user()
+
+    cases = {
+        "all": ExportFilters(),
+        "completed": ExportFilters(completed_after=datetime(2000, 1, 1)),
+    }
+    table = []
+    for tasks in sizes:
+        await populate(user.id, tasks)
+        for name, filters in cases.items():
+            for format in ["ndjson", "csv"]:
+                table.append(
+                    [
+                        tasks,
+                        name,
+                        format,
+                        *await measure(user.id, filters, format),
+                    ]
+                )
+
+    print_table(
+        [
+            "tasks",
+            "export",
+            "format",
+            "lines",
+            "lines/s",
+            "MiB",
+            "slowest chunk ms",
+            "peak MiB",
+        ],
+        table,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tasks", type=int, nargs="+", default=[100000, 1000000]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks))
@@ -0,0 +1,168 @@
+"""Importing an export with app.commands.import_data.
+
+Writes an export of ``--tasks`` tasks (half of them done, a third tagged)
+in 100 projects, as NDJSON and as CSV, imports each into an empty
+database, and reports tasks per second, the slowest chunk (the longest
+the server's writers wait for the write lock) and whether the project
+counters came out right. Usage::
+
+    python -m benchmarks.import_data [--tasks 100000 1000000]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
+from app.commands.import_data import import_chunks, read_records
+from app.commands.repair_counters import repair_counters
+from app.config.settings import settings
+from app.db import AsyncSessionLocal
+from app.models import ImportJob, Project, Tag
+from app.models import Task as TaskModel
+from app.models import project_closure
+from app.schemas import EXPORT_CSV_COLUMNS
+from benchmarks.common import BENCH_DIR, print_table, setup_user
+
+PROJECTS = 100
+
+
+def export_items(tasks: int):
+    now = datetime.now().isoformat()
+    for i in range(PROJECTS):
+        yield {
+            "kind": "project",
+            "id": i + 1,
+            "name": f"Project {i}",
+            # Ten top-level projects with nine children each
+            "parent_id": None if i % 10 == 0 else i - i % 10 + 1,
+            "status": "todo",
+            "is_flagged": False,
+            "is_inbox": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+    for i in range(tasks):
+        done = i % 2 == 1
+        yield {
+            "kind": "task",
+            "id": PROJECTS + i + 1,
+            "project_id": i % PROJECTS + 1,
+            "title": f"Task {i}",
+            "description": "A task to import",
+            "status": "done" if done else "todo",
+            "is_flagged": i % 7 == 0,
+            "priority": i % 4,
+            "tags": ["errands", "phone"] if i % 3 == 0 else [],
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": now if done else None,
+        }
+
+
+def write_export(tasks: int, format: str) -> str:
+    path = os.path.join(BENCH_DIR, f"export.{format}")
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        if format == "csv":
+            writer = csv.DictWriter(file, EXPORT_CSV_COLUMNS)
+            writer.writeheader()
+            for item in export_items(tasks):
+                writer.writerow(
+                    {**item, "tags": " ".join(item.get("tags", []))}
+                )
+        else:
+            for item in export_items(tasks):
+                file.write(json.dumps(item) + "\n")
+
+    return path
+
+
+async def clear(owner_id: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(TaskModel))
+        await session.execute(delete(Tag))
+        await session.execute(
+            delete(Project).where(
+                Project.owner_id == owner_id, ~Project.is_inbox
+            )
+        )
+        # Project ids are reused, so their links must go too
+        await session.execute(
+            delete(project_closure).where(
+                project_closure.c.descendant_id.not_in(select(Project.id))
+            )
+        )
+        await session.commit()
+
+
+async def measure(owner_id: int, tasks: int, format: str) -> list:
+    path = write_export(tasks, format)
+    await clear(owner_id)
+    async with AsyncSessionLocal() as session:
+        job = ImportJob(owner_id=owner_id, source=path)
+        session.add(job)
+        await session.commit()
+
+    slowest = 0.0
+    start = time.perf_counter()
+    with open(path, newline="", encoding="utf-8") as file:
+        chunks = import_chunks(
+            AsyncSessionLocal,
+            job,
+            read_records(file, format),
+            format,
+            settings.IMPORT_CHUNK_SIZE,
+        )
+        while True:
+            chunk_start = time.perf_counter()
+            if await anext(chunks, None) is None:
+                break
+            slowest = max(slowest, time.perf_counter() - chunk_start)
+    elapsed = time.perf_counter() - start
+
+    async with AsyncSessionLocal() as session:
+        drift = await repair_counters(session, dry_run=True)
+
+    return [
+        tasks,
+        format,
+        job.tasks_imported,
+        f"{job.tasks_imported / elapsed:,.0f}",
+        f"{slowest * 1000:,.0f}",
+        "ok" if not drift else f"{len(drift)} wrong",
+    ]
+
+
+async def main(sizes: list[int]) -> None:
+    user, _ = await setup_user()
+
+    table = []
+    for tasks in sizes:
+        for format in ["ndjson", "csv"]:
+            table.append(await measure(user.id, tasks, format))
+
+    print_table(
+        [
+            "tasks",
+            "format",
+            "imported",
+            "tasks/s",
+            "slowest chunk ms",
+            "counters",
+        ],
+        table,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tasks", type=int, nargs="+", default=[100000, 1000000]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks))
@@ -0,0 +1,126 @@
+"""Loading a task listing as ORM instances or as rows.
+
+Compares the two ways of turning a project's tasks into response models:
+loading ORM instances into the session and validating each one, as the
+list endpoints used to, and selecting only the response columns as rows
+validated in one TypeAdapter call, as they do now. Reports rows per
+second and the peak memory allocated while loading. Usage::
+
+    python -m benchmarks.list_rows [--rows 10000 100000 1000000]
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from sqlalchemy import insert, select
+
+from app.api.rows import TASK_COLUMNS
+from app.db import AsyncSessionLocal
+from app.models import Project
+from app.models import Task as TaskModel
+from app.schemas import Task, TaskList
+from benchmarks.common import print_table, setup_user
+
+CHUNK = 50000
+
+
+async def populate(owner_id: int, tasks: int) -> int:
+    async with AsyncSessionLocal() as session:
+        project = Project(name="Project", owner_id=owner_id)
+        session.add(project)
+        await session.flush()
+        for start in range(0, tasks, CHUNK):
+            await session.execute(
+                insert(TaskModel),
+                [
+                    {
+                        "title": f"Task {i}",
+                        "description": "A task to list",
+                        "project_id": project.id,
+                        "owner_id": owner_id,
+                    }
+                    for i in range(start, min(tasks, start + CHUNK))
+                ],
+            )
+        await session.commit()
+
+    return project.id
+
+
+async def load_instances(project_id: int, rows: int) -> list[Task]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(TaskModel)
+            .where(TaskModel.project_id == project_id)
+            .order_by(TaskModel.id)
+            .limit(rows)
+        )
+        return [Task.model_validate(task) for task in result.scalars()]
+
+
+async def load_rows(project_id: int, rows: int) -> list[Task]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(*TASK_COLUMNS)
+            .where(TaskModel.project_id == project_id)
+            .order_by(TaskModel.id)
+            .limit(rows)
+        )
+        return TaskList.validate_python(result.mappings().all())
+
+
+async def measure(load, project_id: int, rows: int) -> list:
+    gc.collect()
+    start = time.perf_counter()
+    tasks = await load(project_id, rows)
+    elapsed = time.perf_counter() - start
+    assert len(tasks) == rows
+    del tasks
+
+    # Again, for the memory, as tracing slows everything down
+    gc.collect()
+    tracemalloc.start()
+    tasks = await load(project_id, rows)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del tasks
+
+    return [f"{rows / elapsed:,.0f}", f"{peak / 2**20:,.0f}"]
+
+
+async def main(sizes: list[int]) -> None:
+    user, _ = await setup_user()
+    project_id = await populate(user.id, max(sizes))
+
+    table = []
+    for rows in sizes:
+        table.append(
+            [
+                rows,
+                *await measure(load_instances, project_id, rows),
+                *await measure(load_rows, project_id, rows),
+            ]
+        )
+
+    print_table(
+        [
+            "rows",
+            "ORM rows/s",
+            "ORM peak MiB",
+            "row rows/s",
+            "row peak MiB",
+        ],
+        table,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.rows))
@@ -0,0 +1,74 @@
+"""Latency of unrelated GETs while a burst of logins is running.
+
+Compares bcrypt running inline on the event loop against the bounded
+worker pool. Usage::
+
+    python -m benchmarks.login_storm [--logins 64] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core import BoundedExecutor, security
+from benchmarks.common import (
+    PASSWORD,
+    client,
+    percentile,
+    print_table,
+    setup_user,
+)
+
+
+async def measure(token: str, email: str, logins: int) -> list:
+    latencies: list[float] = []
+    rejected = 0
+
+    async with client() as anonymous, client(token) as authed:
+
+        async def login():
+            nonlocal rejected
+            response = await anonymous.post(
+                "/api/v1/auth/login",
+                data={"username": email, "password": PASSWORD},
+            )
+            rejected += response.status_code == 503
+
+        storm = asyncio.gather(*(login() for _ in range(logins)))
+        while not storm.done():
+            start = time.perf_counter()
+            await authed.get("/api/v1/auth/me")
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.001)
+        await storm
+
+    return [
+        len(latencies),
+        f"{percentile(latencies, 50):.1f}",
+        f"{percentile(latencies, 99):.1f}",
+        f"{max(latencies):.1f}",
+        rejected,
+    ]
+
+
+async def main(logins: int, workers: int) -> None:
+    user, token = await setup_user()
+
+    rows = []
+    for kind in ("inline", "thread"):
+        security.password_executor = BoundedExecutor(
+            kind, max_workers=workers, queue_size=logins
+        )
+        rows.append([kind, *await measure(token, user.email, logins)])
+        security.password_executor.shutdown()
+
+    print(f"{logins} concurrent logins, GET /auth/me latency (ms)")
+    print_table(["executor", "gets", "p50", "p99", "max", "503s"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.workers))
@@ -0,0 +1,143 @@
+"""Cascading a status change and a delete through a large project subtree.
+
+Compares the set-based ``?cascade=true`` modes of the project endpoints
+against doing the same through the ORM, which loads every descendant
+project and task first. Usage::
+
+    python -m benchmarks.project_cascade [--tasks 100000] [--children 100]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import insert, select
+
+from app.db import AsyncSessionLocal
+from app.models import Project, Status, Task
+from app.models.project_closure import LINK_PROJECT, subtree_ids
+from benchmarks.common import client, print_table, setup_user
+
+
+async def populate(owner_id: int, tasks: int, children: int) -> int:
+    """Insert a root project with ``children`` sub-projects that share
+    ``tasks`` tasks between them. Returns the id of the root."""
+    async with AsyncSessionLocal() as session:
+        root = Project(name="Root", owner_id=owner_id)
+        session.add(root)
+        await session.flush()
+
+        ids = await session.scalars(
+            insert(Project).returning(
+                Project.id, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "name": f"Child {i}",
+                    "parent_id": root.id,
+                    "owner_id": owner_id,
+                }
+                for i in range(children)
+            ],
+        )
+        ids = ids.all()
+        # Core inserts bypass the ORM hooks that maintain the closure
+        await session.execute(
+            LINK_PROJECT,
+            [{"project_id": i, "parent_id": root.id} for i in ids],
+        )
+        await session.execute(
+            insert(Task),
+            [
+                {
+                    "title": f"Task {i}",
+                    "project_id": ids[i % children],
+                    "owner_id": owner_id,
+                }
+                for i in range(tasks)
+            ],
+        )
+        await session.commit()
+
+        return root.id
+
+
+async def timed(run) -> list:
+    tracemalloc.start()
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return [f"{elapsed * 1000:.0f}", f"{peak / 2**20:.1f}"]
+
+
+async def main(tasks: int, children: int) -> None:
+    user, token = await setup_user()
+    rows = []
+
+    async with client(token) as http:
+        root_id = await populate(user.id, tasks, children)
+
+        async def orm_update():
+            async with AsyncSessionLocal() as session:
+                subtree = subtree_ids(root_id)
+                for model, column in (
+                    (Project, Project.id),
+                    (Task, Task.project_id),
+                ):
+                    result = await session.scalars(
+                        select(model).where(column.in_(subtree))
+                    )
+                    for row in result:
+                        row.status = Status.DONE
+                await session.commit()
+
+        async def cascade_update():
+            response = await http.put(
+                f"/api/v1/projects/{root_id}",
+                params={"cascade": True},
+                json={"status": "dropped"},
+            )
+            response.raise_for_status()
+
+        rows.append(["update", "ORM", *await timed(orm_update)])
+        rows.append(["update", "cascade", *await timed(cascade_update)])
+
+        async def orm_delete():
+            async with AsyncSessionLocal() as session:
+                subtree = subtree_ids(root_id)
+                for model, column in (
+                    (Task, Task.project_id),
+                    (Project, Project.id),
+                ):
+                    result = await session.scalars(
+                        select(model).where(column.in_(subtree))
+                    )
+                    for row in result:
+                        await session.delete(row)
+                    await session.flush()
+                await session.commit()
+
+        async def cascade_delete():
+            response = await http.delete(
+                f"/api/v1/projects/{root_id}", params={"cascade": True}
+            )
+            response.raise_for_status()
+
+        rows.append(["delete", "ORM", *await timed(orm_delete)])
+        root_id = await populate(user.id, tasks, children)
+        rows.append(["delete", "cascade", *await timed(cascade_delete)])
+
+    print(f"{children} sub-projects, {tasks} tasks")
+    print_table(["operation", "mode", "ms", "peak MiB"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--children", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.children))
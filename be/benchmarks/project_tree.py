@@ -0,0 +1,110 @@
+"""Loading a deep project hierarchy with its task counts.
+
+Compares ``GET /projects/tree`` against what the frontend did before it:
+the flat project list followed by one task listing per project. Usage::
+
+    python -m benchmarks.project_tree [--projects 10000] [--fanout 10]
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import insert
+
+from app.db import AsyncSessionLocal
+from app.models import Project, Task
+from app.models.project_closure import LINK_PROJECT
+from benchmarks.common import client, print_table, setup_user
+
+
+async def populate(owner_id: int, projects: int, fanout: int) -> int:
+    """Insert ``projects`` projects, ``fanout`` children per parent, with
+    one task in every project. Returns the depth of the hierarchy."""
+    async with AsyncSessionLocal() as session:
+        level = [None]
+        created = depth = 0
+        while created < projects:
+            rows = [
+                {
+                    "name": f"Project {created + i}",
+                    "parent_id": parent,
+                    "owner_id": owner_id,
+                }
+                for i, parent in enumerate(
+                    p for p in level for _ in range(fanout)
+                )
+            ][: projects - created]
+            ids = await session.scalars(
+                insert(Project).returning(
+                    Project.id, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+            level = ids.all()
+            # Core inserts bypass the ORM hooks that maintain the closure
+            await session.execute(
+                LINK_PROJECT,
+                [
+                    {"project_id": p, "parent_id": row["parent_id"]}
+                    for p, row in zip(level, rows)
+                ],
+            )
+            created += len(level)
+            depth += 1
+            await session.execute(
+                insert(Task),
+                [
+                    {"title": "Task", "project_id": p, "owner_id": owner_id}
+                    for p in level
+                ],
+            )
+        await session.commit()
+
+    return depth
+
+
+async def measure(name: str, load, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        requests = await load()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return [name, requests, f"{min(timings):.0f}", f"{max(timings):.0f}"]
+
+
+async def main(projects: int, fanout: int, runs: int) -> None:
+    user, token = await setup_user()
+    depth = await populate(user.id, projects, fanout)
+
+    async with client(token) as http:
+
+        async def tree():
+            response = await http.get("/api/v1/projects/tree")
+            response.raise_for_status()
+            return 1
+
+        async def flat():
+            response = await http.get("/api/v1/projects/")
+            response.raise_for_status()
+            for project in response.json():
+                await http.get(f"/api/v1/projects/{project['id']}/tasks/")
+            return 1 + len(response.json())
+
+        rows = [
+            await measure("GET /projects/tree", tree, runs),
+            await measure("list + tasks per project", flat, 1),
+        ]
+
+    print(f"{projects} projects, fanout {fanout}, depth {depth}")
+    print_table(["approach", "requests", "min ms", "max ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.projects, args.fanout, args.runs))
@@ -0,0 +1,142 @@
+"""Full-text search latency on a large task corpus.
+
+Compares ``GET /search`` (FTS5) against the ``LIKE '%term%'`` query it
+replaces, for frequent, rare, multi-word and prefix queries. Usage::
+
+    python -m benchmarks.search [--tasks 1000000] [--runs 20]
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+from sqlalchemy import func, insert, or_, select
+
+from app.db import AsyncSessionLocal
+from app.models import Project, Task
+from benchmarks.common import client, percentile, print_table, setup_user
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "su", "ta", "ri", "po", "de", "vu"]
+
+
+def vocabulary(size: int) -> list[str]:
+    rng = random.Random(0)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+async def populate(
+    owner_id: int, tasks: int, words: list[str], batch: int = 20000
+) -> None:
+    rng = random.Random(1)
+    # Zipf-like word frequencies, as in natural text
+    weights = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(len(words)))
+    )
+
+    def text(n: int) -> str:
+        return " ".join(rng.choices(words, cum_weights=weights, k=n))
+
+    async with AsyncSessionLocal() as session:
+        project = Project(name="Corpus", owner_id=owner_id)
+        session.add(project)
+        await session.flush()
+
+        for start in range(0, tasks, batch):
+            await session.execute(
+                insert(Task),
+                [
+                    {
+                        "title": text(rng.randint(2, 6)),
+                        "description": text(rng.randint(0, 15)) or None,
+                        "project_id": project.id,
+                        "owner_id": owner_id,
+                    }
+                    for _ in range(min(batch, tasks - start))
+                ],
+            )
+        await session.commit()
+
+
+async def measure_like(term: str, runs: int) -> list[float]:
+    pattern = f"%{term}%"
+    timings = []
+    async with AsyncSessionLocal() as session:
+        for _ in range(runs):
+            start = time.perf_counter()
+            await session.execute(
+                select(Task.id, Task.title)
+                .where(
+                    or_(
+                        Task.title.like(pattern),
+                        Task.description.like(pattern),
+                    )
+                )
+                .limit(20)
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def main(tasks: int, runs: int) -> None:
+    user, token = await setup_user()
+    words = vocabulary(5000)
+
+    start = time.perf_counter()
+    await populate(user.id, tasks, words)
+    print(f"indexed {tasks} tasks in {time.perf_counter() - start:.1f} s")
+
+    async with AsyncSessionLocal() as session:
+        indexed = await session.scalar(select(func.count()).select_from(Task))
+    assert indexed == tasks
+
+    queries = {
+        "frequent": words[0],
+        "rare": words[-1],
+        "two words": f"{words[1]} {words[40]}",
+        "prefix": words[10][:3],
+    }
+
+    rows = []
+    async with client(token) as http:
+        for name, q in queries.items():
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                response = await http.get("/api/v1/search", params={"q": q})
+                timings.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            rows.append(
+                [
+                    name,
+                    "fts5",
+                    len(response.json()),
+                    f"{percentile(timings, 50):.1f}",
+                    f"{percentile(timings, 99):.1f}",
+                ]
+            )
+
+            timings = await measure_like(q.split()[0], max(1, runs // 10))
+            rows.append(
+                [
+                    name,
+                    "like",
+                    "",
+                    f"{percentile(timings, 50):.1f}",
+                    f"{percentile(timings, 99):.1f}",
+                ]
+            )
+
+    print_table(["query", "method", "hits", "p50 ms", "p99 ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.runs))
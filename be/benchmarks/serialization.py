@@ -0,0 +1,156 @@
+"""Serializing responses of each schema, as FastAPI did and as JSONRoute does.
+
+For a list of ``--items`` responses of each response schema in
+app.schemas, compares the default pipeline (validate, dump to
+JSON-compatible Python objects, encode with the json module as
+JSONResponse does) with validating and dumping straight to bytes with
+pydantic-core. Endpoints return validated instances, so that is what
+is serialized. No database is involved. Usage::
+
+    python -m benchmarks.serialization [--items 10000]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+from app.models.status import Status
+from app.schemas import (
+    Project,
+    ProjectTreeNode,
+    SearchResult,
+    SyncPage,
+    Tag,
+    Task,
+    TaskBulkResult,
+    TaskTags,
+    Tombstone,
+    User,
+)
+from benchmarks.common import print_table
+
+ROUNDS = 5
+
+
+def task(i: int) -> Task:
+    return Task(
+        id=i,
+        project_id=1,
+        title=f"Task {i}",
+        description="Call the plumber about the kitchen sink",
+        status=Status.TODO,
+        is_flagged=i % 2 == 0,
+        due_date=datetime(2024, 1, 1, 9, 30),
+        priority=i % 4,
+    )
+
+
+def project(i: int) -> Project:
+    return Project(id=i, name=f"Project {i}", todo_count=i, overdue_count=1)
+
+
+def samples(i: int) -> dict:
+    """One response of each schema."""
+    return {
+        "Task": task(i),
+        "Project": project(i),
+        "ProjectTreeNode": ProjectTreeNode(
+            **project(i).model_dump(), depth=1, task_count=i
+        ),
+        "Tag": Tag(id=i, name=f"tag{i}"),
+        "TaskTags": TaskTags(tags=["errands", "phone", f"tag{i}"]),
+        "SearchResult": SearchResult(
+            kind="task",
+            id=i,
+            project_id=1,
+            title=f"Task {i}",
+            snippet="Call the [plumber] about the kitchen sink",
+            rank=-1.5,
+        ),
+        "Tombstone": Tombstone(kind="task", id=i),
+        "TaskBulkResult": TaskBulkResult(
+            op="update", status_code=200, id=i, task=task(i)
+        ),
+        "User": User(id=i, email=f"user{i}@example.com", is_superuser=False),
+    }
+
+
+def stdlib(adapter: TypeAdapter, value) -> bytes:
+    value = adapter.validate_python(value, from_attributes=True)
+    content = adapter.dump_python(value, mode="json")
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def pydantic_core(adapter: TypeAdapter, value) -> bytes:
+    value = adapter.validate_python(value, from_attributes=True)
+    return adapter.dump_json(value)
+
+
+def best_of(serialize, adapter: TypeAdapter, value) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        serialize(adapter, value)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main(items: int) -> None:
+    responses: dict[str, list] = {}
+    for i in range(items):
+        for name, sample in samples(i).items():
+            responses.setdefault(name, []).append(sample)
+
+    cases = [
+        (name, TypeAdapter(list[type(values[0])]), values)
+        for name, values in responses.items()
+    ]
+    # A sync page is one object holding many
+    cases.append(
+        (
+            "SyncPage",
+            TypeAdapter(SyncPage),
+            SyncPage(
+                projects=responses["Project"],
+                tasks=responses["Task"],
+                deleted=responses["Tombstone"],
+                cursor=items,
+                has_more=False,
+            ),
+        )
+    )
+
+    rows = []
+    for name, adapter, value in cases:
+        assert json.loads(stdlib(adapter, value)) == json.loads(
+            pydantic_core(adapter, value)
+        )
+        before = best_of(stdlib, adapter, value)
+        after = best_of(pydantic_core, adapter, value)
+        rows.append(
+            [
+                name,
+                f"{before * 1000:.1f}",
+                f"{after * 1000:.1f}",
+                f"{before / after:.1f}x",
+            ]
+        )
+
+    print_table(["schema", "json ms", "pydantic-core ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000)
+    args = parser.parse_args()
+    main(args.items)
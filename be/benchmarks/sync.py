@@ -0,0 +1,103 @@
+"""Refreshing a client after a few changes to a large dataset.
+
+Compares a delta sync from the client's last cursor against what a
+client did before: downloading every project and task again. Usage::
+
+    python -m benchmarks.sync [--tasks 100000] [--changes 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import insert
+
+from app.db import AsyncSessionLocal
+from app.models import Project, Task
+from benchmarks.common import client, print_table, setup_user
+
+
+async def populate(owner_id: int, tasks: int) -> int:
+    async with AsyncSessionLocal() as session:
+        project = Project(name="Project", owner_id=owner_id)
+        session.add(project)
+        await session.flush()
+        await session.execute(
+            insert(Task),
+            [
+                {
+                    "title": f"Task {i}",
+                    "project_id": project.id,
+                    "owner_id": owner_id,
+                }
+                for i in range(tasks)
+            ],
+        )
+        await session.commit()
+
+    return project.id
+
+
+async def timed(load) -> list:
+    start = time.perf_counter()
+    requests, rows, _ = await load()
+    return [requests, rows, f"{(time.perf_counter() - start) * 1000:.0f}"]
+
+
+async def main(tasks: int, changes: int) -> None:
+    user, token = await setup_user()
+    project_id = await populate(user.id, tasks)
+
+    async with client(token) as http:
+
+        async def sync_all(since=0):
+            requests = rows = 0
+            has_more = True
+            while has_more:
+                response = await http.get(
+                    "/api/v1/sync", params={"since": since, "limit": 1000}
+                )
+                page = response.json()
+                requests += 1
+                rows += sum(
+                    len(page[k]) for k in ["projects", "tasks", "deleted"]
+                )
+                since, has_more = page["cursor"], page["has_more"]
+            return requests, rows, since
+
+        async def download_all():
+            response = await http.get("/api/v1/projects/")
+            projects = response.json()
+            rows = len(projects)
+            for project in projects:
+                response = await http.get(
+                    f"/api/v1/projects/{project['id']}/tasks/"
+                )
+                rows += len(response.json())
+            return 1 + len(projects), rows, None
+
+        # The client is in sync, then a few tasks change
+        _, _, cursor = await sync_all()
+        url = f"/api/v1/projects/{project_id}/tasks/"
+        listing = (await http.get(url, params={"limit": changes})).json()
+        for task in listing[: changes // 2]:
+            await http.put(f"{url}{task['id']}", json={"status": "done"})
+        for task in listing[changes // 2 :]:
+            await http.delete(f"{url}{task['id']}")
+
+        rows = [
+            ["full download", *await timed(download_all)],
+            ["sync from scratch", *await timed(sync_all)],
+            ["sync since cursor", *await timed(lambda: sync_all(cursor))],
+        ]
+
+    print(f"{tasks} tasks, {changes} changed since the last sync")
+    print_table(["approach", "requests", "rows", "ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.changes))
@@ -0,0 +1,122 @@
+"""Commit throughput of concurrent writers per SQLite pragma profile.
+
+Each writer inserts one task per request, the way the task endpoints do,
+either committing it on its own or through the group-commit writer.
+Usage::
+
+    python -m benchmarks.write_throughput [--writers 8] [--commits 200]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.session import (
+    SQLITE_PRAGMA_PROFILES,
+    create_engine,
+    use_explicit_transactions,
+)
+from app.db.writer import GroupCommitWriter
+from app.models import Base, Project, Task, User
+from benchmarks.common import BENCH_DIR, print_table
+
+
+async def measure(
+    profile: str, writers: int, commits: int, group_commit: bool = False
+) -> list:
+    mode = "group" if group_commit else "single"
+    path = os.path.join(BENCH_DIR, f"write-{profile}-{mode}.db")
+    engine = create_engine(
+        f"sqlite+aiosqlite:///{path}",
+        SQLITE_PRAGMA_PROFILES[profile],
+        pool_size=1 if group_commit else writers,
+    )
+    use_explicit_transactions(engine)
+    sessions = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with sessions() as session:
+        user = User(email="bench@example.com", hashed_password="x")
+        session.add(user)
+        await session.flush()
+        project = Project(name="Bench", owner_id=user.id)
+        session.add(project)
+        await session.commit()
+
+    group_writer = GroupCommitWriter(sessions, window_ms=2, max_batch=64)
+    if group_commit:
+        group_writer.start()
+
+    locked = 0
+
+    async def writer(n: int):
+        nonlocal locked
+        for i in range(commits):
+
+            async def apply(session: AsyncSession):
+                session.add(
+                    Task(
+                        title=f"Task {n}-{i}",
+                        project_id=project.id,
+                        owner_id=user.id,
+                    )
+                )
+                await session.flush()
+
+            try:
+                if group_commit:
+                    await group_writer.submit(apply)
+                else:
+                    async with sessions() as session:
+                        await apply(session)
+                        await session.commit()
+            except OperationalError:
+                locked += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(n) for n in range(writers)))
+    elapsed = time.perf_counter() - start
+    await group_writer.stop()
+    await engine.dispose()
+
+    done = writers * commits - locked
+    return [
+        profile,
+        mode,
+        done,
+        locked,
+        f"{elapsed:.2f}",
+        f"{done / elapsed:.0f}",
+    ]
+
+
+async def main(writers: int, commits: int) -> None:
+    rows = [
+        await measure(profile, writers, commits)
+        for profile in SQLITE_PRAGMA_PROFILES
+    ]
+    rows += [
+        await measure(profile, writers, commits, group_commit=True)
+        for profile in SQLITE_PRAGMA_PROFILES
+    ]
+
+    print(f"{writers} writers x {commits} single-row writes")
+    print_table(
+        ["profile", "commit", "writes", "locked", "seconds", "writes/s"], rows
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--commits", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.writers, args.commits))
@@ -0,0 +1,37 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core import user_cache
+from app.models import User
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_cached(client: AsyncClient, test_user: User):
+    response = await client.get("/api/v1/auth/me")
+    assert response.status_code == 200
+    assert response.json()["email"] == "test@example.com"
+
+    response = await client.get("/api/v1/auth/me")
+    assert response.status_code == 200
+
+    stats = user_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_update_user_me_invalidates_cache(
+    client: AsyncClient, test_user: User
+):
+    response = await client.get("/api/v1/auth/me")
+    assert response.status_code == 200
+
+    response = await client.put(
+        "/api/v1/auth/me", json={"email": "updated@example.com"}
+    )
+    assert response.status_code == 200
+    assert response.json()["email"] == "updated@example.com"
+
+    response = await client.get("/api/v1/auth/me")
+    assert response.status_code == 200
+    assert response.json()["email"] == "updated@example.com"
@@ -0,0 +1,63 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Project, Task, User
+
+
+@pytest.fixture
+async def tasks_url(test_db: AsyncSession, test_user: User) -> str:
+    project = Project(name="Compressed", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.flush()
+    await test_db.execute(
+        insert(Task),
+        [
+            {
+                "title": f"Task {i}",
+                "project_id": project.id,
+                "owner_id": test_user.id,
+            }
+            for i in range(100)
+        ],
+    )
+    await test_db.commit()
+
+    return f"/api/v1/projects/{project.id}/tasks/"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("coding", ["br", "gzip"])
+async def test_compressed_response(
+    client: AsyncClient, tasks_url: str, coding: str
+):
+    response = await client.get(
+        tasks_url, headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in response.headers
+    tasks = response.json()
+
+    response = await client.get(tasks_url, headers={"Accept-Encoding": coding})
+    assert response.headers["content-encoding"] == coding
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.num_bytes_downloaded < len(response.content) / 4
+    assert response.json() == tasks
+
+    response = await client.get(
+        tasks_url,
+        params={"stream": "ndjson"},
+        headers={"Accept-Encoding": coding},
+    )
+    assert response.headers["content-encoding"] == coding
+    assert len(response.text.splitlines()) == len(tasks)
+
+
+@pytest.mark.asyncio
+async def test_small_response_not_compressed(client: AsyncClient):
+    response = await client.get(
+        "/api/v1/auth/me", headers={"Accept-Encoding": "br, gzip"}
+    )
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.endpoints import projects
+from app.api.etag import etag_matches
+from app.models import Project, User
+
+
+def test_etag_matches():
+    etag = 'W/"abc"'
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"xyz", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"xyz"', etag)
+    assert not etag_matches(None, etag)
+
+
+async def get(client: AsyncClient, url: str, etag=None, **params):
+    headers = {"If-None-Match": etag} if etag else {}
+    return await client.get(url, params=params, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_conditional_get(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    project = Project(name="Polled", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.commit()
+    tasks_url = f"/api/v1/projects/{project.id}/tasks/"
+    response = await client.post(tasks_url, json={"title": "Task"})
+    task_url = f"{tasks_url}{response.json()['id']}"
+
+    urls = [
+        "/api/v1/projects/",
+        "/api/v1/projects/tree",
+        f"/api/v1/projects/{project.id}",
+        "/api/v1/tasks",
+        tasks_url,
+        task_url,
+    ]
+    etags = {}
+    for url in urls:
+        response = await get(client, url)
+        assert response.status_code == 200
+        etags[url] = response.headers["ETag"]
+        assert etags[url].startswith('W/"')
+
+        response = await get(client, url, etags[url])
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etags[url]
+
+    # Other query parameters are another representation
+    response = await get(client, tasks_url, etags[tasks_url], limit=1)
+    assert response.status_code == 200
+
+    # Any write to the user's tasks changes every ETag, including the
+    # project's, whose counters changed
+    await client.put(task_url, json={"status": "done"})
+    for url in urls:
+        response = await get(client, url, etags[url])
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etags[url]
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_follows_overdue(
+    client: AsyncClient, test_db: AsyncSession, test_user: User, monkeypatch
+):
+    project = Project(name="Project", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.commit()
+    due = datetime.now() + timedelta(hours=1)
+    await client.post(
+        f"/api/v1/projects/{project.id}/tasks/",
+        json={"title": "Soon", "due_date": due.isoformat()},
+    )
+
+    response = await get(client, "/api/v1/projects/")
+    etag = response.headers["ETag"]
+    assert response.json()[0]["overdue_count"] == 0
+
+    # Nothing was written, but the task became overdue
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return due + timedelta(minutes=1)
+
+    monkeypatch.setattr(projects, "datetime", Later)
+    # The client shares the test session, which holds the loaded project
+    test_db.expire_all()
+    response = await get(client, "/api/v1/projects/", etag)
+    assert response.status_code == 200
+    assert response.json()[0]["overdue_count"] == 1
@@ -0,0 +1,189 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from app.api.endpoints.events import events
+from app.core import create_access_token, event_broker
+from app.models import User
+
+
+class EventStream:
+    """A GET /events request driven over ASGI directly.
+
+    The test client reads whole responses, which an event stream never
+    finishes.
+    """
+
+    def __init__(self, app: FastAPI, query_string: bytes, headers: list = []):
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/v1/events",
+            "raw_path": b"/api/v1/events",
+            "query_string": query_string,
+            "root_path": "",
+            "headers": [(b"host", b"test"), *headers],
+            "client": ("test", 1),
+            "server": ("test", 80),
+        }
+        self.task = asyncio.create_task(app(scope, self.receive, self.send))
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        await self.messages.put(message)
+
+    async def next(self):
+        return await asyncio.wait_for(self.messages.get(), timeout=5)
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, timeout=5)
+
+
+def parse_events(body: bytes) -> list:
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_events_stream(
+    test_app: FastAPI, client: AsyncClient, test_user: User
+):
+    token = create_access_token(test_user.id)
+    stream = EventStream(test_app, f"access_token={token}".encode())
+
+    start = await stream.next()
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start[
+        "headers"
+    ]
+    assert event_broker.stats()["subscriptions"] == 1
+
+    response = await client.post("/api/v1/projects/", json={"name": "Home"})
+    project_id = response.json()["id"]
+
+    body = await stream.next()
+    assert parse_events(body["body"]) == [
+        ("project.created", {"id": project_id})
+    ]
+
+    await stream.close()
+    assert event_broker.stats()["subscriptions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_events_stream_not_compressed(
+    test_app: FastAPI, client: AsyncClient, test_user: User
+):
+    token = create_access_token(test_user.id)
+    stream = EventStream(
+        test_app,
+        f"access_token={token}".encode(),
+        [(b"accept-encoding", b"gzip, br")],
+    )
+
+    # Sent at once, not held back until the first event or heartbeat
+    start = await stream.next()
+    assert start["status"] == 200
+    assert b"content-encoding" not in dict(start["headers"])
+
+    event_broker.publish(test_user.id, "task.updated", id=5)
+    body = await stream.next()
+    assert parse_events(body["body"]) == [("task.updated", {"id": 5})]
+
+    await stream.close()
+
+
+@pytest.mark.asyncio
+async def test_events_subscription_lasts_as_long_as_the_response(
+    test_user: User,
+):
+    # Not subscribed until the response is sent, if ever
+    response = await events(current_user=test_user)
+    assert event_broker.stats()["subscriptions"] == 0
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    # Unsubscribed though the body never started
+    with pytest.raises(Exception):
+        await response({"type": "http"}, receive, send)
+    assert event_broker.stats()["subscriptions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_events_requires_token(client: AsyncClient):
+    del client.headers["Authorization"]
+
+    response = await client.get("/api/v1/events")
+    assert response.status_code == 401
+
+    response = await client.get(
+        "/api/v1/events", params={"access_token": "invalid"}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_mutations_publish_events(client: AsyncClient, test_user: User):
+    subscription = event_broker.subscribe(test_user.id)
+    try:
+        response = await client.post(
+            "/api/v1/projects/", json={"name": "Home"}
+        )
+        project_id = response.json()["id"]
+        url = f"/api/v1/projects/{project_id}/tasks/"
+
+        response = await client.post(url, json={"title": "A"})
+        task_id = response.json()["id"]
+        await client.put(f"{url}{task_id}", json={"title": "B"})
+        await client.post(
+            "/api/v1/tasks/bulk",
+            json={
+                "operations": [
+                    {"op": "create", "project_id": project_id, "title": "C"},
+                    {"op": "delete", "project_id": project_id, "id": 0},
+                ]
+            },
+        )
+        await client.delete(f"{url}{task_id}")
+        await client.put(
+            f"/api/v1/projects/{project_id}?cascade=true",
+            json={"status": "done"},
+        )
+        await client.delete(f"/api/v1/projects/{project_id}")
+
+        events = await subscription.get(timeout=0)
+    finally:
+        event_broker.unsubscribe(subscription)
+
+    task = {"id": task_id, "project_id": project_id}
+    assert [event for event, _ in events] == [
+        "project.created",
+        "task.created",
+        "task.updated",
+        "task.created",
+        "task.deleted",
+        "project.updated",
+        "project.deleted",
+    ]
+    assert events[1][1] == task
+    assert events[2][1] == task
+    assert events[5][1] == {"id": project_id, "cascade": True}
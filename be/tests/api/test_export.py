@@ -0,0 +1,201 @@
+import csv
+import io
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.endpoints.export import export_queries, export_rows
+from app.api.filters import ExportFilters
+from app.config.settings import settings
+from app.models import Project, Task, User
+from app.models.status import Status
+
+
+@pytest.fixture
+async def exported(test_db: AsyncSession, test_user: User):
+    """A project with a tagged task due in a week and a task done now."""
+    project = Project(name="Home", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.commit()
+    due = Task(
+        title="Due",
+        due_date=datetime.now() + timedelta(days=7),
+        project_id=project.id,
+        owner_id=test_user.id,
+    )
+    done = Task(
+        title="Done",
+        project_id=project.id,
+        owner_id=test_user.id,
+    )
+    test_db.add_all([due, done])
+    await test_db.commit()
+    # Completed by an update, as the triggers stamp it
+    await test_db.execute(
+        update(Task).where(Task.id == done.id).values(status=Status.DONE)
+    )
+    await test_db.commit()
+
+    return project, due, done
+
+
+async def export(client: AsyncClient, **params) -> list[dict]:
+    response = await client.get("/api/v1/export", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_export(client: AsyncClient, exported):
+    project, due, done = exported
+    await client.put(
+        f"/api/v1/projects/{project.id}/tasks/{due.id}/tags",
+        json={"tags": ["phone", "errands"]},
+    )
+
+    items = await export(client)
+    assert [(item["kind"], item["id"]) for item in items] == [
+        ("project", project.id),
+        ("task", due.id),
+        ("task", done.id),
+    ]
+    assert items[1]["tags"] == ["errands", "phone"]
+    assert items[1]["completed_at"] is None
+    assert items[2]["status"] == "done"
+    assert items[2]["completed_at"] is not None
+
+    response = await client.get("/api/v1/export", params={"format": "csv"})
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["kind"], int(row["id"])) for row in rows] == [
+        (item["kind"], item["id"]) for item in items
+    ]
+    assert rows[0]["title"] == ""
+    assert rows[1]["tags"] == "errands phone"
+
+
+@pytest.mark.asyncio
+async def test_export_date_ranges(
+    client: AsyncClient,
+    test_db: AsyncSession,
+    exported,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # A chunk per row, so that later chunks start from keyset positions
+    monkeypatch.setattr(settings, "STREAM_CHUNK_SIZE", 1)
+    project, due, done = exported
+    now = datetime.now()
+
+    def task_ids(items):
+        return [item["id"] for item in items if item["kind"] == "task"]
+
+    items = await export(client, completed_after=now - timedelta(hours=1))
+    assert task_ids(items) == [done.id]
+    # Projects are always exported, for the tasks to refer to
+    assert items[0]["id"] == project.id
+
+    items = await export(client, due_after=now, due_before=now + timedelta(8))
+    assert task_ids(items) == [due.id]
+
+    items = await export(client, created_before=now - timedelta(hours=1))
+    assert task_ids(items) == []
+
+    # Reopened tasks are no longer completed
+    await test_db.execute(
+        update(Task).where(Task.id == done.id).values(status=Status.TODO)
+    )
+    await test_db.commit()
+    items = await export(client, completed_after=now - timedelta(hours=1))
+    assert task_ids(items) == []
+
+
+async def add_tasks(test_db: AsyncSession, owner_id: int, count: int):
+    project = Project(name=f"{count} tasks", owner_id=owner_id)
+    test_db.add(project)
+    await test_db.flush()
+    await test_db.execute(
+        insert(Task),
+        [
+            {
+                "title": f"Task {i}",
+                "project_id": project.id,
+                "owner_id": owner_id,
+            }
+            for i in range(count)
+        ],
+    )
+    await test_db.commit()
+
+
+@pytest.mark.asyncio
+async def test_export_between_chunks_holds_no_transaction(
+    test_db: AsyncSession,
+    test_user: User,
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "STREAM_CHUNK_SIZE", 10)
+    await add_tasks(test_db, test_user.id, 25)
+
+    chunks = export_rows(
+        session_factory,
+        export_queries(test_user.id, ExportFilters()),
+        "ndjson",
+    )
+    first = await anext(chunks)
+    assert first
+
+    # Writers need no read transaction to end (nor does a checkpoint)
+    async with session_factory() as session:
+        await session.execute(
+            update(Task)
+            .where(Task.owner_id == test_user.id)
+            .values(priority=1)
+        )
+        await session.commit()
+
+    rest = [chunk async for chunk in chunks]
+    lines = b"".join([first, *rest]).splitlines()
+    assert len(lines) == 1 + 25
+
+
+async def peak_export_memory(
+    session_factory: async_sessionmaker[AsyncSession], owner_id: int
+) -> int:
+    """Peak memory allocated while exporting a user's data."""
+    queries = export_queries(owner_id, ExportFilters())
+    tracemalloc.start()
+    async for _ in export_rows(session_factory, queries, "csv"):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak
+
+
+@pytest.mark.asyncio
+async def test_export_memory_is_constant(
+    test_db: AsyncSession,
+    test_user: User,
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "STREAM_CHUNK_SIZE", 200)
+    await add_tasks(test_db, test_user.id, 1000)
+    # Once first, so that one-time allocations are not counted
+    await peak_export_memory(session_factory, test_user.id)
+    small_peak = await peak_export_memory(session_factory, test_user.id)
+
+    await add_tasks(test_db, test_user.id, 9000)
+    large_peak = await peak_export_memory(session_factory, test_user.id)
+
+    # Ten times the rows in about the same memory
+    assert large_peak < small_peak * 1.5
@@ -1,8 +1,10 @@
+from datetime import datetime
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Project, Status, Task
+from app.models import Project, Status, Task, User
 
 
 @pytest.mark.asyncio
@@ -171,3 +173,225 @@ async def test_delete_task(client: AsyncClient, test_db: AsyncSession):
         url=f"/api/v1/projects/{project.id}/tasks/{task.id}",
     )
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order_by", ["id", "due_date", "priority"])
+async def test_get_tasks_paginated(
+    client: AsyncClient, test_db: AsyncSession, test_user: User, order_by
+):
+    project = Project(name="Paged Project", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.commit()
+
+    due_dates = [None, datetime(2025, 1, 2), None, datetime(2025, 1, 1)] * 3
+    for i, due_date in enumerate(due_dates):
+        test_db.add(
+            Task(
+                title=f"Task {i}",
+                due_date=due_date,
+                priority=i % 3,
+                project_id=project.id,
+                owner_id=test_user.id,
+            )
+        )
+    await test_db.commit()
+
+    response = await client.get(
+        f"/api/v1/projects/{project.id}/tasks/",
+        params={"order_by": order_by},
+    )
+    expected = [task["id"] for task in response.json()]
+    assert len(expected) == len(due_dates)
+
+    seen = []
+    params = {"order_by": order_by, "limit": 5}
+    while True:
+        response = await client.get(
+            f"/api/v1/projects/{project.id}/tasks/", params=params
+        )
+        assert response.status_code == 200
+        assert len(response.json()) <= 5
+        seen += [task["id"] for task in response.json()]
+
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert seen == expected
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_filtered(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    home = Project(name="Home", owner_id=test_user.id)
+    work = Project(name="Work", owner_id=test_user.id)
+    test_db.add_all([home, work])
+    await test_db.commit()
+
+    test_db.add_all(
+        [
+            Task(
+                title="Pay rent",
+                status=Status.TODO,
+                is_flagged=True,
+                due_date=datetime(2025, 1, 1),
+                priority=3,
+                project_id=home.id,
+                owner_id=test_user.id,
+            ),
+            Task(
+                title="Clean",
+                status=Status.DONE,
+                project_id=home.id,
+                owner_id=test_user.id,
+            ),
+            Task(
+                title="Report",
+                status=Status.DEFERRED,
+                due_date=datetime(2025, 2, 1),
+                priority=1,
+                project_id=work.id,
+                owner_id=test_user.id,
+            ),
+        ]
+    )
+    await test_db.commit()
+
+    async def titles(url, **params):
+        response = await client.get(url, params=params)
+        assert response.status_code == 200
+        return [task["title"] for task in response.json()]
+
+    url = f"/api/v1/projects/{home.id}/tasks/"
+    assert await titles(url, status="done") == ["Clean"]
+    assert await titles(url, is_flagged=True) == ["Pay rent"]
+    assert await titles(url, priority=0) == ["Clean"]
+
+    url = "/api/v1/tasks"
+    assert await titles(url) == ["Pay rent", "Clean", "Report"]
+    assert await titles(url, status=["todo", "deferred"]) == [
+        "Pay rent",
+        "Report",
+    ]
+    assert await titles(url, due_after="2025-01-15") == ["Report"]
+    assert await titles(url, due_before="2025-01-15") == ["Pay rent"]
+    assert await titles(url, order_by="priority") == [
+        "Clean",
+        "Report",
+        "Pay rent",
+    ]
+
+    response = await client.get(url, params={"status": "someday"})
+    assert response.status_code == 422
+
+    # A due date range can't be read from an index in id order
+    response = await client.get(url, params={"order_by": "due_date"})
+    assert "X-Query-Plan" not in response.headers
+    response = await client.get(url, params={"due_after": "2025-01-15"})
+    assert response.headers["X-Query-Plan"] == "unindexed"
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_rejects_foreign_cursor(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    project = Project(name="Paged Project", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.commit()
+    for i in range(3):
+        test_db.add(
+            Task(title=f"T{i}", project_id=project.id, owner_id=test_user.id)
+        )
+    await test_db.commit()
+
+    response = await client.get(
+        f"/api/v1/projects/{project.id}/tasks/", params={"limit": 1}
+    )
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await client.get(
+        f"/api/v1/projects/{project.id}/tasks/",
+        params={"limit": 1, "cursor": cursor, "order_by": "due_date"},
+    )
+    assert response.status_code == 400
+
+    response = await client.get(
+        f"/api/v1/projects/{project.id}/tasks/",
+        params={"limit": 1, "cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_tasks(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    other_user = User(email="other@example.com", hashed_password="x")
+    test_db.add(other_user)
+    await test_db.commit()
+
+    project = Project(name="Bulk Project", owner_id=test_user.id)
+    foreign = Project(name="Foreign Project", owner_id=other_user.id)
+    test_db.add_all([project, foreign])
+    await test_db.commit()
+
+    kept = Task(title="Kept", project_id=project.id, owner_id=test_user.id)
+    doomed = Task(title="Doomed", project_id=project.id, owner_id=test_user.id)
+    test_db.add_all([kept, doomed])
+    await test_db.commit()
+
+    response = await client.post(
+        "/api/v1/tasks/bulk",
+        json={
+            "operations": [
+                {"op": "create", "project_id": project.id, "title": "A"},
+                {"op": "create", "project_id": foreign.id, "title": "B"},
+                {
+                    "op": "update",
+                    "project_id": project.id,
+                    "id": kept.id,
+                    "status": Status.DONE,
+                },
+                {"op": "delete", "project_id": project.id, "id": doomed.id},
+                {"op": "delete", "project_id": project.id, "id": 999},
+                {"op": "create", "project_id": project.id, "title": "C"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+
+    results = response.json()
+    assert [r["status_code"] for r in results] == [
+        201,
+        403,
+        200,
+        200,
+        404,
+        201,
+    ]
+    assert results[0]["task"]["title"] == "A"
+    assert results[0]["task"]["project_id"] == project.id
+    assert results[2]["task"]["title"] == "Kept"
+    assert results[2]["task"]["status"] == Status.DONE
+    assert results[5]["task"]["title"] == "C"
+
+    response = await client.get(f"/api/v1/projects/{project.id}/tasks/")
+    assert sorted(task["title"] for task in response.json()) == [
+        "A",
+        "C",
+        "Kept",
+    ]
+
+    # Not applied in request order, so one task cannot be in two
+    response = await client.post(
+        "/api/v1/tasks/bulk",
+        json={
+            "operations": [
+                {"op": "delete", "project_id": project.id, "id": kept.id},
+                {"op": "update", "project_id": project.id, "id": kept.id},
+            ]
+        },
+    )
+    assert response.status_code == 400
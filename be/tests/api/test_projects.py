@@ -1,8 +1,9 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Project
+from app.models import Project, Status, Task, User, project_closure
 
 
 @pytest.mark.asyncio
@@ -129,3 +130,231 @@ async def test_delete_project(client: AsyncClient, test_db: AsyncSession):
     # Verify the project is deleted
     response = await client.get(f"/api/v1/projects/{project.id}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_projects_paginated(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    for i in range(5):
+        test_db.add(Project(name=f"Paged Project {i}", owner_id=test_user.id))
+    await test_db.commit()
+
+    response = await client.get("/api/v1/projects/", params={"limit": 2})
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()] == [
+        "Paged Project 0",
+        "Paged Project 1",
+    ]
+
+    response = await client.get(
+        "/api/v1/projects/",
+        params={"limit": 10, "cursor": response.headers["X-Next-Cursor"]},
+    )
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()] == [
+        "Paged Project 2",
+        "Paged Project 3",
+        "Paged Project 4",
+    ]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_get_project_tree(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    root = Project(name="Root", owner_id=test_user.id)
+    test_db.add(root)
+    await test_db.flush()
+    child = Project(name="Child", parent_id=root.id, owner_id=test_user.id)
+    test_db.add(child)
+    await test_db.flush()
+    grandchild = Project(
+        name="Grandchild", parent_id=child.id, owner_id=test_user.id
+    )
+    test_db.add(grandchild)
+    await test_db.flush()
+    test_db.add_all(
+        [
+            Task(title="A", project_id=child.id, owner_id=test_user.id),
+            Task(title="B", project_id=child.id, owner_id=test_user.id),
+        ]
+    )
+    await test_db.commit()
+
+    response = await client.get("/api/v1/projects/tree")
+    assert response.status_code == 200
+    (tree,) = [n for n in response.json() if n["name"] == "Root"]
+    assert tree["depth"] == 0
+    assert tree["task_count"] == 0
+    (node,) = tree["children"]
+    assert node["name"] == "Child"
+    assert node["task_count"] == 2
+    assert [n["name"] for n in node["children"]] == ["Grandchild"]
+
+    response = await client.get(
+        "/api/v1/projects/tree", params={"root_id": child.id, "max_depth": 0}
+    )
+    assert response.status_code == 200
+    assert [(n["name"], n["children"]) for n in response.json()] == [
+        ("Child", [])
+    ]
+
+    response = await client.get(
+        "/api/v1/projects/tree", params={"root_id": 999}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_projects_counters(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    project = Project(name="Counted", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.commit()
+    project_id = project.id
+
+    url = f"/api/v1/projects/{project_id}/tasks/"
+    ids = []
+    for task in [
+        {"title": "Late", "due_date": "2000-01-01T00:00:00"},
+        {"title": "Flagged", "is_flagged": True},
+        {"title": "Done", "status": "done"},
+    ]:
+        response = await client.post(url, json=task)
+        ids.append(response.json()["id"])
+    await client.put(f"{url}{ids[1]}", json={"status": "deferred"})
+    await client.delete(f"{url}{ids[2]}")
+
+    # The client shares the test session, which loaded the project before
+    # the triggers changed its counters
+    test_db.expire_all()
+    response = await client.get("/api/v1/projects/")
+    (counted,) = [p for p in response.json() if p["id"] == project_id]
+    assert {k: v for k, v in counted.items() if k.endswith("_count")} == {
+        "todo_count": 1,
+        "done_count": 0,
+        "dropped_count": 0,
+        "deferred_count": 1,
+        "flagged_count": 0,
+        "overdue_count": 1,
+    }
+
+    response = await client.put(
+        f"/api/v1/projects/{project_id}",
+        params={"cascade": True},
+        json={"status": "done"},
+    )
+    assert response.json()["done_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_move_project(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    parent = Project(name="Parent", owner_id=test_user.id)
+    test_db.add(parent)
+    await test_db.flush()
+    child = Project(name="Child", parent_id=parent.id, owner_id=test_user.id)
+    other = Project(name="Other", owner_id=test_user.id)
+    test_db.add_all([child, other])
+    await test_db.commit()
+
+    response = await client.put(
+        f"/api/v1/projects/{parent.id}", json={"parent_id": child.id}
+    )
+    assert response.status_code == 400
+
+    response = await client.put(
+        f"/api/v1/projects/{child.id}", json={"parent_id": other.id}
+    )
+    assert response.status_code == 200
+    assert response.json()["parent_id"] == other.id
+
+    response = await client.get(
+        "/api/v1/projects/tree", params={"root_id": other.id}
+    )
+    (node,) = response.json()
+    assert [n["name"] for n in node["children"]] == ["Child"]
+
+    response = await client.put(
+        f"/api/v1/projects/{child.id}", json={"parent_id": 999}
+    )
+    assert response.status_code == 404
+
+
+async def add_subtree(test_db: AsyncSession, test_user: User):
+    root = Project(name="Root", owner_id=test_user.id)
+    test_db.add(root)
+    await test_db.flush()
+    child = Project(name="Child", parent_id=root.id, owner_id=test_user.id)
+    test_db.add(child)
+    await test_db.flush()
+    test_db.add_all(
+        [
+            Task(title=f"Task {i}", project_id=p.id, owner_id=test_user.id)
+            for i, p in enumerate([root, child, child])
+        ]
+    )
+    await test_db.commit()
+    return root, child
+
+
+@pytest.mark.asyncio
+async def test_update_project_cascade(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    root, child = await add_subtree(test_db, test_user)
+
+    response = await client.put(
+        f"/api/v1/projects/{root.id}",
+        params={"cascade": True},
+        json={"status": "done"},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+
+    statuses = await test_db.execute(
+        select(Project.status).where(Project.id == child.id)
+    )
+    assert statuses.scalars().all() == [Status.DONE]
+    statuses = await test_db.execute(
+        select(Task.status).where(Task.project_id.in_([root.id, child.id]))
+    )
+    assert set(statuses.scalars().all()) == {Status.DONE}
+
+
+@pytest.mark.asyncio
+async def test_delete_project_keeps_sub_projects(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    root, child = await add_subtree(test_db, test_user)
+
+    response = await client.delete(f"/api/v1/projects/{root.id}")
+    assert response.status_code == 200
+
+    response = await client.get(f"/api/v1/projects/{child.id}")
+    assert response.status_code == 200
+    assert response.json()["parent_id"] is None
+    tasks = await test_db.scalar(select(func.count()).select_from(Task))
+    assert tasks == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_project_cascade(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    root, child = await add_subtree(test_db, test_user)
+
+    response = await client.delete(
+        f"/api/v1/projects/{root.id}", params={"cascade": True}
+    )
+    assert response.status_code == 200
+
+    response = await client.get(f"/api/v1/projects/{child.id}")
+    assert response.status_code == 404
+    for table in (Task, project_closure):
+        count = await test_db.scalar(select(func.count()).select_from(table))
+        assert count == 0
@@ -0,0 +1,77 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.repository import (
+    check_project_access,
+    get_owned_project,
+    get_owned_task,
+)
+from app.models import Project, Task, User
+
+
+@pytest.fixture
+async def owned(test_db: AsyncSession, test_user: User):
+    other = User(email="other@example.com", hashed_password="x")
+    test_db.add(other)
+    await test_db.flush()
+
+    mine = Project(name="Mine", owner_id=test_user.id)
+    theirs = Project(name="Theirs", owner_id=other.id)
+    test_db.add_all([mine, theirs])
+    await test_db.flush()
+
+    task = Task(title="Task", project_id=mine.id, owner_id=test_user.id)
+    foreign = Task(title="Foreign", project_id=theirs.id, owner_id=other.id)
+    test_db.add_all([task, foreign])
+    await test_db.commit()
+
+    test_db.expunge_all()
+    return mine, theirs, task, foreign
+
+
+@pytest.mark.asyncio
+async def test_get_owned_task_uses_one_query(
+    test_db: AsyncSession, test_user: User, owned
+):
+    mine, _, task, _ = owned
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = test_db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        found = await get_owned_task(test_db, mine.id, task.id, test_user.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert found.id == task.id
+    assert found.title == "Task"
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_ownership_errors(test_db: AsyncSession, test_user: User, owned):
+    mine, theirs, task, foreign = owned
+    cases = [
+        (get_owned_project(test_db, 999, test_user.id), 404),
+        (get_owned_project(test_db, theirs.id, test_user.id), 403),
+        (check_project_access(test_db, 999, test_user.id), 404),
+        (check_project_access(test_db, theirs.id, test_user.id), 403),
+        (get_owned_task(test_db, 999, task.id, test_user.id), 404),
+        (get_owned_task(test_db, theirs.id, foreign.id, test_user.id), 403),
+        (get_owned_task(test_db, mine.id, foreign.id, test_user.id), 404),
+        (get_owned_task(test_db, mine.id, 999, test_user.id), 404),
+    ]
+
+    for lookup, status_code in cases:
+        with pytest.raises(HTTPException) as exc_info:
+            await lookup
+        assert exc_info.value.status_code == status_code
+
+    await check_project_access(test_db, mine.id, test_user.id)
+    project = await get_owned_project(test_db, mine.id, test_user.id)
+    assert project.name == "Mine"
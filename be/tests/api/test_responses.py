@@ -0,0 +1,116 @@
+import msgpack
+import pytest
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.negotiation import negotiate
+from app.api.responses import (
+    COLUMNAR_JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    JSONResponseField,
+)
+from app.models import Project, User
+
+
+def test_routes_serialize_to_bytes(test_app: FastAPI):
+    routes = [
+        route
+        for route in test_app.routes
+        if isinstance(route, APIRoute) and route.response_model is not None
+    ]
+
+    assert routes
+    for route in routes:
+        assert isinstance(
+            route.secure_cloned_response_field, JSONResponseField
+        ), route.path
+
+
+@pytest.mark.asyncio
+async def test_routes_serialize_with_response_field(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    # FastAPI's serialize_response must still call the field's serialize
+    calls = []
+    serialize = JSONResponseField.serialize
+
+    def spy(self, value, **options):
+        calls.append(value)
+        return serialize(self, value, **options)
+
+    monkeypatch.setattr(JSONResponseField, "serialize", spy)
+    response = await client.get("/api/v1/auth/me")
+
+    assert response.status_code == 200
+    assert len(calls) == 1
+    assert response.json()["email"] == calls[0].email
+
+
+@pytest.mark.asyncio
+async def test_response_model_filters_fields(client: AsyncClient):
+    response = await client.get("/api/v1/auth/me")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "hashed_password" not in response.json()
+
+
+def test_negotiate():
+    offers = ["application/json", MSGPACK_MEDIA_TYPE]
+    assert negotiate(None, offers) is None
+    assert negotiate("*/*", offers) == "application/json"
+    assert negotiate("application/msgpack", offers) == MSGPACK_MEDIA_TYPE
+    assert (
+        negotiate("application/json;q=0.5, application/*", offers)
+        == MSGPACK_MEDIA_TYPE
+    )
+    assert negotiate("text/html", offers) is None
+    assert negotiate("gzip, br", ["br", "gzip"]) == "br"
+    assert negotiate("gzip, br;q=0", ["br", "gzip"]) == "gzip"
+    assert negotiate("*;q=0.1, gzip;q=0.5", ["br", "gzip"]) == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_list_encodings(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    project = Project(name="Encoded", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.commit()
+    url = f"/api/v1/projects/{project.id}/tasks/"
+    for title in ["First", "Second"]:
+        await client.post(url, json={"title": title})
+
+    response = await client.get(url)
+    tasks = response.json()
+    etag = response.headers["ETag"]
+    assert response.headers["vary"] == "Accept"
+
+    response = await client.get(
+        url, headers={"Accept": COLUMNAR_JSON_MEDIA_TYPE}
+    )
+    assert response.headers["content-type"] == COLUMNAR_JSON_MEDIA_TYPE
+    columns = response.json()
+    assert columns["title"] == ["First", "Second"]
+    assert columns.keys() == tasks[0].keys()
+
+    response = await client.get(url, headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(response.content) == tasks
+    # A copy in one encoding does not validate another
+    assert response.headers["ETag"] != etag
+
+    response = await client.get(
+        url,
+        params={"status": "done"},
+        headers={"Accept": COLUMNAR_JSON_MEDIA_TYPE},
+    )
+    assert response.json() == {}
+
+    # Single objects are always JSON
+    response = await client.get(
+        "/api/v1/auth/me", headers={"Accept": MSGPACK_MEDIA_TYPE}
+    )
+    assert response.headers["content-type"] == "application/json"
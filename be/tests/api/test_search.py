@@ -0,0 +1,132 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.endpoints.search import to_match_query
+from app.config.settings import settings
+from app.models import Project, Task, User, search_index
+
+
+async def search(client: AsyncClient, q: str) -> list[tuple[str, str]]:
+    response = await client.get("/api/v1/search", params={"q": q})
+    assert response.status_code == 200
+    return [(r["kind"], r["title"]) for r in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_search(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    other = User(email="other@example.com", hashed_password="x")
+    test_db.add(other)
+    await test_db.flush()
+
+    project = Project(name="Garden work", owner_id=test_user.id)
+    foreign = Project(name="Garden party", owner_id=other.id)
+    test_db.add_all([project, foreign])
+    await test_db.flush()
+
+    test_db.add_all(
+        [
+            Task(
+                title="Buy seeds",
+                description="Tomatoes for the garden",
+                project_id=project.id,
+                owner_id=test_user.id,
+            ),
+            Task(
+                title="Water plants",
+                project_id=project.id,
+                owner_id=test_user.id,
+            ),
+            Task(title="Garden", project_id=foreign.id, owner_id=other.id),
+        ]
+    )
+    await test_db.commit()
+
+    assert sorted(await search(client, "garden")) == [
+        ("project", "Garden work"),
+        ("task", "Buy seeds"),
+    ]
+    assert await search(client, "tomat") == [("task", "Buy seeds")]
+
+    response = await client.get("/api/v1/search", params={"q": "tomatoes"})
+    (result,) = response.json()
+    assert result["snippet"] == "<mark>Tomatoes</mark> for the garden"
+
+    # FTS5 syntax in the query is searched for literally
+    assert await search(client, 'water OR "seeds') == []
+    assert await search(client, "NOT") == []
+
+    # The owner is part of the match, and only the owner
+    matched = await test_db.scalars(
+        select(search_index.c.title).where(
+            literal_column("search_index").match(
+                to_match_query("garden", test_user.id)
+            )
+        )
+    )
+    assert sorted(matched) == ["Buy seeds", "Garden work"]
+    assert await search(client, str(test_user.id)) == []
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_writes(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    project = Project(name="Errands", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.flush()
+    task = Task(
+        title="Call plumber", project_id=project.id, owner_id=test_user.id
+    )
+    test_db.add(task)
+    await test_db.commit()
+
+    await client.put(
+        f"/api/v1/projects/{project.id}/tasks/{task.id}",
+        json={"title": "Call electrician"},
+    )
+    assert await search(client, "plumber") == []
+    assert await search(client, "electrician") == [
+        ("task", "Call electrician")
+    ]
+
+    await client.delete(
+        f"/api/v1/projects/{project.id}", params={"cascade": True}
+    )
+    assert await search(client, "electrician") == []
+    assert await search(client, "errands") == []
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_newest_matches(
+    client: AsyncClient,
+    test_db: AsyncSession,
+    test_user: User,
+    monkeypatch,
+):
+    project = Project(name="Chores", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.flush()
+    test_db.add_all(
+        [
+            Task(title=title, project_id=project.id, owner_id=test_user.id)
+            for title in ["Wash car", "Wash dog", "Wash dishes"]
+        ]
+    )
+    await test_db.commit()
+
+    monkeypatch.setattr(settings, "SEARCH_RANK_WINDOW", 2)
+    response = await client.get("/api/v1/search", params={"q": "wash"})
+    assert sorted(r["title"] for r in response.json()) == [
+        "Wash dishes",
+        "Wash dog",
+    ]
+    assert response.headers["X-Search-Truncated"] == "true"
+
+    # Exactly a window of matches is all of them
+    response = await client.get("/api/v1/search", params={"q": "wash d"})
+    assert len(response.json()) == 2
+    assert "X-Search-Truncated" not in response.headers
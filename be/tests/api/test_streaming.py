@@ -0,0 +1,141 @@
+import json
+import tracemalloc
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.rows import TASK_COLUMNS
+from app.api.streaming import stream_rows, stream_slots
+from app.config.settings import settings
+from app.models import Project, Task, User
+from app.schemas import TaskList
+
+
+async def add_tasks(test_db: AsyncSession, owner_id: int, count: int) -> int:
+    project = Project(name=f"{count} tasks", owner_id=owner_id)
+    test_db.add(project)
+    await test_db.flush()
+    if count:
+        await test_db.execute(
+            insert(Task),
+            [
+                {
+                    "title": f"Task {i}",
+                    "project_id": project.id,
+                    "owner_id": owner_id,
+                }
+                for i in range(count)
+            ],
+        )
+    await test_db.commit()
+
+    return project.id
+
+
+@pytest.mark.asyncio
+async def test_stream_tasks(
+    client: AsyncClient,
+    test_db: AsyncSession,
+    test_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "STREAM_CHUNK_SIZE", 2)
+    project_id = await add_tasks(test_db, test_user.id, 5)
+    url = f"/api/v1/projects/{project_id}/tasks/"
+
+    response = await client.get(url)
+    tasks = response.json()
+    assert len(tasks) == 5
+
+    response = await client.get(url, params={"stream": "json"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "ETag" in response.headers
+    assert response.json() == tasks
+
+    response = await client.get(
+        url, params={"stream": "ndjson", "order_by": "priority"}
+    )
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == tasks
+
+    response = await client.get(
+        url, params={"stream": "json", "status": "done"}
+    )
+    assert response.json() == []
+
+    response = await client.get("/api/v1/projects/", params={"stream": "json"})
+    assert [p["id"] for p in response.json()] == [project_id]
+
+    response = await client.get(url, params={"stream": "json", "limit": 2})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_streams_are_capped_below_the_read_pool(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    assert settings.STREAM_MAX_CONCURRENT < settings.DB_READ_POOL_SIZE
+    project_id = await add_tasks(test_db, test_user.id, 1)
+    url = f"/api/v1/projects/{project_id}/tasks/"
+
+    # As if every slot were held by a slow client
+    for _ in range(settings.STREAM_MAX_CONCURRENT):
+        await stream_slots.acquire()
+    try:
+        response = await client.get(url, params={"stream": "ndjson"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+        # Listings that are not streamed are not limited
+        response = await client.get(url)
+        assert response.status_code == 200
+    finally:
+        for _ in range(settings.STREAM_MAX_CONCURRENT):
+            stream_slots.release()
+
+    response = await client.get(url, params={"stream": "ndjson"})
+    assert response.status_code == 200
+    assert not stream_slots.locked()
+
+
+async def peak_streaming_memory(
+    session_factory: async_sessionmaker[AsyncSession], project_id: int
+) -> int:
+    """Peak memory allocated while streaming a project's tasks."""
+    query = (
+        select(*TASK_COLUMNS)
+        .where(Task.project_id == project_id)
+        .order_by(Task.id)
+    )
+    tracemalloc.start()
+    async for _ in stream_rows(session_factory, query, TaskList, "json"):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak
+
+
+@pytest.mark.asyncio
+async def test_stream_memory_is_constant(
+    test_db: AsyncSession,
+    test_user: User,
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "STREAM_CHUNK_SIZE", 200)
+    small = await add_tasks(test_db, test_user.id, 1000)
+    large = await add_tasks(test_db, test_user.id, 10000)
+
+    # Once first, so that one-time allocations (statement caches) are not
+    # counted for either
+    await peak_streaming_memory(session_factory, small)
+    small_peak = await peak_streaming_memory(session_factory, small)
+    large_peak = await peak_streaming_memory(session_factory, large)
+
+    # Ten times the rows in about the same memory
+    assert large_peak < small_peak * 1.5
@@ -0,0 +1,161 @@
+import re
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_read_db
+from app.db.session import SQLITE_PRAGMA_PROFILES, create_engine
+from app.models import Project, Task, User
+
+
+async def sync(client: AsyncClient, since: int, limit: int = 100) -> dict:
+    response = await client.get(
+        "/api/v1/sync", params={"since": since, "limit": limit}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def changed(page: dict) -> dict:
+    return {
+        "projects": [p["name"] for p in page["projects"]],
+        "tasks": [t["title"] for t in page["tasks"]],
+        "deleted": [(d["kind"], d["id"]) for d in page["deleted"]],
+    }
+
+
+@pytest.mark.asyncio
+async def test_sync(
+    client: AsyncClient, test_db: AsyncSession, test_user: User
+):
+    other = User(email="other@example.com", hashed_password="x")
+    test_db.add(other)
+    await test_db.flush()
+    test_db.add(Project(name="Not mine", owner_id=other.id))
+    await test_db.commit()
+
+    response = await client.post("/api/v1/projects/", json={"name": "Home"})
+    project_id = response.json()["id"]
+    url = f"/api/v1/projects/{project_id}/tasks/"
+    ids = []
+    for title in ["A", "B", "C"]:
+        response = await client.post(url, json={"title": title})
+        ids.append(response.json()["id"])
+
+    # Everything, in pages. Rows come at their latest change; adding tasks
+    # changed the project's counters after it was created.
+    page = await sync(client, 0, limit=2)
+    assert page["has_more"]
+    assert changed(page) == {
+        "projects": [],
+        "tasks": ["A", "B"],
+        "deleted": [],
+    }
+    page = await sync(client, page["cursor"])
+    assert not page["has_more"]
+    assert changed(page) == {
+        "projects": ["Home"],
+        "tasks": ["C"],
+        "deleted": [],
+    }
+    assert page["projects"][0]["todo_count"] == 3
+    cursor = page["cursor"]
+
+    assert await sync(client, cursor) == {
+        "projects": [],
+        "tasks": [],
+        "deleted": [],
+        "cursor": cursor,
+        "has_more": False,
+    }
+
+    # Only the diff
+    await client.put(f"{url}{ids[0]}", json={"title": "A2"})
+    await client.delete(f"{url}{ids[1]}")
+    page = await sync(client, cursor)
+    assert changed(page) == {
+        "projects": ["Home"],
+        "tasks": ["A2"],
+        "deleted": [("task", ids[1])],
+    }
+
+    await client.delete(f"/api/v1/projects/{project_id}")
+    page = await sync(client, page["cursor"])
+    assert changed(page) == {
+        "projects": [],
+        "tasks": [],
+        "deleted": [
+            ("task", ids[0]),
+            ("task", ids[2]),
+            ("project", project_id),
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_sync_page_reads_one_snapshot(
+    test_app: FastAPI,
+    client: AsyncClient,
+    test_user: User,
+    session_factory: async_sessionmaker[AsyncSession],
+):
+    response = await client.post("/api/v1/projects/", json={"name": "Home"})
+    project_id = response.json()["id"]
+    cursor = (await sync(client, 0))["cursor"]
+
+    # Reads go through a WAL connection, as from the read pool, and
+    # another connection commits between the project and task queries
+    url = session_factory.kw["bind"].url
+    read_engine = create_engine(
+        url.render_as_string(), SQLITE_PRAGMA_PROFILES["performance"]
+    )
+    other_engine = create_sync_engine(url.set(drivername="sqlite"))
+
+    committed = False
+
+    def commit_changes(conn, cursor, statement, *args):
+        nonlocal committed
+        if committed or not re.search(r"\bFROM task\b", statement):
+            return
+        committed = True
+        with Session(other_engine) as session:
+            session.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(name="Renamed")
+            )
+            session.add(
+                Task(title="B", project_id=project_id, owner_id=test_user.id)
+            )
+            session.commit()
+
+    event.listen(
+        read_engine.sync_engine, "before_cursor_execute", commit_changes
+    )
+
+    async def get_db():
+        async with async_sessionmaker(read_engine)() as session:
+            yield session
+
+    test_app.dependency_overrides[get_read_db] = get_db
+    try:
+        page = await sync(client, cursor)
+        # Nothing yet, rather than the task alone with the cursor past
+        # the rename
+        assert changed(page) == {"projects": [], "tasks": [], "deleted": []}
+        assert page["cursor"] == cursor
+
+        page = await sync(client, cursor)
+        assert changed(page) == {
+            "projects": ["Renamed"],
+            "tasks": ["B"],
+            "deleted": [],
+        }
+    finally:
+        await read_engine.dispose()
+        other_engine.dispose()
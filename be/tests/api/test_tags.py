@@ -0,0 +1,108 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import tag_index
+from app.models import Project, Task, User
+
+
+@pytest.fixture
+async def tagged(client: AsyncClient, test_db: AsyncSession, test_user: User):
+    project = Project(name="Errands", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.flush()
+    tasks = [
+        Task(title=title, project_id=project.id, owner_id=test_user.id)
+        for title in ["Call bank", "Buy milk", "Call plumber", "Read"]
+    ]
+    test_db.add_all(tasks)
+    await test_db.commit()
+
+    for task, tags in zip(
+        tasks,
+        [
+            ["@errands", "@phone"],
+            ["errands"],
+            ["@Errands", "@phone", "@waiting"],
+        ],
+    ):
+        response = await client.put(
+            f"/api/v1/projects/{project.id}/tasks/{task.id}/tags",
+            json={"tags": tags},
+        )
+        assert response.status_code == 200
+
+    return project, tasks
+
+
+async def titles(client: AsyncClient, q: str) -> list[str]:
+    response = await client.get("/api/v1/tasks/filter", params={"q": q})
+    assert response.status_code == 200
+    return [task["title"] for task in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_task_tags(client: AsyncClient, tagged):
+    project, tasks = tagged
+
+    response = await client.get("/api/v1/tags")
+    assert [tag["name"] for tag in response.json()] == [
+        "errands",
+        "phone",
+        "waiting",
+    ]
+
+    response = await client.get(
+        f"/api/v1/projects/{project.id}/tasks/{tasks[2].id}/tags"
+    )
+    assert response.json() == {"tags": ["errands", "phone", "waiting"]}
+
+    response = await client.put(
+        f"/api/v1/projects/{project.id}/tasks/{tasks[0].id}/tags",
+        json={"tags": ["a b"]},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_filter_tasks(client: AsyncClient, tagged):
+    project, tasks = tagged
+
+    assert await titles(client, "@errands AND @phone NOT @waiting") == [
+        "Call bank"
+    ]
+    assert await titles(client, "NOT @phone") == ["Buy milk", "Read"]
+    assert await titles(client, "@nothing") == []
+
+    response = await client.get(
+        "/api/v1/tasks/filter", params={"q": "@errands", "limit": 2}
+    )
+    assert [t["title"] for t in response.json()] == ["Call bank", "Buy milk"]
+    response = await client.get(
+        "/api/v1/tasks/filter",
+        params={"q": "@errands", "cursor": response.headers["X-Next-Cursor"]},
+    )
+    assert [t["title"] for t in response.json()] == ["Call plumber"]
+
+    response = await client.get("/api/v1/tasks/filter", params={"q": "@a OR"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_filter_follows_writes(client: AsyncClient, tagged):
+    project, tasks = tagged
+    assert await titles(client, "@phone") == ["Call bank", "Call plumber"]
+
+    await client.put(
+        f"/api/v1/projects/{project.id}/tasks/{tasks[0].id}/tags",
+        json={"tags": []},
+    )
+    assert await titles(client, "@phone") == ["Call plumber"]
+
+    await client.delete(f"/api/v1/projects/{project.id}/tasks/{tasks[2].id}")
+    assert await titles(client, "@phone") == []
+
+    # Deleting the project drops the bitmaps; they are rebuilt on demand
+    await client.delete(f"/api/v1/projects/{project.id}")
+    assert tag_index.stats()["size"] == 0
+    assert await titles(client, "@errands") == []
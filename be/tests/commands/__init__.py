@@ -0,0 +1 @@
+"""Command test package."""
@@ -0,0 +1,201 @@
+import io
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.commands import import_data
+from app.commands.import_data import (
+    BULK_INSERT_TRIGGERS,
+    import_chunks,
+    read_records,
+)
+from app.commands.repair_counters import repair_counters
+from app.models import ImportJob, Project, Task, User
+
+
+async def new_job(test_db: AsyncSession, owner_id: int) -> ImportJob:
+    job = ImportJob(owner_id=owner_id, source="test")
+    test_db.add(job)
+    await test_db.commit()
+
+    return job
+
+
+async def run_import(
+    session_factory: async_sessionmaker[AsyncSession],
+    job: ImportJob,
+    data: str,
+    format: str = "ndjson",
+    chunk_size: int = 2,
+) -> list:
+    records = read_records(io.StringIO(data, newline=""), format)
+    return [
+        error
+        async for errors in import_chunks(
+            session_factory, job, records, format, chunk_size
+        )
+        for error in errors
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_exported_data(
+    client: AsyncClient,
+    test_db: AsyncSession,
+    test_user: User,
+    session_factory: async_sessionmaker[AsyncSession],
+):
+    inbox = Project(name="Inbox", is_inbox=True, owner_id=test_user.id)
+    test_db.add(inbox)
+    await test_db.commit()
+    home = (
+        await client.post("/api/v1/projects/", json={"name": "Home"})
+    ).json()
+    errands = (
+        await client.post(
+            "/api/v1/projects/",
+            json={"name": "Errands", "parent_id": home["id"]},
+        )
+    ).json()
+    milk = (
+        await client.post(
+            f"/api/v1/projects/{errands['id']}/tasks/",
+            json={"title": "Buy milk", "is_flagged": True},
+        )
+    ).json()
+    await client.put(
+        f"/api/v1/projects/{errands['id']}/tasks/{milk['id']}/tags",
+        json={"tags": ["errands", "phone"]},
+    )
+    await client.post(
+        f"/api/v1/projects/{home['id']}/tasks/",
+        json={"title": "Fix door", "status": "done"},
+    )
+    exported = (await client.get("/api/v1/export")).text
+
+    # A chunk holds the parent project, the next its child
+    job = await new_job(test_db, test_user.id)
+    assert await run_import(session_factory, job, exported) == []
+    assert (job.rows_read, job.projects_imported, job.tasks_imported) == (
+        5,
+        2,
+        2,
+    )
+    assert job.finished_at is not None
+
+    # Everything but the inbox twice, the copies under new ids
+    exported_again = (await client.get("/api/v1/export")).text
+    assert len(exported_again.splitlines()) == 9
+    tree = (await client.get("/api/v1/projects/tree")).json()
+    assert [(node["name"], node["task_count"]) for node in tree] == [
+        ("Inbox", 0),
+        ("Home", 1),
+        ("Home", 1),
+    ]
+    assert [child["name"] for child in tree[2]["children"]] == ["Errands"]
+    assert tree[2]["children"][0]["flagged_count"] == 1
+
+    # The first tag filter, so the bitmaps are built with the imported tags
+    response = await client.get("/api/v1/tasks/filter", params={"q": "@phone"})
+    assert [task["title"] for task in response.json()] == [
+        "Buy milk",
+        "Buy milk",
+    ]
+    response = await client.get("/api/v1/search", params={"q": "milk"})
+    assert len(response.json()) == 2
+
+    # What the dropped triggers would have done, and the triggers are back
+    assert await repair_counters(test_db) == []
+    done = await test_db.execute(
+        select(Task.completed_at).where(Task.title == "Fix door")
+    )
+    assert all(completed_at is not None for completed_at, in done)
+    change_seqs = (await test_db.scalars(select(Task.change_seq))).all()
+    assert len(set(change_seqs)) == 4
+    data_version = await test_db.scalar(
+        select(User.data_version).where(User.id == test_user.id)
+    )
+    assert max(change_seqs) < data_version
+    triggers = await test_db.scalars(
+        text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+    )
+    assert set(BULK_INSERT_TRIGGERS) <= set(triggers)
+
+
+CSV = """kind,id,project_id,parent_id,name,title,status,tags
+project,1,,,Home,,todo,
+task,2,1,,,Paint,someday,
+task,3,9,,,Lost,todo,
+note,4,,,,,,
+task,5,1,,,Shop,todo,@Errands
+project,6,,7,Orphan,,todo,
+"""
+
+
+@pytest.mark.asyncio
+async def test_import_skips_invalid_rows(
+    test_db: AsyncSession,
+    test_user: User,
+    session_factory: async_sessionmaker[AsyncSession],
+):
+    job = await new_job(test_db, test_user.id)
+    errors = await run_import(session_factory, job, CSV, "csv", 10)
+
+    assert [number for number, _ in errors] == [2, 3, 4, 6]
+    assert errors[0][1].startswith("status: ")
+    assert errors[1][1] == "unknown project 9"
+    assert errors[2][1] == "unknown kind: 'note'"
+    assert errors[3][1] == "unknown parent project 7"
+    assert (job.projects_imported, job.tasks_imported, job.rows_skipped) == (
+        1,
+        1,
+        4,
+    )
+    tags = await test_db.scalars(text("SELECT name FROM tag"))
+    assert tags.all() == ["errands"]
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_after_last_chunk(
+    test_db: AsyncSession,
+    test_user: User,
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    data = "".join(
+        [
+            '{"kind": "project", "id": 10, "name": "Home"}\n',
+            *(
+                f'{{"kind": "task", "id": {i}, "project_id": 10, '
+                f'"title": "Task {i}"}}\n'
+                for i in range(5)
+            ),
+        ]
+    )
+    insert_tasks = import_data.insert_tasks
+    calls = 0
+
+    async def fail_third_chunk(*args):
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise RuntimeError("disk full")
+        return await insert_tasks(*args)
+
+    monkeypatch.setattr(import_data, "insert_tasks", fail_third_chunk)
+    job = await new_job(test_db, test_user.id)
+    with pytest.raises(RuntimeError):
+        await run_import(session_factory, job, data)
+
+    # Resumed from what was committed, with the project's new id
+    job = await test_db.get(ImportJob, job.id, populate_existing=True)
+    await test_db.commit()
+    assert job.rows_read == 4
+    assert await run_import(session_factory, job, data) == []
+
+    titles = await test_db.scalars(select(Task.title).order_by(Task.id))
+    assert titles.all() == [f"Task {i}" for i in range(5)]
+    assert await test_db.scalar(select(func.count(Project.id))) == 1
+    assert await repair_counters(test_db) == []
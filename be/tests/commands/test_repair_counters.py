@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.commands.repair_counters import repair_counters
+from app.models import Project, Task, User
+
+
+@pytest.mark.asyncio
+async def test_repair_counters(test_db: AsyncSession, test_user: User):
+    project = Project(name="Project", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.flush()
+    test_db.add_all(
+        [
+            Task(title="Task", project_id=project.id, owner_id=test_user.id)
+            for _ in range(3)
+        ]
+    )
+    await test_db.commit()
+
+    assert await repair_counters(test_db) == []
+
+    await test_db.execute(
+        text("UPDATE project SET todo_count = 7, done_count = 1")
+    )
+    drift = [
+        {
+            "project_id": project.id,
+            "counter": "todo_count",
+            "stored": 7,
+            "expected": 3,
+        },
+        {
+            "project_id": project.id,
+            "counter": "done_count",
+            "stored": 1,
+            "expected": 0,
+        },
+    ]
+    assert await repair_counters(test_db, dry_run=True) == drift
+    assert await repair_counters(test_db) == drift
+    await test_db.commit()
+
+    assert await repair_counters(test_db) == []
@@ -14,9 +14,15 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from app.api.dependencies import get_db
+from app.api.dependencies import (
+    get_read_db,
+    get_read_session_factory,
+    get_write_db,
+)
+from app.core import create_access_token, user_cache
+from app.db import query_plans, tag_index
 from app.main import app
-from app.models import Base, Project, Task
+from app.models import Base, Project, Task, User
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -62,6 +68,14 @@ async def setup_database():
     """Set up the test database before each test."""
     logger.info("Setting up test database...")
 
+    # Cached users and tags refer to ids from the previous test's database
+    user_cache.clear()
+    tag_index.clear()
+    query_plans.clear()
+
+    # Close pooled connections so they don't point at a removed file
+    await engine.dispose()
+
     # Ensure test.db doesn't exist before tests
     if os.path.exists(TEST_DB_FILE):
         os.remove(TEST_DB_FILE)
@@ -93,6 +107,7 @@ async def setup_database():
         await conn.run_sync(Base.metadata.drop_all)
 
     # Remove test.db file after tests
+    await engine.dispose()
     if os.path.exists(TEST_DB_FILE):
         os.remove(TEST_DB_FILE)
 
@@ -113,16 +128,47 @@ async def test_db():
 
 
 @pytest.fixture
-async def client(test_app: FastAPI, test_db: AsyncSession):
+def session_factory():
+    """Session factory for code that opens sessions of its own."""
+    return TestingSessionLocal
+
+
+@pytest.fixture
+async def test_user(test_db: AsyncSession):
+    """Create the user the test client authenticates as."""
+    user = User(
+        email="test@example.com",
+        hashed_password="$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW",  # noqa: E501
+        is_active=True,
+        is_superuser=False,
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+
+    return user
+
+
+@pytest.fixture
+async def client(test_app: FastAPI, test_db: AsyncSession, test_user: User):
     """Create a test client with a test database session."""
 
     async def override_get_db():
         yield test_db
 
-    test_app.dependency_overrides[get_db] = override_get_db
+    test_app.dependency_overrides[get_read_db] = override_get_db
+    test_app.dependency_overrides[get_write_db] = override_get_db
+    # Streamed responses read committed data in sessions of their own
+    test_app.dependency_overrides[get_read_session_factory] = lambda: (
+        TestingSessionLocal
+    )
 
     async with AsyncClient(
-        transport=ASGITransport(app=test_app), base_url="http://test"
+        transport=ASGITransport(app=test_app),
+        base_url="http://test",
+        headers={
+            "Authorization": f"Bearer {create_access_token(test_user.id)}"
+        },
     ) as client:
         yield client
 
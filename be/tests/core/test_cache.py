@@ -0,0 +1,52 @@
+from app.core import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hit_and_miss():
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    assert cache.get(1) is None
+    cache.set(1, "a")
+    assert cache.get(1) == "a"
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_expires_entries():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+    cache.set(1, "a")
+
+    timer.now = 10
+    assert cache.get(1) is None
+    assert len(cache) == 0
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_invalidate():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set(1, "a")
+    cache.invalidate(1)
+
+    assert cache.get(1) is None
@@ -0,0 +1,54 @@
+import pytest
+
+from app.core import EventBroker
+from app.core.events import RESYNC
+
+
+@pytest.mark.asyncio
+async def test_broker_fans_out_to_the_users_subscriptions():
+    broker = EventBroker(buffer_size=10)
+    first = broker.subscribe(1)
+    second = broker.subscribe(1)
+    other = broker.subscribe(2)
+
+    broker.publish(1, "task.created", id=5)
+
+    expected = [("task.created", {"id": 5})]
+    assert await first.get(timeout=0) == expected
+    assert await second.get(timeout=0) == expected
+    assert await other.get(timeout=0) == []
+    assert broker.stats()["subscriptions"] == 3
+
+
+@pytest.mark.asyncio
+async def test_broker_replaces_overflowing_events_with_resync():
+    broker = EventBroker(buffer_size=2)
+    subscription = broker.subscribe(1)
+
+    for i in range(5):
+        broker.publish(1, "task.updated", id=i)
+
+    assert await subscription.get(timeout=0) == [RESYNC]
+    assert broker.stats()["dropped"] == 5
+
+    # Caught up, the subscription gets events again
+    broker.publish(1, "task.updated", id=5)
+    assert await subscription.get(timeout=0) == [("task.updated", {"id": 5})]
+
+
+@pytest.mark.asyncio
+async def test_broker_unsubscribe():
+    broker = EventBroker(buffer_size=10)
+    subscription = broker.subscribe(1)
+
+    broker.unsubscribe(subscription)
+    broker.unsubscribe(subscription)
+    broker.publish(1, "task.created", id=5)
+
+    assert await subscription.get(timeout=0) == []
+    assert broker.stats() == {
+        "users": 0,
+        "subscriptions": 0,
+        "published": 1,
+        "dropped": 0,
+    }
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core import BoundedExecutor, ExecutorSaturatedError
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_off_the_event_loop():
+    executor = BoundedExecutor("thread", max_workers=1, queue_size=0)
+
+    thread_name = await executor.run(lambda: threading.current_thread().name)
+
+    assert thread_name != threading.current_thread().name
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_fails_fast_when_saturated():
+    executor = BoundedExecutor("thread", max_workers=1, queue_size=1)
+    release = threading.Event()
+
+    running = [
+        asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ExecutorSaturatedError):
+        await executor.run(release.wait)
+
+    release.set()
+    await asyncio.gather(*running)
+
+    assert executor.stats()["rejected"] == 1
+    assert executor.stats()["pending"] == 0
+    executor.shutdown()
+
+
+def test_executor_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        BoundedExecutor("fiber", max_workers=1, queue_size=0)
@@ -0,0 +1,51 @@
+import pytest
+
+from app.core.tag_query import (
+    TagQuerySyntaxError,
+    bitmap_ids,
+    evaluate,
+    ids_bitmap,
+    parse_tag_query,
+)
+
+BITMAPS = {
+    "errands": ids_bitmap([1, 2, 3, 4]),
+    "phone": ids_bitmap([2, 3, 5]),
+    "waiting": ids_bitmap([3]),
+}
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("@errands AND @phone NOT @waiting", [2]),
+        ("@errands @phone", [2, 3]),
+        ("@Errands OR @phone", [1, 2, 3, 4, 5]),
+        ("@phone and not (@errands or @waiting)", [5]),
+        ("@unknown OR @waiting", [3]),
+    ],
+)
+def test_evaluate(query, expected):
+    assert bitmap_ids(evaluate(parse_tag_query(query), BITMAPS)) == expected
+
+
+def test_negated_result_is_a_complement():
+    result = evaluate(parse_tag_query("NOT @phone"), BITMAPS)
+
+    assert result < 0
+    assert bitmap_ids(~result) == [2, 3, 5]
+
+
+@pytest.mark.parametrize(
+    "query", ["@a AND", "(@a", "@a )", "errands", "@a OR OR @b", "@"]
+)
+def test_syntax_errors(query):
+    with pytest.raises(TagQuerySyntaxError):
+        parse_tag_query(query)
+
+
+def test_bitmap_round_trip():
+    ids = [0, 7, 8, 63, 64, 1000]
+
+    assert bitmap_ids(ids_bitmap(ids)) == ids
+    assert ids_bitmap([]) == 0
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Project, User, project_closure
+
+# The closure recomputed from parent_id, to compare the maintained one to
+EXPECTED_CLOSURE = text(
+    """
+    WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM project
+        UNION ALL
+        SELECT tree.ancestor_id, project.id, tree.depth + 1
+        FROM project JOIN tree ON project.parent_id = tree.descendant_id
+    )
+    SELECT ancestor_id, descendant_id, depth FROM tree
+    """
+)
+
+
+async def assert_closure_consistent(db: AsyncSession):
+    actual = await db.execute(select(project_closure))
+    expected = await db.execute(EXPECTED_CLOSURE)
+    assert sorted(actual.all()) == sorted(expected.all())
+
+
+@pytest.mark.asyncio
+async def test_closure_follows_inserts_moves_and_deletes(
+    test_db: AsyncSession, test_user: User
+):
+    async def add(name, parent=None):
+        project = Project(
+            name=name,
+            parent_id=parent and parent.id,
+            owner_id=test_user.id,
+        )
+        test_db.add(project)
+        await test_db.flush()
+        return project
+
+    a = await add("A")
+    b = await add("B", a)
+    c = await add("C", b)
+    d = await add("D", c)
+    e = await add("E")
+    await test_db.commit()
+    await assert_closure_consistent(test_db)
+
+    # Move a subtree under another root, then to the top level
+    b.parent_id = e.id
+    await test_db.commit()
+    await assert_closure_consistent(test_db)
+    ancestors = await test_db.scalars(
+        select(project_closure.c.ancestor_id)
+        .where(project_closure.c.descendant_id == d.id)
+        .order_by(project_closure.c.depth)
+    )
+    assert ancestors.all() == [d.id, c.id, b.id, e.id]
+
+    c.parent_id = None
+    await test_db.commit()
+    await assert_closure_consistent(test_db)
+
+    # Deleting a parent detaches its children
+    c.parent_id = b.id
+    await test_db.commit()
+    await test_db.delete(b)
+    await test_db.commit()
+    await test_db.refresh(c)
+    assert c.parent_id is None
+    await assert_closure_consistent(test_db)
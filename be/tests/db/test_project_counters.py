@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import PROJECT_COUNTERS, Project, Status, Task, User
+from app.models.project_counters import expected_counters, overdue_count
+
+
+async def counters(db: AsyncSession, project: Project) -> dict[str, int]:
+    columns = [getattr(Project, name) for name in PROJECT_COUNTERS]
+    row = await db.execute(select(*columns).where(Project.id == project.id))
+    return {k: v for k, v in row.mappings().one().items() if v}
+
+
+async def assert_counters_consistent(db: AsyncSession):
+    stored = await db.execute(
+        select(Project.id, *(getattr(Project, n) for n in PROJECT_COUNTERS))
+    )
+    expected = await db.execute(expected_counters())
+    assert sorted(stored.all()) == sorted(expected.all())
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_task_writes(
+    test_db: AsyncSession, test_user: User
+):
+    home = Project(name="Home", owner_id=test_user.id)
+    work = Project(name="Work", owner_id=test_user.id)
+    test_db.add_all([home, work])
+    await test_db.flush()
+
+    def task(project, **kwargs):
+        return Task(
+            title="Task",
+            project_id=project.id,
+            owner_id=test_user.id,
+            **kwargs,
+        )
+
+    a = task(home, is_flagged=True)
+    b = task(home, status=Status.DONE, is_flagged=True)
+    c = task(home)
+    test_db.add_all([a, b, c])
+    await test_db.commit()
+    assert await counters(test_db, home) == {
+        "todo_count": 2,
+        "done_count": 1,
+        "flagged_count": 1,
+    }
+
+    # Completing a flagged task no longer counts it as flagged
+    a.status = Status.DONE
+    c.project_id = work.id
+    await test_db.commit()
+    assert await counters(test_db, home) == {"done_count": 2}
+    assert await counters(test_db, work) == {"todo_count": 1}
+
+    # Set-based writes go through the triggers too
+    await test_db.execute(
+        update(Task)
+        .where(Task.project_id == home.id)
+        .values(status=Status.DROPPED)
+    )
+    await test_db.execute(delete(Task).where(Task.id == c.id))
+    await test_db.commit()
+    assert await counters(test_db, home) == {"dropped_count": 2}
+    assert await counters(test_db, work) == {}
+
+    await assert_counters_consistent(test_db)
+
+
+@pytest.mark.asyncio
+async def test_overdue_count(test_db: AsyncSession, test_user: User):
+    project = Project(name="Project", owner_id=test_user.id)
+    test_db.add(project)
+    await test_db.flush()
+
+    now = datetime.now()
+    for status, days in [
+        (Status.TODO, -1),
+        (Status.TODO, 1),
+        (Status.DONE, -1),
+    ]:
+        test_db.add(
+            Task(
+                title="Task",
+                status=status,
+                due_date=now + timedelta(days=days),
+                project_id=project.id,
+                owner_id=test_user.id,
+            )
+        )
+    await test_db.commit()
+
+    overdue = await test_db.scalar(
+        select(overdue_count(now)).where(Project.id == project.id)
+    )
+    assert overdue == 1
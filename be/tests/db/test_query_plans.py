@@ -0,0 +1,313 @@
+"""Run EXPLAIN QUERY PLAN on every query the endpoints issue.
+
+Each scenario drives one endpoint through the test client while the SQL
+it emits is recorded. A query fails the test if SQLite would answer it
+with a full table or index scan or an extra sort instead of an index
+search. Every request of a scenario must succeed, since one that fails
+early never issues the queries it is meant to cover.
+"""
+
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.db.query_plan import explain, find_scans
+from app.models import Base, Project, Task, User
+
+
+async def list_projects(client, project, task):
+    await client.get("/api/v1/projects/")
+
+
+async def page_projects(client, project, task):
+    response = await client.get("/api/v1/projects/", params={"limit": 1})
+    await client.get(
+        "/api/v1/projects/",
+        params={"limit": 1, "cursor": response.headers["X-Next-Cursor"]},
+    )
+
+
+async def get_project(client, project, task):
+    await client.get(f"/api/v1/projects/{project.id}")
+
+
+async def project_tree(client, project, task):
+    await client.get("/api/v1/projects/tree")
+    await client.get(
+        "/api/v1/projects/tree",
+        params={"root_id": project.id, "max_depth": 1},
+    )
+
+
+async def create_project(client, project, task):
+    await client.post("/api/v1/projects/", json={"name": "New"})
+
+
+async def update_project(client, project, task):
+    await client.put(f"/api/v1/projects/{project.id}", json={"name": "X"})
+
+
+async def move_project(client, project, task):
+    response = await client.get("/api/v1/projects/")
+    empty = next(p for p in response.json() if p["name"] == "Empty")
+    await client.put(
+        f"/api/v1/projects/{empty['id']}", json={"parent_id": project.id}
+    )
+
+
+async def delete_project(client, project, task):
+    response = await client.get("/api/v1/projects/")
+    empty = next(p for p in response.json() if p["name"] == "Empty")
+    await client.delete(f"/api/v1/projects/{empty['id']}")
+
+
+async def cascade_project(client, project, task):
+    response = await client.get("/api/v1/projects/")
+    empty = next(p for p in response.json() if p["name"] == "Empty")
+    await client.put(
+        f"/api/v1/projects/{empty['id']}", json={"parent_id": project.id}
+    )
+    await client.put(
+        f"/api/v1/projects/{project.id}",
+        params={"cascade": True},
+        json={"status": "done"},
+    )
+    await client.delete(
+        f"/api/v1/projects/{project.id}", params={"cascade": True}
+    )
+
+
+async def list_tasks(client, project, task):
+    for order_by in ("id", "due_date"):
+        await client.get(
+            f"/api/v1/projects/{project.id}/tasks/",
+            params={"order_by": order_by},
+        )
+
+
+async def filter_project_tasks(client, project, task):
+    await client.get(
+        f"/api/v1/projects/{project.id}/tasks/",
+        params={"status": ["todo", "done"], "order_by": "due_date"},
+    )
+    await client.get(
+        f"/api/v1/projects/{project.id}/tasks/",
+        params={"is_flagged": True, "order_by": "priority", "limit": 2},
+    )
+
+
+async def all_tasks(client, project, task):
+    await client.get("/api/v1/tasks", params={"limit": 2})
+    await client.get(
+        "/api/v1/tasks",
+        params={
+            "status": "todo",
+            "due_before": "2025-02-01",
+            "order_by": "due_date",
+        },
+    )
+    await client.get(
+        "/api/v1/tasks",
+        params={"due_after": "2025-01-01", "order_by": "due_date"},
+    )
+    await client.get("/api/v1/tasks", params={"order_by": "priority"})
+
+
+async def page_tasks(client, project, task):
+    for order_by in ("id", "due_date"):
+        params = {"order_by": order_by, "limit": 1}
+        while True:
+            response = await client.get(
+                f"/api/v1/projects/{project.id}/tasks/", params=params
+            )
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+
+async def get_task(client, project, task):
+    await client.get(f"/api/v1/projects/{project.id}/tasks/{task.id}")
+
+
+async def create_task(client, project, task):
+    await client.post(
+        f"/api/v1/projects/{project.id}/tasks/", json={"title": "New"}
+    )
+
+
+async def update_task(client, project, task):
+    await client.put(
+        f"/api/v1/projects/{project.id}/tasks/{task.id}", json={"title": "X"}
+    )
+
+
+async def delete_task(client, project, task):
+    await client.delete(f"/api/v1/projects/{project.id}/tasks/{task.id}")
+
+
+async def bulk_tasks(client, project, task):
+    await client.post(
+        "/api/v1/tasks/bulk",
+        json={
+            "operations": [
+                {"op": "create", "project_id": project.id, "title": "New"},
+                {
+                    "op": "update",
+                    "project_id": project.id,
+                    "id": task.id,
+                    "title": "X",
+                },
+            ]
+        },
+    )
+    # A task may only appear in one operation per request
+    await client.post(
+        "/api/v1/tasks/bulk",
+        json={
+            "operations": [
+                {"op": "delete", "project_id": project.id, "id": task.id},
+            ]
+        },
+    )
+
+
+async def search(client, project, task):
+    await client.get("/api/v1/search", params={"q": "task"})
+
+
+async def sync(client, project, task):
+    await client.delete(f"/api/v1/projects/{project.id}/tasks/{task.id}")
+    await client.get("/api/v1/sync", params={"since": 1, "limit": 2})
+
+
+async def set_tags(client, project, task):
+    await client.put(
+        f"/api/v1/projects/{project.id}/tasks/{task.id}/tags",
+        json={"tags": ["@errands", "@phone"]},
+    )
+    await client.get(f"/api/v1/projects/{project.id}/tasks/{task.id}/tags")
+    await client.get("/api/v1/tags")
+
+
+async def filter_tasks(client, project, task):
+    await client.put(
+        f"/api/v1/projects/{project.id}/tasks/{task.id}/tags",
+        json={"tags": ["@errands"]},
+    )
+    await client.get("/api/v1/tasks/filter", params={"q": "@errands"})
+    await client.get(
+        "/api/v1/tasks/filter", params={"q": "NOT @errands", "limit": 2}
+    )
+
+
+async def export(client, project, task):
+    # Small chunks, so that the keyset queries after the first run too
+    chunk_size = settings.STREAM_CHUNK_SIZE
+    settings.STREAM_CHUNK_SIZE = 2
+    try:
+        await client.put(
+            f"/api/v1/projects/{project.id}/tasks/{task.id}",
+            json={"status": "done"},
+        )
+        await client.get("/api/v1/export")
+        for date in ["created", "completed", "due"]:
+            await client.get(
+                "/api/v1/export",
+                params={
+                    f"{date}_after": "2000-01-01T00:00:00",
+                    f"{date}_before": "2100-01-01T00:00:00",
+                },
+            )
+    finally:
+        settings.STREAM_CHUNK_SIZE = chunk_size
+
+
+async def read_me(client, project, task):
+    await client.get("/api/v1/auth/me")
+
+
+SCENARIOS = [
+    list_projects,
+    page_projects,
+    get_project,
+    project_tree,
+    create_project,
+    update_project,
+    move_project,
+    delete_project,
+    cascade_project,
+    list_tasks,
+    filter_project_tasks,
+    all_tasks,
+    page_tasks,
+    get_task,
+    create_task,
+    update_task,
+    delete_task,
+    bulk_tasks,
+    search,
+    sync,
+    set_tags,
+    filter_tasks,
+    export,
+    read_me,
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s.__name__)
+async def test_endpoint_queries_use_indexes(
+    client: AsyncClient, test_db: AsyncSession, test_user: User, scenario
+):
+    project = Project(name="Project", owner_id=test_user.id)
+    other = Project(name="Empty", owner_id=test_user.id)
+    test_db.add_all([project, other])
+    await test_db.commit()
+
+    tasks = [
+        Task(
+            title=f"Task {i}",
+            due_date=datetime(2025, 1, i + 1) if i % 2 else None,
+            project_id=project.id,
+            owner_id=test_user.id,
+        )
+        for i in range(4)
+    ]
+    test_db.add_all(tasks)
+    await test_db.commit()
+
+    statements = []
+    sync_engine = test_db.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith(("INSERT", "EXPLAIN")):
+            return
+        if executemany:
+            parameters = parameters[0]
+        statements.append((statement, parameters))
+
+    async def check_status(response):
+        request = response.request
+        assert (
+            response.is_success
+        ), f"{request.method} {request.url}: {response.status_code}"
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    client.event_hooks["response"].append(check_status)
+    try:
+        await scenario(client, project, tasks[0])
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+        client.event_hooks["response"].remove(check_status)
+
+    assert statements, "scenario issued no queries"
+
+    conn = await test_db.connection()
+    for statement, parameters in statements:
+        plan = await explain(conn, statement, parameters)
+        problems = find_scans(plan, Base.metadata.tables)
+        assert not problems, f"{statement}\n{plan}"
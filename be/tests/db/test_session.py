@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.db.session import (
+    READ_ONLY_PRAGMAS,
+    SQLITE_PRAGMA_PROFILES,
+    create_engine,
+    use_explicit_transactions,
+)
+
+
+@pytest.mark.asyncio
+async def test_performance_profile_pragmas(tmp_path):
+    engine = create_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}",
+        SQLITE_PRAGMA_PROFILES["performance"],
+    )
+
+    async with engine.connect() as conn:
+
+        async def pragma(name):
+            result = await conn.exec_driver_sql(f"PRAGMA {name}")
+            return result.scalar()
+
+        assert await pragma("journal_mode") == "wal"
+        assert await pragma("synchronous") == 1  # NORMAL
+        assert await pragma("busy_timeout") > 0
+        assert await pragma("temp_store") == 2  # MEMORY
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_none_profile_keeps_sqlite_defaults(tmp_path):
+    engine = create_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'defaults.db'}",
+        SQLITE_PRAGMA_PROFILES["none"],
+    )
+
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql("PRAGMA journal_mode")
+        assert result.scalar() == "delete"
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_engine_rejects_writes(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'split.db'}"
+    pragmas = SQLITE_PRAGMA_PROFILES["performance"]
+    write_engine = create_engine(url, pragmas)
+    read_engine = create_engine(url, {**pragmas, **READ_ONLY_PRAGMAS})
+
+    async with write_engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE item (id INTEGER)")
+        await conn.exec_driver_sql("INSERT INTO item VALUES (1)")
+
+    async with read_engine.connect() as conn:
+        result = await conn.exec_driver_sql("SELECT count(*) FROM item")
+        assert result.scalar() == 1
+
+        with pytest.raises(OperationalError):
+            await conn.exec_driver_sql("INSERT INTO item VALUES (2)")
+
+    await write_engine.dispose()
+    await read_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_write_after_read_waits_for_other_writers(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'immediate.db'}"
+    pragmas = SQLITE_PRAGMA_PROFILES["performance"]
+    write_engine = create_engine(url, pragmas)
+    use_explicit_transactions(write_engine)
+    other_engine = create_engine(url, pragmas)
+
+    async with write_engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE item (id INTEGER)")
+
+    async def other_write():
+        async with other_engine.begin() as conn:
+            await conn.exec_driver_sql("INSERT INTO item VALUES (2)")
+
+    async with write_engine.begin() as conn:
+        await conn.exec_driver_sql("SELECT count(*) FROM item")
+        # Another process commits between the read and the write
+        other = asyncio.create_task(other_write())
+        await asyncio.sleep(0.2)
+        await conn.exec_driver_sql("INSERT INTO item VALUES (1)")
+    await other
+
+    async with write_engine.connect() as conn:
+        result = await conn.exec_driver_sql("SELECT id FROM item ORDER BY id")
+        assert result.scalars().all() == [1, 2]
+
+    await write_engine.dispose()
+    await other_engine.dispose()
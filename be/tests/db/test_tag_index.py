@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.tag_index import TagIndex
+from app.models import Project, Tag, Task, User, task_tag
+
+
+@pytest.fixture
+async def tagged(test_db: AsyncSession, test_user: User) -> list[Task]:
+    project = Project(name="Errands", owner_id=test_user.id)
+    tag = Tag(name="errands", owner_id=test_user.id)
+    test_db.add_all([project, tag])
+    await test_db.flush()
+    # Far apart, as if many other tasks had been written in between
+    tasks = [
+        Task(
+            id=id_, title="Task", project_id=project.id, owner_id=test_user.id
+        )
+        for id_ in [5, 100_000, 1_000_000]
+    ]
+    test_db.add_all(tasks)
+    await test_db.flush()
+    await test_db.execute(
+        insert(task_tag),
+        [{"tag_id": tag.id, "task_id": task.id} for task in tasks[:2]],
+    )
+    await test_db.commit()
+
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_bitmaps_grow_with_tagged_tasks(
+    test_db: AsyncSession, test_user: User, tagged: list[Task]
+):
+    index = TagIndex(maxsize=10, ttl=60)
+    tags = await index.get(test_db, test_user.id)
+    assert tags.bitmaps["errands"].bit_length() == 2
+    assert sorted(tags.ids(tags.bitmaps["errands"])) == [5, 100_000]
+
+    index.set_task_tags(test_user.id, tagged[2].id, ["errands", "phone"])
+    index.discard_tasks(test_user.id, [tagged[0].id])
+    tags = await index.get(test_db, test_user.id)
+    assert tags.bitmaps["errands"].bit_length() == 3
+    assert sorted(tags.ids(tags.bitmaps["errands"])) == [100_000, 1_000_000]
+    assert tags.ids(tags.bitmaps["phone"]) == [1_000_000]
+
+
+@pytest.mark.asyncio
+async def test_build_raced_by_a_write_is_not_cached(
+    test_db: AsyncSession, test_user: User, tagged: list[Task]
+):
+    index = TagIndex(maxsize=10, ttl=60)
+
+    class WrittenDuringRead:
+        """A session whose read is overtaken by a committed write."""
+
+        async def execute(self, statement):
+            result = await test_db.execute(statement)
+            index.set_task_tags(test_user.id, tagged[2].id, ["errands"])
+            return result
+
+    tags = await index.get(WrittenDuringRead(), test_user.id)
+    assert sorted(tags.ids(tags.bitmaps["errands"])) == [5, 100_000]
+    assert index.stats()["size"] == 0
+
+    await index.get(test_db, test_user.id)
+    assert index.stats()["size"] == 1
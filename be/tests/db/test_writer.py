@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.session import (
+    SQLITE_PRAGMA_PROFILES,
+    create_engine,
+    use_explicit_transactions,
+)
+from app.db.writer import GroupCommitWriter
+from app.models import Base, User
+
+
+@pytest.fixture
+async def writer_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'writer.db'}",
+        SQLITE_PRAGMA_PROFILES["performance"],
+        pool_size=1,
+        max_overflow=0,
+    )
+    use_explicit_transactions(engine)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+def add_user(email):
+    async def apply(session: AsyncSession) -> str:
+        session.add(User(email=email, hashed_password="x"))
+        await session.flush()
+        return email
+
+    return apply
+
+
+async def count_users(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(select(func.count(User.id)))
+        return result.scalar()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_a_commit(writer_engine):
+    commits = []
+    event.listen(
+        writer_engine.sync_engine, "commit", lambda conn: commits.append(1)
+    )
+
+    sessions = async_sessionmaker(writer_engine, expire_on_commit=False)
+    writer = GroupCommitWriter(sessions, window_ms=50, max_batch=100)
+    writer.start()
+
+    results = await asyncio.gather(
+        *(writer.submit(add_user(f"user{i}@example.com")) for i in range(10))
+    )
+    await writer.stop()
+
+    assert results == [f"user{i}@example.com" for i in range(10)]
+    assert await count_users(writer_engine) == 10
+    assert len(commits) == 1
+    assert writer.stats()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_write_only_rolls_back_itself(writer_engine):
+    sessions = async_sessionmaker(writer_engine, expire_on_commit=False)
+    writer = GroupCommitWriter(sessions, window_ms=50, max_batch=100)
+    writer.start()
+
+    async def fail(session: AsyncSession):
+        session.add(User(email="failed@example.com", hashed_password="x"))
+        await session.flush()
+        raise ValueError("rejected")
+
+    results = await asyncio.gather(
+        writer.submit(add_user("first@example.com")),
+        writer.submit(fail),
+        writer.submit(add_user("first@example.com")),  # duplicate email
+        writer.submit(add_user("last@example.com")),
+        return_exceptions=True,
+    )
+    await writer.stop()
+
+    assert results[0] == "first@example.com"
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], Exception)
+    assert results[3] == "last@example.com"
+
+    async with writer_engine.connect() as conn:
+        result = await conn.execute(select(User.email).order_by(User.id))
+        assert result.scalars().all() == [
+            "first@example.com",
+            "last@example.com",
+        ]